@@ -17,16 +17,37 @@ def create_app():
     from routes.rooms import rooms_bp
     from routes.subjects import subjects_bp
     from routes.allocations import allocations_bp
+    from routes.sessions import sessions_bp
 
     app.register_blueprint(students_bp, url_prefix='/api')
     app.register_blueprint(rooms_bp, url_prefix='/api')
     app.register_blueprint(subjects_bp, url_prefix='/api')
     app.register_blueprint(allocations_bp, url_prefix='/api')
+    app.register_blueprint(sessions_bp, url_prefix='/api')
+
+    from models.database import ensure_indexes, SubjectStats
+    try:
+        _, failed = ensure_indexes()
+        for index_name, error in failed.items():
+            print(f"Warning: could not create index {index_name}: {error}")
+        SubjectStats.ensure_built()
+    except Exception as e:
+        print(f"Warning: index setup skipped: {e}")
 
     @app.route('/api/health')
     def health_check():
         return {'status': 'healthy', 'message': 'Exam Seat Allocator API is running'}
 
+    @app.route('/api/cache/stats')
+    def cache_stats():
+        from models.database import cache
+        return cache.stats()
+
+    @app.route('/api/storage/stats')
+    def storage_stats():
+        from models.database import storage
+        return storage.stats()
+
     return app
 
 if __name__ == '__main__':
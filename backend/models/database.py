@@ -1,33 +1,292 @@
 import os
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+import json
+import hashlib
+import threading
+import time
+from functools import wraps
+from collections import Counter
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import ConnectionFailure, BulkWriteError, DuplicateKeyError, OperationFailure
 from bson import ObjectId
 from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
-MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/exam_allocator')
-client = MongoClient(MONGODB_URI)
-db = client.exam_allocator
+from models.storage import open_storage, UpdateOne
 
-students_collection = db.students
-rooms_collection = db.rooms
-subjects_collection = db.subjects
-allocations_collection = db.allocations
+storage = open_storage()
+
+students_collection = storage.collection('students')
+rooms_collection = storage.collection('rooms')
+subjects_collection = storage.collection('subjects')
+allocations_collection = storage.collection('allocations')
+seat_assignments_collection = storage.collection('seat_assignments')
+subject_stats_collection = storage.collection('subject_stats')
+sessions_collection = storage.collection('sessions')
+cache_versions_collection = storage.collection('cache_versions')
+
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '1000'))
+STUDENT_BATCH_SIZE = int(os.getenv('STUDENT_BATCH_SIZE', '2000'))
+CACHE_TTL_SECONDS = float(os.getenv('CACHE_TTL_SECONDS', '300'))
+CACHE_POLL_SECONDS = float(os.getenv('CACHE_POLL_SECONDS', '2'))
+ALLOCATION_PAGE_SIZE = 20
+MAX_ALLOCATION_PAGE_SIZE = 100
+
+ALLOCATION_STUDENT_FIELDS = {'_id': 1, 'roll_number': 1, 'name': 1, 'year': 1, 'subjects': 1, 'subject': 1, 'department': 1}
+ALLOCATION_INDENT_FIELDS = {
+    'session': 1, 'subject_filter': 1, 'rooms.room_id': 1, 'rooms.room.name': 1, 'rooms.subject_breakdown': 1,
+    'rooms.paper_breakdown': 1, 'allocations.room.name': 1, 'allocations.subject_breakdown': 1
+}
+ROLL_RANGE_FIELDS = {'_id': 0, 'room_id': 1, 'room_name': 1, 'roll_number': 1, 'department': 1, 'year': 1, 'subject': 1, 'exam_name': 1}
+ALLOCATION_SUMMARY_FIELDS = {'strategy': 1, 'subject_filter': 1, 'session': 1, 'allocation_summary': 1, 'created_at': 1}
+
+def copy_value(value):
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+class CollectionCache:
+    def __init__(self, versions_collection, ttl=CACHE_TTL_SECONDS, poll_interval=CACHE_POLL_SECONDS):
+        self.versions_collection = versions_collection
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.versions = {}
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.polls = 0
+        self._polled_at = None
+        self._lock = threading.Lock()
+
+    def _poll(self, now):
+        with self._lock:
+            if self._polled_at is not None and now - self._polled_at < self.poll_interval:
+                return
+            self._polled_at = now
+            self.polls += 1
+
+        shared = {doc['_id']: doc.get('version', 0) for doc in self.versions_collection.find({})}
+        with self._lock:
+            for collection, version in shared.items():
+                if version > self.versions.get(collection, 0):
+                    self.versions[collection] = version
+
+    def get(self, collection, key, loader):
+        now = time.monotonic()
+        self._poll(now)
+
+        with self._lock:
+            version = self.versions.get(collection, 0)
+            entry = self.entries.get((collection, key))
+            if entry is not None and entry[0] == version and now - entry[1] < self.ttl:
+                self.hits += 1
+                return copy_value(entry[2])
+            self.misses += 1
+
+        value = loader()
+        with self._lock:
+            self.entries[(collection, key)] = (version, now, value)
+        return copy_value(value)
+
+    def bump(self, *collections):
+        for collection in collections:
+            self.versions_collection.update_one({'_id': collection}, {'$inc': {'version': 1}}, upsert=True)
+            with self._lock:
+                self.versions[collection] = self.versions.get(collection, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0,
+                'polls': self.polls,
+                'versions': dict(self.versions),
+                'entries': len(self.entries),
+                'ttl_seconds': self.ttl,
+                'poll_interval_seconds': self.poll_interval
+            }
+
+cache = CollectionCache(cache_versions_collection)
+
+def invalidates(*collections):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                cache.bump(*collections)
+        return wrapper
+    return decorator
 
 def test_connection():
     try:
-        client.admin.command('ping')
-        return True
+        return storage.ping()
     except ConnectionFailure:
         raise Exception("Failed to connect to MongoDB")
 
+INDEXES = {
+    'students': [
+        ([('roll_number', ASCENDING)], {'unique': True, 'name': 'roll_number_unique'}),
+        ([('subjects', ASCENDING)], {'name': 'subjects_multikey'}),
+        ([('subject', ASCENDING)], {'name': 'subject'}),
+    ],
+    'subjects': [
+        ([('name', ASCENDING)], {'unique': True, 'name': 'name_unique'}),
+    ],
+    'subject_stats': [
+        ([('subject', ASCENDING)], {'unique': True, 'name': 'subject_unique'}),
+    ],
+    'allocations': [
+        ([('created_at', DESCENDING), ('_id', DESCENDING)], {'name': 'created_at_id_desc'}),
+        ([('batch_id', ASCENDING), ('session', ASCENDING)], {'name': 'batch_session'}),
+    ],
+    'sessions': [
+        ([('session_key', ASCENDING)], {'unique': True, 'name': 'session_key_unique'}),
+        ([('subjects', ASCENDING)], {'name': 'subjects_multikey'}),
+    ],
+    'seat_assignments': [
+        ([('allocation_id', ASCENDING), ('room_id', ASCENDING), ('seat', ASCENDING)], {'name': 'allocation_room_seat'}),
+        ([('allocation_id', ASCENDING), ('roll_number', ASCENDING)], {'name': 'allocation_roll_number'}),
+        ([('student_id', ASCENDING), ('allocation_id', DESCENDING)], {'name': 'student_allocations'}),
+    ],
+}
+
+def ensure_indexes():
+    created = []
+    failed = {}
+
+    for collection_name, indexes in INDEXES.items():
+        collection = storage.collection(collection_name)
+        for keys, options in indexes:
+            try:
+                created.append(f"{collection_name}.{collection.create_index(keys, **options)}")
+            except OperationFailure as e:
+                failed[f"{collection_name}.{options['name']}"] = str(e)
+
+    return created, failed
+
+def bulk_insert(collection, documents, row_numbers=None, chunk_size=None):
+    chunk_size = chunk_size or BULK_CHUNK_SIZE
+    row_numbers = row_numbers or list(range(1, len(documents) + 1))
+    inserted_count = 0
+    errors = []
+
+    for start in range(0, len(documents), chunk_size):
+        chunk = documents[start:start + chunk_size]
+        try:
+            result = collection.insert_many(chunk, ordered=False)
+            inserted_count += len(result.inserted_ids)
+        except BulkWriteError as e:
+            inserted_count += e.details.get('nInserted', 0)
+            for write_error in e.details.get('writeErrors', []):
+                if write_error.get('code') == 11000:
+                    keys = ', '.join(f"{key} '{value}'" for key, value in write_error.get('keyValue', {}).items())
+                    message = f"Duplicate {keys}" if keys else 'Duplicate key'
+                else:
+                    message = write_error.get('errmsg', 'Write failed')
+                errors.append((row_numbers[start + write_error['index']], message))
+
+    return inserted_count, errors
+
+
+class SubjectStats:
+    STUDENT_FIELDS = {'subjects': 1, 'subject': 1, 'year': 1}
+
+    @staticmethod
+    def deltas(students, sign=1):
+        deltas = Counter()
+        for student in students:
+            subjects = student.get('subjects') or ([student['subject']] if student.get('subject') else [])
+            for subject in set(subjects):
+                deltas[(subject, str(student.get('year')), subject == subjects[0])] += sign
+        return deltas
+
+    @staticmethod
+    def apply(deltas):
+        by_subject = {}
+        for (subject, year, primary), delta in deltas.items():
+            if delta:
+                inc = by_subject.setdefault(subject, Counter())
+                inc['count'] += delta
+                inc['primary'] += delta if primary else 0
+                inc[f'by_year.{year}'] += delta
+
+        if not by_subject:
+            return
+
+        subject_stats_collection.bulk_write([
+            UpdateOne({'subject': subject}, {'$inc': dict(inc)}, upsert=True)
+            for subject, inc in by_subject.items()
+        ], ordered=False)
+        subject_stats_collection.delete_many({'subject': {'$in': list(by_subject)}, 'count': {'$lte': 0}})
+
+    @staticmethod
+    def rebuild():
+        stats = {}
+        students = students_collection.find({}, SubjectStats.STUDENT_FIELDS, batch_size=STUDENT_BATCH_SIZE)
+
+        for (subject, year, primary), count in SubjectStats.deltas(students).items():
+            entry = stats.setdefault(subject, {'subject': subject, 'count': 0, 'primary': 0, 'by_year': {}})
+            entry['count'] += count
+            entry['primary'] += count if primary else 0
+            entry['by_year'][year] = entry['by_year'].get(year, 0) + count
+
+        subject_stats_collection.delete_many({})
+        if stats:
+            subject_stats_collection.insert_many(list(stats.values()))
+        return len(stats)
+
+    @staticmethod
+    def ensure_built():
+        if subject_stats_collection.find_one({'primary': {'$exists': False}}, {'_id': 1}) is not None:
+            return SubjectStats.rebuild()
+        if subject_stats_collection.find_one({}, {'_id': 1}) is None and students_collection.find_one({}, {'_id': 1}):
+            return SubjectStats.rebuild()
+        return None
 
+    @staticmethod
+    def get_all():
+        return list(subject_stats_collection.find({}, {'_id': 0}).sort('subject', ASCENDING))
+
+    @staticmethod
+    def get_counts(subjects=None, field='count'):
+        query = {'subject': {'$in': list(subjects)}} if subjects is not None else {}
+        return {
+            stat['subject']: stat.get(field, 0)
+            for stat in subject_stats_collection.find(query, {'_id': 0, 'subject': 1, field: 1})
+        }
+
+    @staticmethod
+    def get_subject_names():
+        return [stat['subject'] for stat in subject_stats_collection.find({}, {'_id': 0, 'subject': 1}).sort('subject', ASCENDING)]
+
+    @staticmethod
+    def delete_all():
+        return subject_stats_collection.delete_many({})
 
 class Student:
+    HASH_FIELDS = ('name', 'roll_number', 'year', 'subjects', 'department', 'semester')
+    OPTIONAL_FIELDS = ('department', 'semester')
+    UPSERT_FIELDS = {
+        '_id': 1, 'content_hash': 1, 'name': 1, 'roll_number': 1, 'year': 1, 'subjects': 1, 'subject': 1,
+        'department': 1, 'semester': 1
+    }
+
     @staticmethod
-    def create(name, roll_number, year, subjects=None, subject=None):
+    def content_hash(student):
+        subjects = student.get('subjects') or ([student['subject']] if student.get('subject') else [])
+        content = [student.get('name'), student.get('roll_number'), student.get('year'), subjects]
+        content.extend(student[field] for field in Student.OPTIONAL_FIELDS if student.get(field) is not None)
+        return hashlib.sha1(json.dumps(content, default=str).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _document(name, roll_number, year, subjects=None, subject=None, department=None, semester=None):
         if subjects is None and subject is not None:
             subjects = [subject]
         elif subjects is None:
@@ -43,13 +302,148 @@ class Student:
 
         if len(subjects) > 0:
             student_data['subject'] = subjects[0]
+        if department is not None:
+            student_data['department'] = department
+        if semester is not None:
+            student_data['semester'] = semester
+
+        student_data['content_hash'] = Student.content_hash(student_data)
+        return student_data
 
+    @staticmethod
+    @invalidates('students')
+    def create(name, roll_number, year, subjects=None, subject=None):
+        student_data = Student._document(name, roll_number, year, subjects, subject)
         result = students_collection.insert_one(student_data)
+        SubjectStats.apply(SubjectStats.deltas([student_data]))
         return result.inserted_id
 
+    @staticmethod
+    @invalidates('students')
+    def bulk_create(students, row_numbers=None, chunk_size=None):
+        documents = [
+            Student._document(s['name'], s['roll_number'], s['year'], s.get('subjects'), s.get('subject'),
+                              s.get('department'), s.get('semester'))
+            for s in students
+        ]
+        row_numbers = row_numbers or list(range(1, len(documents) + 1))
+        inserted_count, errors = bulk_insert(students_collection, documents, row_numbers, chunk_size)
+
+        failed_rows = {row_num for row_num, _ in errors}
+        SubjectStats.apply(SubjectStats.deltas(
+            document for document, row_num in zip(documents, row_numbers) if row_num not in failed_rows
+        ))
+        return inserted_count, errors
+
+    @staticmethod
+    @invalidates('students')
+    def bulk_upsert(students, row_numbers=None, chunk_size=None):
+        chunk_size = chunk_size or BULK_CHUNK_SIZE
+        row_numbers = row_numbers or list(range(1, len(students) + 1))
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0}
+        errors = []
+        seen = {}
+        rows = []
+
+        for student, row_num in zip(students, row_numbers):
+            document = Student._document(
+                student['name'], student['roll_number'], student['year'],
+                student.get('subjects'), student.get('subject'),
+                student.get('department'), student.get('semester')
+            )
+            if document['roll_number'] in seen:
+                errors.append((row_num, f"Duplicate roll_number '{document['roll_number']}' (also on row {seen[document['roll_number']]})"))
+                continue
+            seen[document['roll_number']] = row_num
+            rows.append((row_num, document))
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            existing = {
+                doc['roll_number']: doc
+                for doc in students_collection.find(
+                    {'roll_number': {'$in': [document['roll_number'] for _, document in chunk]}},
+                    Student.UPSERT_FIELDS
+                )
+            }
+
+            requests = []
+            written = []
+            for row_num, document in chunk:
+                before = existing.get(document['roll_number'])
+                if before is not None and (before.get('content_hash') or Student.content_hash(before)) == document['content_hash']:
+                    counts['unchanged'] += 1
+                    continue
+
+                created_at = document.pop('created_at')
+                update = {'$set': document, '$setOnInsert': {'created_at': created_at}}
+                absent = [field for field in ('subject',) + Student.OPTIONAL_FIELDS if field not in document]
+                if absent:
+                    update['$unset'] = {field: '' for field in absent}
+                requests.append(UpdateOne({'roll_number': document['roll_number']}, update, upsert=True))
+                written.append((row_num, document, before))
+
+            if not requests:
+                continue
+
+            failed = {}
+            try:
+                students_collection.bulk_write(requests, ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get('writeErrors', []):
+                    failed[write_error['index']] = write_error.get('errmsg', 'Write failed')
+
+            deltas = Counter()
+            for position, (row_num, document, before) in enumerate(written):
+                if position in failed:
+                    errors.append((row_num, failed[position]))
+                    continue
+                counts['updated' if before is not None else 'created'] += 1
+                if before is not None:
+                    deltas.update(SubjectStats.deltas([before], -1))
+                deltas.update(SubjectStats.deltas([document]))
+            SubjectStats.apply(deltas)
+
+        return counts, errors
+
     @staticmethod
     def get_all():
-        return list(students_collection.find({}))
+        return cache.get('students', 'all', lambda: list(students_collection.find({})))
+
+    @staticmethod
+    def selection_query(subject_filter=None, subjects=None):
+        if subjects is not None:
+            return {'subjects': {'$in': list(subjects)}}
+        return {'$or': [{'subjects': subject_filter}, {'subject': subject_filter}]} if subject_filter else {}
+
+    @staticmethod
+    def count(subject_filter=None, subjects=None):
+        return students_collection.count_documents(Student.selection_query(subject_filter, subjects))
+
+    @staticmethod
+    def iter_for_allocation(subject_filter=None, batch_size=None, subjects=None):
+        wanted = set(subjects) if subjects is not None else None
+        query = Student.selection_query(subject_filter, wanted)
+        cursor = students_collection.find(
+            query, ALLOCATION_STUDENT_FIELDS, batch_size=batch_size or STUDENT_BATCH_SIZE
+        )
+
+        for doc in cursor:
+            subjects = doc.get('subjects') or ([doc['subject']] if doc.get('subject') else [])
+            if wanted is not None:
+                subjects = [subject for subject in subjects if subject in wanted]
+            student = {
+                '_id': str(doc['_id']),
+                'name': doc.get('name'),
+                'roll_number': doc.get('roll_number'),
+                'year': doc.get('year'),
+                'subjects': subjects
+            }
+            if subjects:
+                student['subject'] = subjects[0]
+            if doc.get('department'):
+                student['department'] = doc['department']
+            yield student
 
     @staticmethod
     def get_by_id(student_id):
@@ -74,77 +468,103 @@ class Student:
         }))
 
     @staticmethod
+    @invalidates('students')
     def update(student_id, **kwargs):
-        return students_collection.update_one(
-            {'_id': ObjectId(student_id)},
-            {'$set': kwargs}
-        )
+        before = None
+        if kwargs.keys() & SubjectStats.STUDENT_FIELDS.keys():
+            before = students_collection.find_one({'_id': ObjectId(student_id)}, SubjectStats.STUDENT_FIELDS)
+
+        update = {'$set': kwargs}
+        if kwargs.keys() & set(Student.HASH_FIELDS + ('subject',)):
+            update['$unset'] = {'content_hash': ''}
+
+        result = students_collection.update_one({'_id': ObjectId(student_id)}, update)
+
+        if before is not None and result.matched_count:
+            deltas = SubjectStats.deltas([before], -1)
+            deltas.update(SubjectStats.deltas([{**before, **kwargs}]))
+            SubjectStats.apply(deltas)
+
+        return result
 
     @staticmethod
+    @invalidates('students')
     def delete(student_id):
-        return students_collection.delete_one({'_id': ObjectId(student_id)})
+        before = students_collection.find_one({'_id': ObjectId(student_id)}, SubjectStats.STUDENT_FIELDS)
+        result = students_collection.delete_one({'_id': ObjectId(student_id)})
+        if before is not None and result.deleted_count:
+            SubjectStats.apply(SubjectStats.deltas([before], -1))
+        return result
 
     @staticmethod
+    @invalidates('students')
     def delete_by_subject(subject):
-        return students_collection.delete_many({
+        query = {
             '$or': [
                 {'subject': subject},
                 {'subjects': subject}
             ]
-        })
+        }
+        removed = list(students_collection.find(query, SubjectStats.STUDENT_FIELDS))
+        result = students_collection.delete_many(query)
+        SubjectStats.apply(SubjectStats.deltas(removed, -1))
+        return result
 
     @staticmethod
     def get_unique_subjects():
-        pipeline = [
-            {
-                '$group': {
-                    '_id': None,
-                    'single_subjects': {'$addToSet': '$subject'},
-                    'multi_subjects': {'$addToSet': '$subjects'}
-                }
-            }
-        ]
-
-        result = list(students_collection.aggregate(pipeline))
-        if not result:
-            return []
-
-        subjects = set()
-
-        if result[0]['single_subjects']:
-            subjects.update([s for s in result[0]['single_subjects'] if s])
-
-        if result[0]['multi_subjects']:
-            for subject_list in result[0]['multi_subjects']:
-                if subject_list:
-                    subjects.update(subject_list)
-
-        return sorted(list(subjects))
+        return cache.get('students', 'unique_subjects', SubjectStats.get_subject_names)
 
     @staticmethod
+    @invalidates('students')
     def delete_all():
+        SubjectStats.delete_all()
         return students_collection.delete_many({})
 
 class Room:
     @staticmethod
-    def create(name, capacity):
+    def _document(name, capacity, benches_per_row=None, seats_per_bench=None, aisles=None):
         room_data = {
             'name': name,
             'capacity': capacity,
             'created_at': datetime.utcnow()
         }
-        result = rooms_collection.insert_one(room_data)
+
+        if benches_per_row is not None:
+            room_data['benches_per_row'] = benches_per_row
+        if seats_per_bench is not None:
+            room_data['seats_per_bench'] = seats_per_bench
+        if aisles is not None:
+            room_data['aisles'] = aisles
+        return room_data
+
+    @staticmethod
+    @invalidates('rooms')
+    def create(name, capacity, benches_per_row=None, seats_per_bench=None, aisles=None):
+        result = rooms_collection.insert_one(
+            Room._document(name, capacity, benches_per_row, seats_per_bench, aisles)
+        )
         return result.inserted_id
 
+    @staticmethod
+    @invalidates('rooms')
+    def bulk_create(rooms, row_numbers=None, chunk_size=None):
+        documents = [
+            Room._document(r['name'], r['capacity'], r.get('benches_per_row'),
+                           r.get('seats_per_bench'), r.get('aisles'))
+            for r in rooms
+        ]
+        return bulk_insert(rooms_collection, documents, row_numbers, chunk_size)
+
     @staticmethod
     def get_all():
-        return list(rooms_collection.find({}))
+        return cache.get('rooms', 'all', lambda: list(rooms_collection.find({})))
 
     @staticmethod
     def get_by_id(room_id):
         return rooms_collection.find_one({'_id': ObjectId(room_id)})
 
     @staticmethod
+    @invalidates('rooms')
     def update(room_id, **kwargs):
         return rooms_collection.update_one(
             {'_id': ObjectId(room_id)},
@@ -152,73 +572,479 @@ class Room:
         )
 
     @staticmethod
+    @invalidates('rooms')
     def delete(room_id):
         return rooms_collection.delete_one({'_id': ObjectId(room_id)})
 
     @staticmethod
+    @invalidates('rooms')
     def delete_all():
         return rooms_collection.delete_many({})
 
 class Subject:
     @staticmethod
+    @invalidates('subjects')
     def create(name):
-        if subjects_collection.find_one({'name': name}):
-            return None
-
         subject_data = {
             'name': name,
             'created_at': datetime.utcnow()
         }
-        result = subjects_collection.insert_one(subject_data)
+
+        try:
+            result = subjects_collection.insert_one(subject_data)
+        except DuplicateKeyError:
+            return None
         return result.inserted_id
 
+    @staticmethod
+    @invalidates('subjects')
+    def bulk_create(names, row_numbers=None, chunk_size=None):
+        row_numbers = row_numbers or list(range(1, len(names) + 1))
+        existing = {
+            subject['name'] for subject in
+            subjects_collection.find({'name': {'$in': list(set(names))}}, {'name': 1})
+        }
+
+        documents = []
+        document_rows = []
+        errors = []
+        created_at = datetime.utcnow()
+
+        for name, row_num in zip(names, row_numbers):
+            if name in existing:
+                errors.append((row_num, f"Subject {name} already exists"))
+                continue
+            existing.add(name)
+            documents.append({'name': name, 'created_at': created_at})
+            document_rows.append(row_num)
+
+        inserted_count, write_errors = bulk_insert(subjects_collection, documents, document_rows, chunk_size)
+        return inserted_count, sorted(errors + write_errors)
+
     @staticmethod
     def get_all():
-        return list(subjects_collection.find({}))
+        return cache.get('subjects', 'all', lambda: list(subjects_collection.find({})))
 
     @staticmethod
     def get_names():
-        subjects = subjects_collection.find({}, {'name': 1})
-        return [subject['name'] for subject in subjects]
+        return cache.get('subjects', 'names', lambda: [
+            subject['name'] for subject in subjects_collection.find({}, {'name': 1})
+        ])
 
     @staticmethod
+    @invalidates('subjects', 'students')
     def delete_by_name(name):
         subjects_collection.delete_one({'name': name})
         Student.delete_by_subject(name)
 
     @staticmethod
+    @invalidates('subjects')
     def delete_all():
         return subjects_collection.delete_many({})
 
+class Session:
+    ENTRY_FIELDS = ('subject', 'title', 'departments', 'semester', 'type', 'regulation', 'sheet')
+
+    @staticmethod
+    def key(date, session):
+        return f"{date}-{session}"
+
+    @staticmethod
+    @invalidates('sessions')
+    def import_slots(slots, source):
+        counts = {'created': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        existing = {doc['session_key']: doc for doc in sessions_collection.find({})}
+        grouped = {}
+
+        for slot in slots:
+            entry = {field: slot.get(field) for field in Session.ENTRY_FIELDS}
+            entry['source'] = source
+            grouped.setdefault((slot['date'], slot['session']), []).append(entry)
+
+        keys = {Session.key(date, session): (date, session) for date, session in grouped}
+        keys.update({key: (doc['date'], doc['session']) for key, doc in existing.items()})
+        requests = []
+        now = datetime.utcnow()
+
+        for session_key, (date, session) in sorted(keys.items()):
+            current = existing.get(session_key, {}).get('entries', [])
+            entries = [entry for entry in current if entry.get('source') != source] + grouped.get((date, session), [])
+            entries.sort(key=lambda entry: (entry['subject'], entry['source']))
+
+            if entries == current:
+                if (date, session) in grouped:
+                    counts['unchanged'] += 1
+            elif not entries:
+                sessions_collection.delete_one({'session_key': session_key})
+                counts['removed'] += 1
+            else:
+                subjects = sorted({entry['subject'] for entry in entries})
+                requests.append(UpdateOne(
+                    {'session_key': session_key},
+                    {
+                        '$set': {'date': date, 'session': session, 'subjects': subjects, 'entries': entries, 'updated_at': now},
+                        '$setOnInsert': {'created_at': now}
+                    },
+                    upsert=True
+                ))
+                counts['updated' if session_key in existing else 'created'] += 1
+
+        if requests:
+            sessions_collection.bulk_write(requests, ordered=False)
+        return counts
+
+    @staticmethod
+    def get_all():
+        return cache.get('sessions', 'all', lambda: sorted(
+            sessions_collection.find({}), key=lambda doc: (doc['date'], doc['session'])
+        ))
+
+    @staticmethod
+    def get(session_key):
+        return sessions_collection.find_one({'session_key': session_key})
+
+    @staticmethod
+    def subject_info():
+        def load():
+            info = {}
+            for session in sessions_collection.find({}, {'entries': 1}):
+                for entry in session.get('entries', []):
+                    subject = info.setdefault(entry['subject'], {'title': entry.get('title'), 'branch': []})
+                    subject['branch'].extend(d for d in entry.get('departments') or [] if d not in subject['branch'])
+            return {code: {'title': value['title'], 'branch': ', '.join(value['branch']) or None} for code, value in info.items()}
+        return cache.get('sessions', 'subject_info', load)
+
+    @staticmethod
+    def exams(session):
+        exams = {}
+        for entry in session.get('entries', []):
+            parts = [
+                entry.get('regulation'),
+                f"Sem {entry['semester']}" if entry.get('semester') else None,
+                'Arrear' if entry.get('type') == 'ARREAR' else None
+            ]
+            exam_name = ' '.join(part for part in parts if part) or entry['subject']
+            exam = exams.setdefault(exam_name, {'exam_name': exam_name, 'subjects': []})
+            if entry['subject'] not in exam['subjects']:
+                exam['subjects'].append(entry['subject'])
+        return list(exams.values())
+
+    @staticmethod
+    def get_by_subject(subject):
+        return sorted(sessions_collection.find({'subjects': subject}), key=lambda doc: (doc['date'], doc['session']))
+
+    @staticmethod
+    def get_subject_index():
+        def load():
+            index = {}
+            for doc in sessions_collection.find({}, {'session_key': 1, 'subjects': 1}):
+                for subject in doc.get('subjects', []):
+                    index.setdefault(subject, []).append(doc['session_key'])
+            return {subject: sorted(keys) for subject, keys in index.items()}
+        return cache.get('sessions', 'subject_index', load)
+
+    @staticmethod
+    @invalidates('sessions')
+    def delete_all():
+        return sessions_collection.delete_many({})
+
+class SeatAssignment:
+    STUDENT_FIELDS = ('name', 'year', 'department', 'subjects', 'exam_name', 'exam_subject')
+
+    @staticmethod
+    def rows_for_room(allocation_id, room_id, room_allocation):
+        rows = []
+        for allocation in room_allocation['students']:
+            student = allocation['student']
+            subjects = student.get('subjects') or ([student['subject']] if student.get('subject') else [])
+            row = {
+                'allocation_id': allocation_id,
+                'room_id': room_id,
+                'room_name': room_allocation['room'].get('name'),
+                'seat': allocation['seat_number'],
+                'roll_number': student.get('roll_number'),
+                'student_id': str(student['_id']) if student.get('_id') is not None else None,
+                'subject': subjects[0] if subjects else None,
+                'grid': allocation.get('grid')
+            }
+            for field in SeatAssignment.STUDENT_FIELDS:
+                if student.get(field) is not None:
+                    row[field] = student[field]
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def to_seat(row):
+        student = {
+            '_id': row.get('student_id'),
+            'roll_number': row.get('roll_number'),
+            'subject': row.get('subject')
+        }
+        for field in SeatAssignment.STUDENT_FIELDS:
+            if field in row:
+                student[field] = row[field]
+
+        seat = {'seat_number': row['seat'], 'student': student}
+        if row.get('grid') is not None:
+            seat['grid'] = row['grid']
+        return seat
+
+    @staticmethod
+    def get_by_allocation(allocation_id):
+        return seat_assignments_collection.find(
+            {'allocation_id': ObjectId(allocation_id)},
+            {'_id': 0, 'allocation_id': 0}
+        ).sort([('room_id', ASCENDING), ('seat', ASCENDING)])
+
+    @staticmethod
+    def get_roll_rows(allocation_id):
+        return seat_assignments_collection.find({'allocation_id': ObjectId(allocation_id)}, ROLL_RANGE_FIELDS)
+
+    @staticmethod
+    def get_by_room(allocation_id, room_id):
+        return list(seat_assignments_collection.find(
+            {'allocation_id': ObjectId(allocation_id), 'room_id': room_id},
+            {'_id': 0, 'allocation_id': 0}
+        ).sort('seat', ASCENDING))
+
+    @staticmethod
+    def get_by_roll_number(allocation_id, roll_number):
+        return seat_assignments_collection.find_one(
+            {'allocation_id': ObjectId(allocation_id), 'roll_number': roll_number},
+            {'_id': 0, 'allocation_id': 0}
+        )
+
+    @staticmethod
+    def get_by_student(student_id):
+        return list(seat_assignments_collection.find(
+            {'student_id': student_id}, {'_id': 0}
+        ).sort('allocation_id', DESCENDING))
+
+    @staticmethod
+    def delete_by_allocation(allocation_id):
+        return seat_assignments_collection.delete_many({'allocation_id': ObjectId(allocation_id)})
+
+    @staticmethod
+    def delete_all():
+        return seat_assignments_collection.delete_many({})
+
 class Allocation:
     @staticmethod
-    def create(strategy, subject_filter, allocations, allocation_summary):
+    def _room_id(room_allocation, room_index):
+        room = room_allocation['room']
+        return str(room.get('_id') or room.get('name') or room_index)
+
+    @staticmethod
+    def _paper_breakdown(seats):
+        papers = Counter()
+        for seat in seats:
+            student = seat['student']
+            papers.update(set(student.get('subjects') or ([student['subject']] if student.get('subject') else [])))
+        return dict(papers)
+
+    @staticmethod
+    def _build(strategy, subject_filter, allocations, allocation_summary, **header_fields):
+        allocation_id = ObjectId()
+        rooms = []
+        rows = []
+
+        for room_index, room_allocation in enumerate(allocations):
+            room_id = Allocation._room_id(room_allocation, room_index)
+            room_entry = {key: value for key, value in room_allocation.items() if key != 'students'}
+            room_entry['room_id'] = room_id
+            room_entry['student_count'] = len(room_allocation['students'])
+            if header_fields.get('session'):
+                room_entry['paper_breakdown'] = Allocation._paper_breakdown(room_allocation['students'])
+            rooms.append(room_entry)
+            rows.extend(SeatAssignment.rows_for_room(allocation_id, room_id, room_allocation))
+
         allocation_data = {
+            '_id': allocation_id,
             'strategy': strategy,
             'subject_filter': subject_filter,
-            'allocations': allocations,
+            'rooms': rooms,
             'allocation_summary': allocation_summary,
-            'created_at': datetime.utcnow()
+            'seat_count': len(rows),
+            'created_at': datetime.utcnow(),
+            **header_fields
         }
-        result = allocations_collection.insert_one(allocation_data)
-        return result.inserted_id
+        return allocation_data, rows
 
     @staticmethod
-    def get_all():
-        return list(allocations_collection.find({}).sort('created_at', -1))
+    def create(strategy, subject_filter, allocations, allocation_summary, **header_fields):
+        allocation_data, rows = Allocation._build(strategy, subject_filter, allocations, allocation_summary, **header_fields)
+        allocation_id = allocation_data['_id']
+
+        allocations_collection.insert_one(allocation_data)
+
+        _, errors = bulk_insert(seat_assignments_collection, rows)
+        if errors:
+            Allocation.delete(allocation_id)
+            raise Exception(f"Failed to store {len(errors)} seat assignments")
+
+        return allocation_id
+
+    @staticmethod
+    def create_many(items, **header_fields):
+        headers = []
+        rows = []
+        for item in items:
+            allocation_data, item_rows = Allocation._build(**item, **header_fields)
+            headers.append(allocation_data)
+            rows.extend(item_rows)
+
+        if not headers:
+            return []
+
+        allocation_ids = [header['_id'] for header in headers]
+        allocations_collection.insert_many(headers)
+
+        _, errors = bulk_insert(seat_assignments_collection, rows)
+        if errors:
+            seat_assignments_collection.delete_many({'allocation_id': {'$in': allocation_ids}})
+            allocations_collection.delete_many({'_id': {'$in': allocation_ids}})
+            raise Exception(f"Failed to store {len(errors)} seat assignments")
+
+        return allocation_ids
+
+    @staticmethod
+    def get_breakdowns(allocation_id=None, batch_id=None):
+        query = {'batch_id': ObjectId(batch_id)} if batch_id else {'_id': ObjectId(allocation_id)}
+        return list(allocations_collection.find(query, ALLOCATION_INDENT_FIELDS))
+
+    @staticmethod
+    def list_by_batch(batch_id):
+        return list(allocations_collection.find(
+            {'batch_id': ObjectId(batch_id)}, {**ALLOCATION_SUMMARY_FIELDS, 'batch_id': 1}
+        ).sort('session', ASCENDING))
+
+    @staticmethod
+    def _with_seats(header):
+        if header is None or 'rooms' not in header:
+            return header
+
+        seats_by_room = {}
+        for row in SeatAssignment.get_by_allocation(header['_id']):
+            seats_by_room.setdefault(row['room_id'], []).append(SeatAssignment.to_seat(row))
+
+        header['allocations'] = [
+            {**room_entry, 'students': seats_by_room.get(room_entry['room_id'], [])}
+            for room_entry in header.pop('rooms')
+        ]
+        return header
+
+    @staticmethod
+    def encode_cursor(header):
+        return f"{header['created_at'].isoformat()}|{header['_id']}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            created_at, allocation_id = cursor.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), ObjectId(allocation_id)
+        except Exception:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+    @staticmethod
+    def list_summaries(limit=ALLOCATION_PAGE_SIZE, cursor=None):
+        limit = max(1, min(int(limit), MAX_ALLOCATION_PAGE_SIZE))
+        query = {}
+
+        if cursor:
+            created_at, allocation_id = Allocation.decode_cursor(cursor)
+            query = {'$or': [
+                {'created_at': {'$lt': created_at}},
+                {'created_at': created_at, '_id': {'$lt': allocation_id}}
+            ]}
+
+        headers = list(
+            allocations_collection.find(query, ALLOCATION_SUMMARY_FIELDS)
+            .sort([('created_at', DESCENDING), ('_id', DESCENDING)])
+            .limit(limit + 1)
+        )
+
+        next_cursor = Allocation.encode_cursor(headers[limit - 1]) if len(headers) > limit else None
+        return headers[:limit], next_cursor
 
     @staticmethod
     def get_by_id(allocation_id):
+        return Allocation._with_seats(allocations_collection.find_one({'_id': ObjectId(allocation_id)}))
+
+    @staticmethod
+    def get_header(allocation_id):
         return allocations_collection.find_one({'_id': ObjectId(allocation_id)})
 
+    @staticmethod
+    def get_room(allocation_id, room_id):
+        header = allocations_collection.find_one(
+            {'_id': ObjectId(allocation_id), 'rooms.room_id': room_id},
+            {'rooms': 1}
+        )
+        if header is None:
+            legacy = allocations_collection.find_one({'_id': ObjectId(allocation_id), 'allocations': {'$exists': True}})
+            for room_index, room_allocation in enumerate((legacy or {}).get('allocations', [])):
+                if Allocation._room_id(room_allocation, room_index) == room_id:
+                    return room_allocation
+            return None
+
+        room_entry = next(entry for entry in header['rooms'] if entry['room_id'] == room_id)
+        room_entry['students'] = [SeatAssignment.to_seat(row) for row in SeatAssignment.get_by_room(allocation_id, room_id)]
+        return room_entry
+
+    @staticmethod
+    def get_roll_rows(allocation_id):
+        header = allocations_collection.find_one({'_id': ObjectId(allocation_id)}, {'session': 1, 'rooms.room_id': 1, 'allocations': 1})
+        if header is None:
+            return None, None
+        if 'rooms' in header:
+            return header, SeatAssignment.get_roll_rows(allocation_id)
+
+        rows = []
+        for room_index, room_allocation in enumerate(header.get('allocations', [])):
+            room_id = Allocation._room_id(room_allocation, room_index)
+            rows.extend(SeatAssignment.rows_for_room(header['_id'], room_id, room_allocation))
+        return header, rows
+
+    @staticmethod
+    def get_latest_id():
+        header = allocations_collection.find_one({}, {'_id': 1}, sort=[('created_at', -1), ('_id', -1)])
+        return header['_id'] if header else None
+
+    @staticmethod
+    def find_seat(allocation_id, roll_number):
+        row = SeatAssignment.get_by_roll_number(allocation_id, roll_number)
+        if row is not None:
+            return row
+
+        legacy = allocations_collection.find_one(
+            {'_id': ObjectId(allocation_id), 'allocations': {'$exists': True}},
+            {'allocations.room': 1, 'allocations.students': 1}
+        )
+        for room_index, room_allocation in enumerate((legacy or {}).get('allocations', [])):
+            for seat in room_allocation['students']:
+                if seat['student'].get('roll_number') == roll_number:
+                    return {
+                        'room_id': Allocation._room_id(room_allocation, room_index),
+                        'room_name': room_allocation['room'].get('name'),
+                        'seat': seat['seat_number'],
+                        'roll_number': roll_number,
+                        'name': seat['student'].get('name'),
+                        'year': seat['student'].get('year'),
+                        'subject': seat['student'].get('subject'),
+                        'grid': seat.get('grid')
+                    }
+        return None
+
     @staticmethod
     def get_latest():
-        return allocations_collection.find_one({}, sort=[('created_at', -1)])
+        return Allocation._with_seats(allocations_collection.find_one({}, sort=[('created_at', -1)]))
 
     @staticmethod
     def delete(allocation_id):
+        SeatAssignment.delete_by_allocation(allocation_id)
         return allocations_collection.delete_one({'_id': ObjectId(allocation_id)})
 
     @staticmethod
     def delete_all():
+        SeatAssignment.delete_all()
         return allocations_collection.delete_many({})
@@ -0,0 +1,740 @@
+import copy
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import bson
+from bson import ObjectId
+import pymongo
+from pymongo import MongoClient, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'mongo').lower()
+MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/exam_allocator')
+MONGODB_DATABASE = os.getenv('MONGODB_DATABASE', 'exam_allocator')
+EMBEDDED_DB_PATH = os.getenv('EMBEDDED_DB_PATH', 'exam_allocator.db')
+
+def _optional_int(name, default=None):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+MONGODB_POOL_OPTIONS = {
+    'maxPoolSize': _optional_int('MONGODB_MAX_POOL_SIZE', 50),
+    'minPoolSize': _optional_int('MONGODB_MIN_POOL_SIZE', 0),
+    'maxIdleTimeMS': _optional_int('MONGODB_MAX_IDLE_TIME_MS'),
+    'waitQueueTimeoutMS': _optional_int('MONGODB_WAIT_QUEUE_TIMEOUT_MS'),
+    'connectTimeoutMS': _optional_int('MONGODB_CONNECT_TIMEOUT_MS', 5000),
+    'serverSelectionTimeoutMS': _optional_int('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 5000),
+    'socketTimeoutMS': _optional_int('MONGODB_SOCKET_TIMEOUT_MS'),
+    'compressors': os.getenv('MONGODB_COMPRESSORS') or None,
+}
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {
+                'connections_created': 0, 'connections_closed': 0, 'checkouts': 0,
+                'checkout_failures': 0, 'checkins': 0, 'pool_clears': 0
+            }
+            self.in_use = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+
+    def _count(self, counter, in_use=0):
+        with self._lock:
+            self.counters[counter] += 1
+            self.in_use += in_use
+
+    def _waited(self):
+        started = getattr(self._local, 'started', None)
+        self._local.started = None
+        return (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count('pool_clears')
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count('connections_created')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count('connections_closed')
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        with self._lock:
+            self.counters['checkouts'] += 1
+            self.in_use += 1
+            self.wait_total_ms += waited
+            self.wait_max_ms = max(self.wait_max_ms, waited)
+
+    def connection_check_out_failed(self, event):
+        self._waited()
+        self._count('checkout_failures')
+
+    def connection_checked_in(self, event):
+        self._count('checkins', in_use=-1)
+
+    def stats(self):
+        with self._lock:
+            checkouts = self.counters['checkouts']
+            return {
+                **self.counters,
+                'in_use': self.in_use,
+                'wait_avg_ms': round(self.wait_total_ms / checkouts, 3) if checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max_ms, 3)
+            }
+
+class UpdateOne:
+    def __init__(self, filter, update, upsert=False):
+        self.filter = filter
+        self.update = update
+        self.upsert = upsert
+
+    def to_mongo(self):
+        return pymongo.UpdateOne(self.filter, self.update, upsert=self.upsert)
+
+class LazyCollection:
+    def __init__(self, storage, name):
+        self._storage = storage
+        self._name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._storage.db[self._name], attribute)
+
+    def bulk_write(self, requests, ordered=True):
+        return self._storage.db[self._name].bulk_write(
+            [request.to_mongo() if isinstance(request, UpdateOne) else request for request in requests],
+            ordered=ordered
+        )
+
+class MongoStorage:
+    name = 'mongo'
+
+    def __init__(self, uri=MONGODB_URI, database=MONGODB_DATABASE, **options):
+        self.uri = uri
+        self.database = database
+        self.options = {
+            key: value for key, value in {**MONGODB_POOL_OPTIONS, **options}.items() if value is not None
+        }
+        self.metrics = PoolMetrics()
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None or self._pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._pid != os.getpid():
+                    self.metrics.reset()
+                    self._client = MongoClient(self.uri, event_listeners=[self.metrics], **self.options)
+                    self._pid = os.getpid()
+        return self._client
+
+    @property
+    def db(self):
+        return self.client[self.database]
+
+    def collection(self, name):
+        return LazyCollection(self, name)
+
+    def ping(self):
+        self.client.admin.command('ping')
+        return True
+
+    def after_fork(self):
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            if self._client is not None and self._pid == os.getpid():
+                self._client.close()
+            self._client = None
+
+    def stats(self):
+        return {
+            'backend': self.name,
+            'connected': self._client is not None and self._pid == os.getpid(),
+            'pid': os.getpid(),
+            'options': self.options,
+            'pool': self.metrics.stats()
+        }
+
+class InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+class InsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+class UpdateResult:
+    def __init__(self, matched_count, modified_count, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+class DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+class BulkWriteResult:
+    def __init__(self, bulk_api_result):
+        self.bulk_api_result = bulk_api_result
+        self.matched_count = bulk_api_result['nMatched']
+        self.modified_count = bulk_api_result['nModified']
+        self.upserted_count = bulk_api_result['nUpserted']
+        self.upserted_ids = {entry['index']: entry['_id'] for entry in bulk_api_result['upserted']}
+
+def get_path(doc, path):
+    values = [doc]
+    for part in path.split('.'):
+        next_values = []
+        for value in values:
+            if isinstance(value, dict):
+                if part in value:
+                    next_values.append(value[part])
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict) and part in item:
+                        next_values.append(item[part])
+        values = next_values
+    return values
+
+def candidates(values):
+    flat = []
+    for value in values:
+        flat.append(value)
+        if isinstance(value, list):
+            flat.extend(value)
+    return flat
+
+def compare(left, right):
+    try:
+        return (left > right) - (left < right)
+    except TypeError:
+        return None
+
+def match_condition(values, condition):
+    if isinstance(condition, dict) and condition and all(key.startswith('$') for key in condition):
+        for operator, operand in condition.items():
+            flat = candidates(values)
+            if operator == '$exists':
+                if bool(values) != bool(operand):
+                    return False
+            elif operator == '$in':
+                if not any(value in operand for value in flat):
+                    return False
+            elif operator == '$nin':
+                if any(value in operand for value in flat):
+                    return False
+            elif operator == '$ne':
+                if operand in flat:
+                    return False
+            elif operator in ('$lt', '$lte', '$gt', '$gte'):
+                wanted = {'$lt': (-1,), '$lte': (-1, 0), '$gt': (1,), '$gte': (1, 0)}[operator]
+                if not any(compare(value, operand) in wanted for value in flat):
+                    return False
+            else:
+                raise ValueError(f"Unsupported query operator: {operator}")
+        return True
+
+    if condition is None:
+        return not values or None in candidates(values)
+    return condition in candidates(values)
+
+def matches(doc, query):
+    for key, condition in query.items():
+        if key == '$or':
+            if not any(matches(doc, sub_query) for sub_query in condition):
+                return False
+        elif key == '$and':
+            if not all(matches(doc, sub_query) for sub_query in condition):
+                return False
+        elif not match_condition(get_path(doc, key), condition):
+            return False
+    return True
+
+def clone(doc):
+    return bson.decode(bson.encode(doc))
+
+def project(doc, projection):
+    if not projection:
+        return clone(doc)
+
+    include_id = projection.get('_id', 1)
+    fields = {key: value for key, value in projection.items() if key != '_id'}
+
+    if all(fields.values()) if fields else include_id:
+        result = {}
+        for path in fields:
+            head, _, rest = path.partition('.')
+            if head not in doc:
+                continue
+            if not rest:
+                result[head] = copy.deepcopy(doc[head])
+            elif isinstance(doc[head], list):
+                existing = result.setdefault(head, [{} for _ in doc[head]])
+                for target, item in zip(existing, doc[head]):
+                    if isinstance(item, dict):
+                        target.update(project(item, {rest: 1, '_id': 0}))
+            elif isinstance(doc[head], dict):
+                result.setdefault(head, {}).update(project(doc[head], {rest: 1, '_id': 0}))
+        if include_id and '_id' in doc:
+            result['_id'] = doc['_id']
+        return result
+
+    result = clone(doc)
+    for path in fields:
+        result.pop(path, None)
+    if not include_id:
+        result.pop('_id', None)
+    return result
+
+def sort_key(value):
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, ObjectId):
+        return (3, value.binary)
+    return (4, value)
+
+def normalize_sort(key, direction=None):
+    if isinstance(key, (list, tuple)):
+        return list(key)
+    return [(key, direction or 1)]
+
+def write_error(position, error, op):
+    return {
+        'index': position, 'code': 11000, 'errmsg': str(error),
+        'keyValue': (error.details or {}).get('keyValue', {}), 'op': op
+    }
+
+class EmbeddedCursor:
+    def __init__(self, collection, query, projection):
+        self.collection = collection
+        self.query = query
+        self.projection = projection
+        self.sort_keys = []
+        self.limit_count = 0
+
+    def sort(self, key, direction=None):
+        self.sort_keys = normalize_sort(key, direction)
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        with self.collection.storage.lock:
+            docs = self.collection._matching(self.query)
+
+            for field, direction in reversed(self.sort_keys):
+                docs.sort(
+                    key=lambda doc: sort_key(next(iter(get_path(doc, field)), None)),
+                    reverse=direction == -1
+                )
+
+            if self.limit_count:
+                docs = docs[:self.limit_count]
+
+            return iter([project(doc, self.projection) for doc in docs])
+
+class EmbeddedCollection:
+    def __init__(self, storage, name):
+        self.storage = storage
+        self.name = name
+        self.docs = {}
+        self.indexes = {}
+        self.sequence = {}
+        self.counter = itertools.count()
+
+    def _key(self, doc_id):
+        return f"{type(doc_id).__name__}:{doc_id}"
+
+    def _index_values(self, doc, fields):
+        return tuple(
+            tuple(value) if isinstance(value, list) else value
+            for value in (next(iter(get_path(doc, field)), None) for field in fields)
+        )
+
+    def _check_unique(self, doc, ignore_key=None):
+        for name, index in self.indexes.items():
+            if not index['unique']:
+                continue
+            values = self._index_values(doc, index['fields'])
+            owner = index['unique_map'].get(values)
+            if owner is not None and owner != ignore_key:
+                key_value = dict(zip(index['fields'], values))
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.name} index: {name}",
+                    11000, {'keyValue': key_value}
+                )
+
+    def _add_to_indexes(self, key, doc):
+        for index in self.indexes.values():
+            self._add_to_index(index, key, doc)
+
+    def _add_to_index(self, index, key, doc):
+        if index['unique']:
+            index['unique_map'][self._index_values(doc, index['fields'])] = key
+        for field in index['fields']:
+            for value in candidates(get_path(doc, field)):
+                if not isinstance(value, (list, dict)):
+                    index['lookup'][field].setdefault(value, set()).add(key)
+
+    def _remove_from_indexes(self, key, doc):
+        for index in self.indexes.values():
+            if index['unique']:
+                index['unique_map'].pop(self._index_values(doc, index['fields']), None)
+            for field in index['fields']:
+                for value in candidates(get_path(doc, field)):
+                    if not isinstance(value, (list, dict)):
+                        index['lookup'][field].get(value, set()).discard(key)
+
+    def _record(self, key):
+        if self.storage.journal is not None:
+            self.storage.journal.append((self, key, self.docs.get(key), self.sequence.get(key)))
+
+    def _put(self, key, doc):
+        self._record(key)
+        previous = self.docs.get(key)
+        if previous is not None:
+            self._remove_from_indexes(key, previous)
+        else:
+            self.sequence[key] = next(self.counter)
+        self.docs[key] = doc
+        self._add_to_indexes(key, doc)
+
+    def _drop(self, key):
+        self._record(key)
+        self._remove_from_indexes(key, self.docs.pop(key))
+        del self.sequence[key]
+
+    def _restore(self, key, doc, sequence):
+        current = self.docs.get(key)
+        if current is not None:
+            self._remove_from_indexes(key, current)
+        if doc is None:
+            del self.docs[key]
+            del self.sequence[key]
+            return
+
+        self.docs[key] = doc
+        self.sequence[key] = sequence
+        if current is None:
+            self.docs = dict(sorted(self.docs.items(), key=lambda item: self.sequence[item[0]]))
+        self._add_to_indexes(key, doc)
+
+    def _candidate_keys(self, query):
+        best = None
+        for field, condition in query.items():
+            if field.startswith('$'):
+                continue
+            for index in self.indexes.values():
+                lookup = index['lookup'].get(field)
+                if lookup is None:
+                    continue
+                if isinstance(condition, dict) and set(condition) == {'$in'}:
+                    keys = set()
+                    for value in condition['$in']:
+                        keys.update(lookup.get(value, ()))
+                elif not isinstance(condition, (dict, list)) and condition is not None:
+                    keys = lookup.get(condition, set())
+                else:
+                    continue
+                if best is None or len(keys) < len(best):
+                    best = keys
+                break
+        return best
+
+    def _matching(self, query):
+        query = query or {}
+        keys = self._candidate_keys(query)
+        if keys is None:
+            docs = self.docs.values()
+        else:
+            docs = [self.docs[key] for key in sorted(keys, key=self.sequence.get) if key in self.docs]
+        return [doc for doc in docs if matches(doc, query)]
+
+    def create_index(self, keys, unique=False, name=None, **kwargs):
+        with self.storage.lock:
+            return self._create_index(keys, unique, name)
+
+    def _create_index(self, keys, unique, name):
+        fields = [field for field, _ in normalize_sort(keys)]
+        name = name or '_'.join(f"{field}_1" for field in fields)
+        index = {'fields': fields, 'unique': unique, 'unique_map': {}, 'lookup': {field: {} for field in fields}}
+
+        if name not in self.indexes:
+            self.indexes[name] = index
+            for key, doc in self.docs.items():
+                if unique and self._index_values(doc, fields) in index['unique_map']:
+                    del self.indexes[name]
+                    raise DuplicateKeyError(f"E11000 duplicate key error building index {name}", 11000)
+                self._add_to_index(index, key, doc)
+        return name
+
+    def _store(self, doc):
+        doc.setdefault('_id', ObjectId())
+        key = self._key(doc['_id'])
+        if key in self.docs:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: _id_", 11000,
+                                    {'keyValue': {'_id': doc['_id']}})
+        self._check_unique(doc)
+        stored = clone(doc)
+        self._put(key, stored)
+        return key, stored
+
+    def insert_one(self, doc):
+        with self.storage.transaction() as db:
+            key, stored = self._store(doc)
+            self.storage.write(db, self.name, key, stored)
+        return InsertOneResult(doc['_id'])
+
+    def insert_many(self, docs, ordered=True):
+        inserted_ids = []
+        write_errors = []
+
+        with self.storage.transaction() as db:
+            rows = []
+            for position, doc in enumerate(docs):
+                try:
+                    key, stored = self._store(doc)
+                    rows.append((self.name, key, bson.encode(stored)))
+                    inserted_ids.append(doc['_id'])
+                except DuplicateKeyError as e:
+                    write_errors.append(write_error(position, e, doc))
+                    if ordered:
+                        break
+            self.storage.write_many(db, rows)
+
+        if write_errors:
+            raise BulkWriteError({'nInserted': len(inserted_ids), 'writeErrors': write_errors})
+        return InsertManyResult(inserted_ids)
+
+    def find(self, query=None, projection=None, batch_size=None, **kwargs):
+        return EmbeddedCursor(self, query or {}, projection)
+
+    def find_one(self, query=None, projection=None, sort=None):
+        cursor = self.find(query, projection).limit(1)
+        if sort:
+            cursor.sort(sort)
+        return next(iter(cursor), None)
+
+    def count_documents(self, query):
+        return len(self._matching(query))
+
+    def _apply_update(self, doc, update, inserting=False):
+        updated = clone(doc)
+        for operator, fields in update.items():
+            if operator == '$setOnInsert' and not inserting:
+                continue
+            for path, value in fields.items():
+                target = updated
+                parts = path.split('.')
+                for part in parts[:-1]:
+                    target = target.setdefault(part, {})
+                if operator in ('$set', '$setOnInsert'):
+                    target[parts[-1]] = copy.deepcopy(value)
+                elif operator == '$inc':
+                    target[parts[-1]] = target.get(parts[-1], 0) + value
+                elif operator == '$unset':
+                    target.pop(parts[-1], None)
+                else:
+                    raise ValueError(f"Unsupported update operator: {operator}")
+        return updated
+
+    def _update_in(self, db, query, update, upsert=False):
+        matched = self._matching(query)[:1]
+
+        if not matched:
+            if not upsert:
+                return UpdateResult(0, 0)
+            seed = {key: value for key, value in query.items() if not key.startswith('$') and not isinstance(value, dict)}
+            key, stored = self._store(self._apply_update(seed, update, inserting=True))
+            self.storage.write(db, self.name, key, stored)
+            return UpdateResult(0, 0, stored['_id'])
+
+        current = matched[0]
+        key = self._key(current['_id'])
+        updated = self._apply_update(current, update)
+        self._check_unique(updated, ignore_key=key)
+        self._put(key, updated)
+        self.storage.write(db, self.name, key, updated)
+        return UpdateResult(1, int(updated != current))
+
+    def update_one(self, query, update, upsert=False):
+        with self.storage.transaction() as db:
+            return self._update_in(db, query, update, upsert)
+
+    def bulk_write(self, requests, ordered=True):
+        summary = {'nInserted': 0, 'nUpserted': 0, 'nMatched': 0, 'nModified': 0, 'nRemoved': 0,
+                   'upserted': [], 'writeErrors': [], 'writeConcernErrors': []}
+
+        with self.storage.transaction() as db:
+            for position, request in enumerate(requests):
+                if not isinstance(request, UpdateOne):
+                    raise TypeError(f"Unsupported bulk operation: {type(request).__name__}")
+                try:
+                    result = self._update_in(db, request.filter, request.update, request.upsert)
+                except DuplicateKeyError as e:
+                    summary['writeErrors'].append(write_error(position, e, {'q': request.filter, 'u': request.update}))
+                    if ordered:
+                        break
+                    continue
+
+                summary['nMatched'] += result.matched_count
+                summary['nModified'] += result.modified_count
+                if result.upserted_id is not None:
+                    summary['nUpserted'] += 1
+                    summary['upserted'].append({'index': position, '_id': result.upserted_id})
+
+        if summary['writeErrors']:
+            raise BulkWriteError(summary)
+        return BulkWriteResult(summary)
+
+    def _delete(self, query, limit=None):
+        with self.storage.transaction() as db:
+            docs = self._matching(query)
+            if limit:
+                docs = docs[:limit]
+
+            keys = []
+            for doc in docs:
+                key = self._key(doc['_id'])
+                self._drop(key)
+                keys.append(key)
+            self.storage.delete_many(db, self.name, keys)
+
+        return DeleteResult(len(docs))
+
+    def delete_one(self, query):
+        return self._delete(query, limit=1)
+
+    def delete_many(self, query):
+        return self._delete(query)
+
+class EmbeddedStorage:
+    name = 'embedded'
+
+    def __init__(self, path=EMBEDDED_DB_PATH):
+        self.path = path
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'collection TEXT NOT NULL, doc_key TEXT NOT NULL, body BLOB NOT NULL, '
+            'PRIMARY KEY (collection, doc_key))'
+        )
+        self.connection.commit()
+        self.collections = {}
+        self.journal = None
+        self._depth = 0
+
+    def collection(self, name):
+        with self.lock:
+            if name not in self.collections:
+                collection = EmbeddedCollection(self, name)
+                rows = self.connection.execute(
+                    'SELECT doc_key, body FROM documents WHERE collection = ? ORDER BY rowid', (name,)
+                )
+                for key, body in rows:
+                    collection.docs[key] = bson.decode(body)
+                    collection.sequence[key] = next(collection.counter)
+                self.collections[name] = collection
+            return self.collections[name]
+
+    def __getitem__(self, name):
+        return self.collection(name)
+
+    def transaction(self):
+        storage = self
+
+        class Transaction:
+            def __enter__(self):
+                storage.lock.acquire()
+                if storage._depth == 0:
+                    storage.journal = []
+                storage._depth += 1
+                return storage.connection
+
+            def __exit__(self, exc_type, exc, tb):
+                try:
+                    storage._depth -= 1
+                    if storage._depth == 0:
+                        journal, storage.journal = storage.journal, None
+                        if exc_type is None:
+                            storage.connection.commit()
+                        else:
+                            storage.connection.rollback()
+                            for collection, key, doc, sequence in reversed(journal):
+                                collection._restore(key, doc, sequence)
+                finally:
+                    storage.lock.release()
+
+        return Transaction()
+
+    def write(self, db, collection, key, doc):
+        db.execute(
+            'INSERT OR REPLACE INTO documents (collection, doc_key, body) VALUES (?, ?, ?)',
+            (collection, key, bson.encode(doc))
+        )
+
+    def write_many(self, db, rows):
+        db.executemany('INSERT OR REPLACE INTO documents (collection, doc_key, body) VALUES (?, ?, ?)', rows)
+
+    def delete_many(self, db, collection, keys):
+        db.executemany('DELETE FROM documents WHERE collection = ? AND doc_key = ?', [(collection, key) for key in keys])
+
+    def ping(self):
+        self.connection.execute('SELECT 1')
+        return True
+
+    def stats(self):
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'collections': {name: len(collection.docs) for name, collection in self.collections.items()}
+        }
+
+def open_storage(backend=None):
+    backend = (backend or STORAGE_BACKEND).lower()
+    if backend == 'mongo':
+        storage = MongoStorage()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=storage.after_fork)
+        return storage
+    if backend in ('embedded', 'sqlite', 'memory'):
+        return EmbeddedStorage(':memory:' if backend == 'memory' else EMBEDDED_DB_PATH)
+    raise ValueError(f"Unknown storage backend: {backend}")
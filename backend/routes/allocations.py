@@ -1,18 +1,124 @@
 from flask import Blueprint, request, jsonify, send_file
-from models.database import Allocation, Student, Room
+from models.database import Allocation, Student, Room, Session, SubjectStats, ALLOCATION_PAGE_SIZE
 from services.allocation_service import AllocationService
+from services.batch_allocation_service import BatchAllocationService
+from services.clash_service import ClashService
+from services.indent_service import IndentService, DEFAULT_SPARE_PERCENT
+from services.roll_range_service import RollRangeService, DEFAULT_MAX_GAP
 from services.excel_service import ExcelService
+from services.feasibility_service import FeasibilityService
 from utils.json_utils import serialize_document
 import tempfile
+import time
 import os
 
 allocations_bp = Blueprint('allocations', __name__)
 
+def load_students(data):
+    subject_filter = data.get('subject_filter', '')
+    session_key = data.get('session')
+
+    if session_key:
+        session = Session.get(session_key)
+        if not session:
+            return None, None, (jsonify({'error': f'Session not found: {session_key}'}), 404)
+        students = list(Student.iter_for_allocation(subjects=session['subjects']))
+        if not students:
+            return None, None, (jsonify({'error': f'No students registered for session: {session_key}'}), 400)
+        return students, session, None
+
+    if data.get('exams'):
+        subjects = {subject for exam in data['exams'] for subject in exam.get('subjects', [])}
+        students = list(Student.iter_for_allocation(subjects=subjects))
+        if not students:
+            return None, None, (jsonify({'error': 'No students registered for the listed exams'}), 400)
+        return students, None, None
+
+    students = list(Student.iter_for_allocation(subject_filter))
+    if not students:
+        if subject_filter:
+            return None, None, (jsonify({'error': f'No students found for subject: {subject_filter}'}), 400)
+        return None, None, (jsonify({'error': 'No students found'}), 400)
+    return students, None, None
+
+def load_counts(data):
+    subject_filter = data.get('subject_filter', '')
+    session_key = data.get('session')
+    session = None
+
+    if session_key:
+        session = Session.get(session_key)
+        if not session:
+            return None, None, (jsonify({'error': f'Session not found: {session_key}'}), 404)
+        subjects = set(session['subjects'])
+        empty = f'No students registered for session: {session_key}'
+    elif data.get('exams'):
+        subjects = {subject for exam in data['exams'] for subject in exam.get('subjects', [])}
+        empty = 'No students registered for the listed exams'
+    elif subject_filter:
+        total = Student.count(subject_filter)
+        if not total:
+            return None, None, (jsonify({'error': f'No students found for subject: {subject_filter}'}), 400)
+        return {'subject_counts': {subject_filter: total}, 'primary_counts': {subject_filter: total}, 'total': total}, None, None
+    else:
+        total = Student.count()
+        if not total:
+            return None, None, (jsonify({'error': 'No students found'}), 400)
+        subject_counts = SubjectStats.get_counts()
+        primary_counts = SubjectStats.get_counts(field='primary')
+        unknown = total - sum(primary_counts.values())
+        if unknown > 0:
+            subject_counts['Unknown'] = primary_counts['Unknown'] = unknown
+        return {'subject_counts': subject_counts, 'primary_counts': primary_counts, 'total': total}, None, None
+
+    total = Student.count(subjects=subjects)
+    if not total:
+        return None, None, (jsonify({'error': empty}), 400)
+    subject_counts = SubjectStats.get_counts(subjects)
+    return {'subject_counts': subject_counts, 'primary_counts': subject_counts, 'total': total}, session, None
+
+def clash_check(data, students, sessions):
+    report = ClashService.detect(students, sessions)
+    if report['clash_count'] and data.get('fail_on_clash'):
+        return report, (jsonify({
+            'error': f"{report['clashing_students']} students have two papers in the same session",
+            'clash_report': report
+        }), 409)
+    return report, None
+
+def indent_response(headers, label):
+    started = time.perf_counter()
+    indent = IndentService.aggregate(
+        headers, Session.subject_info(),
+        request.args.get('spare_percent', DEFAULT_SPARE_PERCENT, type=float),
+        IndentService.parse_subject_spare(request.args.get('subject_spare'))
+    )
+    indent['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    if request.args.get('format') == 'xlsx':
+        return send_file(
+            IndentService.to_xlsx(indent, request.args.get('title')),
+            as_attachment=True,
+            download_name=f"question_paper_indent_{label}.xlsx",
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+    return jsonify(indent)
+
 @allocations_bp.route('/allocations', methods=['GET'])
 def get_allocations():
     try:
-        allocations = Allocation.get_all()
-        return jsonify([serialize_document(allocation) for allocation in allocations])
+        try:
+            allocations, next_cursor = Allocation.list_summaries(
+                limit=request.args.get('limit', ALLOCATION_PAGE_SIZE),
+                cursor=request.args.get('cursor')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify({
+            'allocations': [serialize_document(allocation) for allocation in allocations],
+            'next_cursor': next_cursor
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -23,42 +129,164 @@ def create_allocation():
         strategy = data.get('strategy', 'mixed')
         subject_filter = data.get('subject_filter', '')
 
-        students_raw = Student.get_all()
         rooms_raw = Room.get_all()
-
-        if not students_raw:
-            return jsonify({'error': 'No students found'}), 400
         if not rooms_raw:
             return jsonify({'error': 'No rooms found'}), 400
 
-        students = [serialize_document(s) for s in students_raw]
-        rooms = [serialize_document(r) for r in rooms_raw]
+        students, session, error = load_students(data)
+        if error:
+            return error
 
-        if subject_filter:
-            students = [s for s in students if subject_filter in (s.get('subjects', []) or [s.get('subject', '')])]
-            if not students:
-                return jsonify({'error': f'No students found for subject: {subject_filter}'}), 400
+        clash_report = None
+        if session:
+            clash_report, error = clash_check(data, students, [session])
+            if error:
+                return error
 
-        allocation_service = AllocationService()
-        result = allocation_service.allocate_seats(students, rooms, strategy)
+        rooms = [serialize_document(r) for r in rooms_raw]
+
+        header_fields = {'session': data['session']} if data.get('session') else {}
+        exams = data.get('exams')
+        if strategy == 'multi_exam':
+            if not exams and session:
+                exams = Session.exams(session)
+            session_info = data.get('session_info') or {}
+            header_fields['type'] = 'multi_exam'
+            header_fields['session_info'] = {
+                'session_name': session_info.get('session_name') or data.get('session') or 'Multi-Exam Session',
+                'created_by': session_info.get('created_by', 'System Administrator'),
+                'exams': exams or []
+            }
+
+        allocation_service = AllocationService(collect_diagnostics=bool(data.get('diagnostics', False)))
+        result = allocation_service.allocate_seats(students, rooms, strategy, exams)
+        if 'session_info' in header_fields:
+            result['session_info'] = header_fields['session_info']
 
         allocation_id = Allocation.create(
             strategy=strategy,
             subject_filter=subject_filter,
             allocations=result['allocations'],
-            allocation_summary=result['summary']
+            allocation_summary=result['summary'],
+            **header_fields
         )
 
-        return jsonify({
+        response = {
             'message': 'Allocation created successfully',
             'allocation_id': str(allocation_id),
             'allocation': serialize_document(result)
+        }
+        if clash_report is not None:
+            response['clash_report'] = clash_report
+
+        return jsonify(response), 201
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@allocations_bp.route('/allocations/batch', methods=['POST'])
+def create_batch_allocation():
+    try:
+        started = time.perf_counter()
+        data = request.get_json() or {}
+        strategy = data.get('strategy', 'mixed')
+
+        if strategy not in FeasibilityService.STRATEGIES:
+            return jsonify({'error': f'Unknown strategy: {strategy}'}), 400
+
+        sessions = Session.get_all()
+        if data.get('sessions'):
+            wanted = set(data['sessions'])
+            sessions = [session for session in sessions if session['session_key'] in wanted]
+            missing = wanted - {session['session_key'] for session in sessions}
+            if missing:
+                return jsonify({'error': f"Sessions not found: {', '.join(sorted(missing))}"}), 404
+        if not sessions:
+            return jsonify({'error': 'No sessions found. Import a timetable first'}), 400
+
+        rooms_raw = Room.get_all()
+        if not rooms_raw:
+            return jsonify({'error': 'No rooms found'}), 400
+
+        subjects = {subject for session in sessions for subject in session['subjects']}
+        students = list(Student.iter_for_allocation(subjects=subjects))
+        if not students:
+            return jsonify({'error': 'No students registered for the selected sessions'}), 400
+
+        clash_report, error = clash_check(data, students, sessions)
+        if error:
+            return error
+
+        result = BatchAllocationService.run(
+            students, sessions, [serialize_document(room) for room in rooms_raw], strategy,
+            data.get('workers'), bool(data.get('diagnostics', False))
+        )
+
+        return jsonify({
+            'message': f"Allocated {len(result['sessions'])} sessions",
+            **result,
+            'clash_report': clash_report,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
         }), 201
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@allocations_bp.route('/allocations/batch/<batch_id>', methods=['GET'])
+def get_batch_allocation(batch_id):
+    try:
+        allocations = Allocation.list_by_batch(batch_id)
+        if not allocations:
+            return jsonify({'error': 'Batch not found'}), 404
+        return jsonify({
+            'batch_id': batch_id,
+            'allocations': [serialize_document(allocation) for allocation in allocations]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@allocations_bp.route('/allocations/batch/<batch_id>/indent', methods=['GET'])
+def get_batch_indent(batch_id):
+    try:
+        headers = Allocation.get_breakdowns(batch_id=batch_id)
+        if not headers:
+            return jsonify({'error': 'Batch not found'}), 404
+        return indent_response(headers, batch_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@allocations_bp.route('/allocations/feasibility', methods=['POST'])
+def check_allocation_feasibility():
+    try:
+        data = request.get_json() or {}
+        strategy = data.get('strategy')
+
+        if strategy and strategy not in FeasibilityService.STRATEGIES:
+            return jsonify({'error': f'Unknown strategy: {strategy}'}), 400
+
+        rooms = Room.get_all()
+        if not rooms:
+            return jsonify({'error': 'No rooms found'}), 400
+
+        counts, session, error = load_counts(data)
+        if error:
+            return error
+
+        report = FeasibilityService().analyze(
+            counts['subject_counts'], counts['primary_counts'], rooms,
+            [strategy] if strategy else None, counts['total']
+        )
+        if session:
+            report['clash_papers'] = sum(counts['subject_counts'].values()) - counts['total']
+        return jsonify(report)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 
 @allocations_bp.route('/allocations/<allocation_id>', methods=['GET'])
 def get_allocation(allocation_id):
@@ -70,6 +298,102 @@ def get_allocation(allocation_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@allocations_bp.route('/allocations/<allocation_id>/indent', methods=['GET'])
+def get_allocation_indent(allocation_id):
+    try:
+        headers = Allocation.get_breakdowns(allocation_id=allocation_id)
+        if not headers:
+            return jsonify({'error': 'Allocation not found'}), 404
+        return indent_response(headers, allocation_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@allocations_bp.route('/allocations/<allocation_id>/hall-ranges', methods=['GET'])
+def get_hall_ranges(allocation_id):
+    try:
+        group_by = request.args.get('group_by', 'department')
+        if group_by not in RollRangeService.GROUP_FIELDS:
+            return jsonify({'error': f"group_by must be one of: {', '.join(RollRangeService.GROUP_FIELDS)}"}), 400
+
+        header, rows = Allocation.get_roll_rows(allocation_id)
+        if header is None:
+            return jsonify({'error': 'Allocation not found'}), 404
+
+        started = time.perf_counter()
+        report = RollRangeService.hall_ranges(
+            rows, group_by or None, request.args.get('max_gap', DEFAULT_MAX_GAP, type=int)
+        )
+        report['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        report['session'] = header.get('session')
+
+        title = request.args.get('title') or f"Hall Allotment {header.get('session') or ''}".strip()
+        output = request.args.get('format')
+        if output == 'xlsx':
+            return send_file(
+                RollRangeService.to_xlsx(report, title),
+                as_attachment=True,
+                download_name=f"hall_ranges_{allocation_id}.xlsx",
+                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            )
+        if output == 'pdf':
+            return send_file(
+                RollRangeService.to_pdf(report, title),
+                as_attachment=True,
+                download_name=f"hall_ranges_{allocation_id}.pdf",
+                mimetype='application/pdf'
+            )
+        return jsonify(report)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@allocations_bp.route('/allocations/<allocation_id>/rooms/<room_id>', methods=['GET'])
+def get_allocation_room(allocation_id, room_id):
+    try:
+        room_allocation = Allocation.get_room(allocation_id, room_id)
+        if room_allocation:
+            return jsonify(serialize_document(room_allocation))
+        return jsonify({'error': 'Room not found in allocation'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def seat_lookup_response(allocation_id, roll_number):
+    row = Allocation.find_seat(allocation_id, roll_number)
+    if row is None:
+        return jsonify({'error': f'No seat found for roll number {roll_number}'}), 404
+
+    grid = row.get('grid') or {}
+    return jsonify({
+        'allocation_id': str(allocation_id),
+        'roll_number': row['roll_number'],
+        'name': row.get('name'),
+        'year': row.get('year'),
+        'subject': row.get('subject'),
+        'room_id': row['room_id'],
+        'room_name': row.get('room_name'),
+        'seat_number': row['seat'],
+        'bench': grid.get('bench_num'),
+        'position': grid.get('position'),
+        'row': grid.get('row'),
+        'column': grid.get('col')
+    })
+
+@allocations_bp.route('/allocations/latest/seat/<path:roll_number>', methods=['GET'])
+def get_latest_seat(roll_number):
+    try:
+        allocation_id = Allocation.get_latest_id()
+        if allocation_id is None:
+            return jsonify({'error': 'No allocations found'}), 404
+        return seat_lookup_response(allocation_id, roll_number)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@allocations_bp.route('/allocations/<allocation_id>/seat/<path:roll_number>', methods=['GET'])
+def get_seat(allocation_id, roll_number):
+    try:
+        return seat_lookup_response(allocation_id, roll_number)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @allocations_bp.route('/allocations/latest', methods=['GET'])
 def get_latest_allocation():
     try:
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
+import time
 from models.database import Room
 from utils.json_utils import serialize_document
-from utils.csv_utils import parse_csv_content, generate_sample_csv
+from utils.csv_utils import parse_csv_rows, generate_sample_csv, import_csv_stream, upload_lines, stream_summary
+from utils.room_layout import normalize_layout_fields, validate_capacity
 
 rooms_bp = Blueprint('rooms', __name__)
 
@@ -23,15 +25,16 @@ def create_room():
 
         capacity = int(data['capacity'])
 
-        if capacity <= 0:
-            return jsonify({'error': 'Room capacity must be greater than 0'}), 400
-
-        if capacity > 50:
-            return jsonify({'error': 'Room capacity cannot exceed 50 seats'}), 400
+        try:
+            layout = normalize_layout_fields(data)
+            validate_capacity(capacity, layout.get('benches_per_row'), layout.get('seats_per_bench'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         room_id = Room.create(
             name=data['name'],
-            capacity=capacity
+            capacity=capacity,
+            **layout
         )
 
         return jsonify({
@@ -57,15 +60,24 @@ def update_room(room_id):
     try:
         data = request.get_json()
         if 'capacity' in data:
-            capacity = int(data['capacity'])
+            data['capacity'] = int(data['capacity'])
+
+        layout_fields = ('capacity', 'benches_per_row', 'seats_per_bench', 'aisles')
+        if any(field in data for field in layout_fields):
+            existing_room = Room.get_by_id(room_id)
+            if not existing_room:
+                return jsonify({'error': 'Room not found'}), 404
 
-            if capacity <= 0:
-                return jsonify({'error': 'Room capacity must be greater than 0'}), 400
+            merged = {field: existing_room.get(field) for field in layout_fields}
+            merged.update({field: data[field] for field in layout_fields if field in data})
 
-            if capacity > 50:
-                return jsonify({'error': 'Room capacity cannot exceed 50 seats'}), 400
+            try:
+                layout = normalize_layout_fields(merged)
+                validate_capacity(merged['capacity'], layout.get('benches_per_row'), layout.get('seats_per_bench'))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
 
-            data['capacity'] = capacity
+            data.update({field: value for field, value in layout.items() if field in data})
 
         result = Room.update(room_id, **data)
 
@@ -88,43 +100,42 @@ def delete_room(room_id):
 @rooms_bp.route('/rooms/csv/upload', methods=['POST'])
 def upload_rooms_csv():
     try:
+        started = time.perf_counter()
+
+        if 'file' in request.files:
+            report = import_csv_stream(
+                upload_lines(request.files['file']), 'rooms',
+                lambda rows, row_numbers: Room.bulk_create(rows, row_numbers=row_numbers),
+                request.form.get('chunk_size', type=int)
+            )
+            response = stream_summary(report, time.perf_counter() - started)
+            response['message'] = f"Successfully imported {report['counts'].get('created', 0)} rooms"
+            return jsonify(response), 201 if report['counts'].get('created') else 400
+
         data = request.get_json()
 
         if 'csv_content' not in data:
             return jsonify({'error': 'Missing CSV content'}), 400
 
-        rooms_data = parse_csv_content(data['csv_content'], 'rooms')
+        rooms_data = parse_csv_rows(data['csv_content'], 'rooms')
 
         if not rooms_data:
             return jsonify({'error': 'No valid room data found in CSV'}), 400
 
-        created_count = 0
-        errors = []
-
-        for room_data in rooms_data:
-            try:
-                capacity = room_data['capacity']
-
-                if capacity <= 0:
-                    errors.append(f"Room {room_data.get('name', 'Unknown')}: Capacity must be greater than 0")
-                    continue
-
-                if capacity > 50:
-                    errors.append(f"Room {room_data.get('name', 'Unknown')}: Capacity cannot exceed 50 seats")
-                    continue
-
-                Room.create(
-                    name=room_data['name'],
-                    capacity=capacity
-                )
-                created_count += 1
-            except Exception as e:
-                errors.append(f"Error creating room {room_data.get('name', 'Unknown')}: {str(e)}")
+        created_count, write_errors = Room.bulk_create(
+            [room for _, room in rooms_data],
+            row_numbers=[row_num for row_num, _ in rooms_data],
+            chunk_size=data.get('chunk_size')
+        )
+        errors = [f"Row {row_num}: {message}" for row_num, message in write_errors]
+        elapsed = time.perf_counter() - started
 
         response = {
             'message': f'Successfully imported {created_count} rooms',
             'created_count': created_count,
-            'total_rows': len(rooms_data)
+            'total_rows': len(rooms_data),
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'rows_per_second': round(len(rooms_data) / elapsed, 1) if elapsed > 0 else None
         }
 
         if errors:
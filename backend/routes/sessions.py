@@ -0,0 +1,113 @@
+from flask import Blueprint, request, jsonify
+import os
+import time
+import tempfile
+from models.database import Session, Student
+from services.import_service import ImportService
+from services.clash_service import ClashService, MAX_REPORTED_CLASHES
+from utils.json_utils import serialize_document
+
+sessions_bp = Blueprint('sessions', __name__)
+
+@sessions_bp.route('/sessions', methods=['GET'])
+def get_sessions():
+    try:
+        sessions = Session.get_all()
+        if request.args.get('include_entries', '').lower() not in ('1', 'true', 'yes'):
+            sessions = [{key: value for key, value in session.items() if key != 'entries'} for session in sessions]
+        return jsonify([serialize_document(session) for session in sessions])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@sessions_bp.route('/sessions/subject-index', methods=['GET'])
+def get_session_subject_index():
+    try:
+        return jsonify(Session.get_subject_index())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@sessions_bp.route('/sessions/clashes', methods=['GET'])
+def get_session_clashes():
+    try:
+        started = time.perf_counter()
+        session_keys = [key for key in request.args.get('sessions', '').split(',') if key]
+        sessions = Session.get_all()
+        if session_keys:
+            sessions = [session for session in sessions if session['session_key'] in session_keys]
+        if not sessions:
+            return jsonify({'error': 'No sessions found. Import a timetable first'}), 404
+
+        students = list(Student.iter_for_allocation(
+            subjects={subject for session in sessions for subject in session['subjects']}
+        ))
+        loaded = time.perf_counter()
+        report = ClashService.detect(students, sessions, request.args.get('limit', MAX_REPORTED_CLASHES, type=int))
+        report['load_ms'] = round((loaded - started) * 1000, 2)
+        report['detect_ms'] = round((time.perf_counter() - loaded) * 1000, 2)
+        return jsonify(report)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@sessions_bp.route('/sessions/by-subject/<subject>', methods=['GET'])
+def get_sessions_by_subject(subject):
+    try:
+        return jsonify([serialize_document(session) for session in Session.get_by_subject(subject)])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@sessions_bp.route('/sessions/<session_key>', methods=['GET'])
+def get_session(session_key):
+    try:
+        session = Session.get(session_key)
+        if session:
+            return jsonify(serialize_document(session))
+        return jsonify({'error': 'Session not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@sessions_bp.route('/sessions/timetable/upload', methods=['POST'])
+def upload_timetables():
+    try:
+        started = time.perf_counter()
+        uploads = request.files.getlist('files')
+
+        if not uploads:
+            return jsonify({'error': 'No timetables uploaded (expected multipart field "files")'}), 400
+
+        sheets = [sheet.strip() for sheet in request.form.get('sheets', '').split(',') if sheet.strip()] or None
+
+        with tempfile.TemporaryDirectory() as folder:
+            paths = []
+            for position, upload in enumerate(uploads):
+                os.makedirs(os.path.join(folder, str(position)))
+                path = os.path.join(folder, str(position), os.path.basename(upload.filename or 'timetable.xlsx'))
+                upload.save(path)
+                paths.append(path)
+
+            totals, files, errors = ImportService.import_timetable_workbooks(paths, sheets)
+
+        total_slots = sum(summary['slots'] for summary in files)
+        response = {
+            'message': f"Imported {total_slots} exam slots from {len(files)} timetables",
+            **{f"{key}_count": value for key, value in totals.items()},
+            'files': files,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+        if errors:
+            response['errors'] = errors
+
+        return jsonify(response), 201 if total_slots else 400
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@sessions_bp.route('/sessions/all', methods=['DELETE'])
+def delete_all_sessions():
+    try:
+        result = Session.delete_all()
+        return jsonify({
+            'message': f'Successfully deleted {result.deleted_count} sessions',
+            'deleted_count': result.deleted_count
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
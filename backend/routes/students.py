@@ -1,7 +1,12 @@
 from flask import Blueprint, request, jsonify
+from pymongo.errors import DuplicateKeyError
+import os
+import time
+import tempfile
 from models.database import Student
 from utils.json_utils import serialize_document
-from utils.csv_utils import parse_csv_content, generate_sample_csv
+from utils.csv_utils import parse_csv_rows, generate_sample_csv, import_csv_stream, upload_lines, stream_summary
+from services.import_service import ImportService
 
 students_bp = Blueprint('students', __name__)
 
@@ -39,6 +44,8 @@ def create_student():
             'student_id': str(student_id)
         }), 201
 
+    except DuplicateKeyError:
+        return jsonify({'error': f"A student with roll number '{data['roll_number']}' already exists"}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -61,6 +68,8 @@ def update_student(student_id):
         if result.matched_count:
             return jsonify({'message': 'Student updated successfully'})
         return jsonify({'error': 'Student not found'}), 404
+    except DuplicateKeyError:
+        return jsonify({'error': f"A student with roll number '{data.get('roll_number')}' already exists"}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -85,35 +94,67 @@ def get_student_subjects():
 @students_bp.route('/students/csv/upload', methods=['POST'])
 def upload_students_csv():
     try:
+        started = time.perf_counter()
+
+        if 'file' in request.files:
+            mode = request.form.get('mode', 'insert')
+            write_chunk = Student.bulk_upsert if mode == 'upsert' else Student.bulk_create
+            report = import_csv_stream(
+                upload_lines(request.files['file']), 'students',
+                lambda rows, row_numbers: write_chunk(rows, row_numbers=row_numbers),
+                request.form.get('chunk_size', type=int)
+            )
+            response = {'mode': mode, **stream_summary(report, time.perf_counter() - started)}
+            response['message'] = f"Processed {report['total_rows']} rows from {request.files['file'].filename}"
+            written = sum(report['counts'].values())
+            return jsonify(response), 201 if written > 0 else 400
+
         data = request.get_json()
 
         if 'csv_content' not in data:
             return jsonify({'error': 'Missing CSV content'}), 400
 
-        students_data = parse_csv_content(data['csv_content'], 'students')
+        students_data = parse_csv_rows(data['csv_content'], 'students')
 
         if not students_data:
             return jsonify({'error': 'No valid student data found in CSV'}), 400
 
-        created_count = 0
-        errors = []
-
-        for student_data in students_data:
-            try:
-                Student.create(
-                    name=student_data['name'],
-                    roll_number=student_data['roll_number'],
-                    year=student_data['year'],
-                    subjects=student_data['subjects']
-                )
-                created_count += 1
-            except Exception as e:
-                errors.append(f"Error creating student {student_data.get('name', 'Unknown')}: {str(e)}")
+        if data.get('mode') == 'upsert':
+            counts, write_errors = Student.bulk_upsert(
+                [student for _, student in students_data],
+                row_numbers=[row_num for row_num, _ in students_data],
+                chunk_size=data.get('chunk_size')
+            )
+            elapsed = time.perf_counter() - started
+            response = {
+                'message': f"Imported {len(students_data)} rows: {counts['created']} created, "
+                           f"{counts['updated']} updated, {counts['unchanged']} unchanged",
+                'mode': 'upsert',
+                'created_count': counts['created'],
+                'updated_count': counts['updated'],
+                'unchanged_count': counts['unchanged'],
+                'total_rows': len(students_data),
+                'elapsed_ms': round(elapsed * 1000, 2),
+                'rows_per_second': round(len(students_data) / elapsed, 1) if elapsed > 0 else None
+            }
+            if write_errors:
+                response['errors'] = [f"Row {row_num}: {message}" for row_num, message in write_errors]
+            return jsonify(response), 200 if len(write_errors) < len(students_data) else 400
+
+        created_count, write_errors = Student.bulk_create(
+            [student for _, student in students_data],
+            row_numbers=[row_num for row_num, _ in students_data],
+            chunk_size=data.get('chunk_size')
+        )
+        errors = [f"Row {row_num}: {message}" for row_num, message in write_errors]
+        elapsed = time.perf_counter() - started
 
         response = {
             'message': f'Successfully imported {created_count} students',
             'created_count': created_count,
-            'total_rows': len(students_data)
+            'total_rows': len(students_data),
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'rows_per_second': round(len(students_data) / elapsed, 1) if elapsed > 0 else None
         }
 
         if errors:
@@ -124,6 +165,45 @@ def upload_students_csv():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@students_bp.route('/students/xlsx/upload', methods=['POST'])
+def upload_students_xlsx():
+    try:
+        started = time.perf_counter()
+        uploads = request.files.getlist('files')
+
+        if not uploads:
+            return jsonify({'error': 'No workbooks uploaded (expected multipart field "files")'}), 400
+
+        with tempfile.TemporaryDirectory() as folder:
+            paths = []
+            for position, upload in enumerate(uploads):
+                os.makedirs(os.path.join(folder, str(position)))
+                path = os.path.join(folder, str(position), os.path.basename(upload.filename or 'workbook.xlsx'))
+                upload.save(path)
+                paths.append(path)
+
+            totals, files, errors = ImportService.import_application_workbooks(
+                paths, request.form.get('mode', 'upsert'), request.form.get('workers', type=int)
+            )
+
+        elapsed = time.perf_counter() - started
+        total_students = sum(summary['students'] for summary in files)
+
+        response = {
+            'message': f"Imported {total_students} students from {len(files)} workbooks",
+            **{f"{key}_count": value for key, value in totals.items()},
+            'files': files,
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'rows_per_second': round(total_students / elapsed, 1) if elapsed > 0 else None
+        }
+        if errors:
+            response['errors'] = errors
+
+        return jsonify(response), 201 if total_students else 400
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @students_bp.route('/students/csv/sample', methods=['GET'])
 def get_students_csv_sample():
     try:
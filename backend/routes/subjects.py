@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
-from models.database import Subject
+import time
+from models.database import Subject, SubjectStats
 from utils.json_utils import serialize_document
-from utils.csv_utils import parse_csv_content, generate_sample_csv
+from utils.csv_utils import parse_csv_rows, generate_sample_csv, import_csv_stream, upload_lines, stream_summary
 
 subjects_bp = Blueprint('subjects', __name__)
 
@@ -21,6 +22,13 @@ def get_subject_names():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@subjects_bp.route('/subjects/stats', methods=['GET'])
+def get_subject_stats():
+    try:
+        return jsonify(SubjectStats.get_all())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @subjects_bp.route('/subjects', methods=['POST'])
 def create_subject():
     try:
@@ -53,33 +61,42 @@ def delete_subject(name):
 @subjects_bp.route('/subjects/csv/upload', methods=['POST'])
 def upload_subjects_csv():
     try:
+        started = time.perf_counter()
+
+        if 'file' in request.files:
+            report = import_csv_stream(
+                upload_lines(request.files['file']), 'subjects',
+                lambda rows, row_numbers: Subject.bulk_create([row['name'] for row in rows], row_numbers=row_numbers),
+                request.form.get('chunk_size', type=int)
+            )
+            response = stream_summary(report, time.perf_counter() - started)
+            response['message'] = f"Successfully imported {report['counts'].get('created', 0)} subjects"
+            return jsonify(response), 201 if report['counts'].get('created') else 400
+
         data = request.get_json()
 
         if 'csv_content' not in data:
             return jsonify({'error': 'Missing CSV content'}), 400
 
-        subjects_data = parse_csv_content(data['csv_content'], 'subjects')
+        subjects_data = parse_csv_rows(data['csv_content'], 'subjects')
 
         if not subjects_data:
             return jsonify({'error': 'No valid subject data found in CSV'}), 400
 
-        created_count = 0
-        errors = []
-
-        for subject_data in subjects_data:
-            try:
-                subject_id = Subject.create(subject_data['name'])
-                if subject_id is not None:
-                    created_count += 1
-                else:
-                    errors.append(f"Subject {subject_data['name']} already exists")
-            except Exception as e:
-                errors.append(f"Error creating subject {subject_data.get('name', 'Unknown')}: {str(e)}")
+        created_count, write_errors = Subject.bulk_create(
+            [subject['name'] for _, subject in subjects_data],
+            row_numbers=[row_num for row_num, _ in subjects_data],
+            chunk_size=data.get('chunk_size')
+        )
+        errors = [f"Row {row_num}: {message}" for row_num, message in write_errors]
+        elapsed = time.perf_counter() - started
 
         response = {
             'message': f'Successfully imported {created_count} subjects',
             'created_count': created_count,
-            'total_rows': len(subjects_data)
+            'total_rows': len(subjects_data),
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'rows_per_second': round(len(subjects_data) / elapsed, 1) if elapsed > 0 else None
         }
 
         if errors:
@@ -1,41 +1,82 @@
 import random
 import math
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
+from services.diagnostics import AllocationDiagnostics, NO_PHASE
+from services.seat_index import SeatIndex, SubjectInterner
+from utils.room_layout import compile_layout, layout_for_room
+
+DEFAULT_EXAM_DURATION = 180
 
 class AllocationService:
-    def __init__(self):
+    def __init__(self, collect_diagnostics=False, subject_bits=None):
         self.MIN_DISTANCE = 2
         self.MAX_ATTEMPTS = 2000
         self.PREFERRED_DISTANCE = 3
         self.STRICT_MODE = True
+        self.collect_diagnostics = collect_diagnostics
+        self.diagnostics = None
+        self.shared_subject_bits = subject_bits
+        self.subject_bits = subject_bits or SubjectInterner()
+        self._student_masks = {}
+        self._exam_bits = 0
+
+    def allocate_seats(self, students, rooms, strategy='mixed', exams=None):
+        self.diagnostics = AllocationDiagnostics() if self.collect_diagnostics else None
+        self.subject_bits = self.shared_subject_bits or SubjectInterner()
+        self._student_masks = {}
+        self._exam_bits = 0
 
-    def allocate_seats(self, students, rooms, strategy='mixed'):
         if strategy == 'mixed':
-            return self._allocate_mixed_strategy(students, rooms)
+            result = self._allocate_mixed_strategy(students, rooms)
         elif strategy == 'separated':
-            return self._allocate_separated_strategy(students, rooms)
+            result = self._allocate_separated_strategy(students, rooms)
         elif strategy == 'optimal_packing':
-            return self._allocate_optimal_packing_strategy(students, rooms)
+            result = self._allocate_optimal_packing_strategy(students, rooms)
+        elif strategy == 'multi_exam':
+            result = self._allocate_multi_exam_strategy(students, rooms, exams or [])
         else:
             raise ValueError(f"Unknown strategy: {strategy}")
 
-    def _allocate_mixed_strategy(self, students, rooms):
-        students_by_subject = defaultdict(list)
-        for student in students:
+        if self.diagnostics:
+            result['summary']['diagnostics'] = self.diagnostics.to_dict()
+
+        return result
+
+    def _phase(self, name):
+        if self.diagnostics:
+            return self.diagnostics.phase(name)
+        return NO_PHASE
+
+    def _subject_mask(self, student):
+        mask = self._student_masks.get(id(student))
+        if mask is None:
             student_subjects = student.get('subjects', [])
             if not student_subjects and student.get('subject'):
                 student_subjects = [student['subject']]
+            mask = self.subject_bits.mask(student_subjects or ['Unknown'])
+            self._student_masks[id(student)] = mask
+        return mask
 
-            primary_subject = student_subjects[0] if student_subjects else 'Unknown'
-            students_by_subject[primary_subject].append(student)
+    def _allocate_mixed_strategy(self, students, rooms):
+        with self._phase('grouping'):
+            students_by_subject = defaultdict(list)
+            for student in students:
+                student_subjects = student.get('subjects', [])
+                if not student_subjects and student.get('subject'):
+                    student_subjects = [student['subject']]
 
-        for subject in students_by_subject:
-            random.shuffle(students_by_subject[subject])
+                primary_subject = student_subjects[0] if student_subjects else 'Unknown'
+                students_by_subject[primary_subject].append(student)
+                self._subject_mask(student)
 
-        total_students = len(students)
-        total_capacity = sum(room['capacity'] for room in rooms)
+            for subject in students_by_subject:
+                random.shuffle(students_by_subject[subject])
+                students_by_subject[subject] = deque(students_by_subject[subject])
 
-        sorted_subjects = self._calculate_optimal_subject_order(students_by_subject)
+            total_students = len(students)
+            total_capacity = sum(room['capacity'] for room in rooms)
+
+            sorted_subjects = self._calculate_optimal_subject_order(students_by_subject)
 
         allocations = []
         total_allocated = 0
@@ -60,7 +101,8 @@ class AllocationService:
 
         self._optimize_allocations(allocations)
 
-        summary = self._generate_enhanced_summary(allocations, students)
+        with self._phase('summary'):
+            summary = self._generate_enhanced_summary(allocations, students)
 
         return {
             'allocations': allocations,
@@ -68,84 +110,165 @@ class AllocationService:
             'strategy': 'mixed_advanced'
         }
 
-    def _allocate_room_advanced(self, room, students_by_subject, sorted_subjects, remaining_students):
-        capacity = room['capacity']
-        allocated_students = []
+    def _allocate_multi_exam_strategy(self, students, rooms, exams):
+        with self._phase('grouping'):
+            exam_by_subject = {}
+            for exam in exams:
+                for subject in exam.get('subjects', []):
+                    exam_by_subject.setdefault(subject, exam['exam_name'])
 
-        total_benches = capacity // 2
-        benches_per_row = 4
-        total_rows = (total_benches + benches_per_row - 1) // benches_per_row
+            students_by_exam = defaultdict(list)
+            annotated = []
+            for student in students:
+                student_subjects = student.get('subjects', [])
+                if not student_subjects and student.get('subject'):
+                    student_subjects = [student['subject']]
+                primary_subject = student_subjects[0] if student_subjects else 'Unknown'
 
-        rows = max(1, int(math.sqrt(capacity)))
-        cols = max(1, math.ceil(capacity / rows))
-        seat_grid = {}
-        seat_subjects = {}
+                exam_name = student.get('exam_name') or exam_by_subject.get(primary_subject) or primary_subject
+                student = {**student, 'exam_name': exam_name, 'exam_subject': primary_subject}
+                annotated.append(student)
+                students_by_exam[exam_name].append(student)
 
-        seat_positions = self._generate_optimal_seat_positions(capacity, rows, cols)
+                exam_bit = self.subject_bits.bit(('exam', exam_name))
+                self._exam_bits |= exam_bit
+                self._student_masks[id(student)] = exam_bit | self.subject_bits.mask(student_subjects or ['Unknown'])
 
-        subject_quotas = self._calculate_enhanced_room_quotas(
-            students_by_subject, capacity, remaining_students
-        )
+            for exam_name in students_by_exam:
+                random.shuffle(students_by_exam[exam_name])
+                students_by_exam[exam_name] = deque(students_by_exam[exam_name])
+
+            students = annotated
+            total_students = len(students)
+            sorted_exams = self._calculate_optimal_subject_order(students_by_exam)
+
+        allocations = []
+        total_allocated = 0
+
+        for room in self._sort_rooms_strategically(rooms):
+            if total_allocated >= total_students:
+                break
+
+            room_allocation = self._allocate_room_advanced(
+                room, students_by_exam, sorted_exams, total_students - total_allocated
+            )
+
+            if room_allocation['students']:
+                room_allocation['exam_breakdown'] = dict(Counter(
+                    allocation['student']['exam_name'] for allocation in room_allocation['students']
+                ))
+                allocations.append(room_allocation)
+                total_allocated += len(room_allocation['students'])
+
+        self._optimize_allocations(allocations)
+
+        with self._phase('summary'):
+            summary = self._generate_enhanced_summary(allocations, students)
+            summary['exam_distribution'] = dict(Counter(student['exam_name'] for student in students))
+            summary['report_data'] = {'exams': self._exam_report(exams, students, allocations)}
+
+        return {
+            'allocations': allocations,
+            'summary': summary,
+            'strategy': 'multi_exam',
+            'type': 'multi_exam'
+        }
+
+    def _exam_report(self, exams, students, allocations):
+        durations = {exam['exam_name']: exam.get('duration') for exam in exams}
+        subjects = defaultdict(list)
+        for student in students:
+            if student['exam_subject'] not in subjects[student['exam_name']]:
+                subjects[student['exam_name']].append(student['exam_subject'])
+
+        total = Counter(student['exam_name'] for student in students)
+        allocated = Counter()
+        for room_allocation in allocations:
+            allocated.update(room_allocation['exam_breakdown'])
+
+        return [{
+            'exam_name': exam_name,
+            'subject': ', '.join(sorted(subjects[exam_name])),
+            'duration': durations.get(exam_name) or DEFAULT_EXAM_DURATION,
+            'total_students': count,
+            'allocated_students': allocated[exam_name]
+        } for exam_name, count in total.most_common()]
+
+    def _allocate_room_advanced(self, room, students_by_subject, sorted_subjects, remaining_students):
+        capacity = room['capacity']
+        allocated_students = []
+        layout = layout_for_room(room)
+        index = SeatIndex(layout, self.MIN_DISTANCE)
+        seat_subjects = index.seat_subjects
+
+        with self._phase('quotas'):
+            subject_quotas = self._calculate_enhanced_room_quotas(
+                students_by_subject, capacity, remaining_students
+            )
 
         allocated_count = 0
         max_attempts = min(self.MAX_ATTEMPTS, capacity * 3)
 
-        allocated_count = self._allocate_with_strategy(
-            students_by_subject, sorted_subjects, subject_quotas,
-            seat_positions, seat_subjects, allocated_students,
-            capacity, self.PREFERRED_DISTANCE, "preferred"
-        )
-
-        if allocated_count < capacity:
+        with self._phase('seat_search'):
             allocated_count = self._allocate_with_strategy(
                 students_by_subject, sorted_subjects, subject_quotas,
-                seat_positions, seat_subjects, allocated_students,
-                capacity, self.MIN_DISTANCE, "minimum"
+                index, allocated_students,
+                capacity, self.PREFERRED_DISTANCE, "preferred"
             )
 
+            if allocated_count < capacity:
+                allocated_count = self._allocate_with_strategy(
+                    students_by_subject, sorted_subjects, subject_quotas,
+                    index, allocated_students,
+                    capacity, self.MIN_DISTANCE, "minimum"
+                )
+
         if allocated_count < capacity:
-            self._emergency_fill_seats(
-                students_by_subject, sorted_subjects,
-                seat_positions, seat_subjects, allocated_students, capacity
-            )
+            with self._phase('emergency_fill'):
+                self._emergency_fill_seats(
+                    students_by_subject, sorted_subjects,
+                    index, allocated_students, capacity
+                )
 
-        allocated_students.sort(key=lambda x: x['seat_number'])
+        with self._phase('metrics'):
+            allocated_students.sort(key=lambda x: x['seat_number'])
 
-        for allocation in allocated_students:
-            grid_info = self._calculate_seat_grid(allocation['seat_number'], capacity)
-            allocation['grid'] = grid_info
+            for allocation in allocated_students:
+                allocation['grid'] = layout.grid(allocation['seat_number'])
 
-        subject_breakdown = self._calculate_enhanced_breakdown(allocated_students, seat_subjects)
+            subject_breakdown = self._calculate_enhanced_breakdown(allocated_students, seat_subjects)
+            distribution_score = self._calculate_distribution_score(seat_subjects, capacity)
+            separation_quality = self._calculate_separation_quality(seat_subjects, layout)
+
+            if self.diagnostics:
+                self.diagnostics.count('strict_violations', index.count_strict_violations())
 
         return {
             'room': room,
             'students': allocated_students,
             'subject_breakdown': subject_breakdown,
-            'distribution_score': self._calculate_distribution_score(seat_subjects, capacity),
-            'separation_quality': self._calculate_separation_quality(seat_subjects, rows, cols),
-            'room_layout': {
-                'total_benches': total_benches,
-                'benches_per_row': benches_per_row,
-                'total_rows': total_rows,
-                'total_columns': benches_per_row,
-                'capacity': capacity
-            }
+            'distribution_score': distribution_score,
+            'separation_quality': separation_quality,
+            'room_layout': layout.to_dict()
         }
 
     def _allocate_separated_strategy(self, students, rooms):
-        students_by_subject = defaultdict(list)
-        for student in students:
-            student_subjects = student.get('subjects', [])
-            if not student_subjects and student.get('subject'):
-                student_subjects = [student['subject']]
+        with self._phase('grouping'):
+            students_by_subject = defaultdict(list)
+            for student in students:
+                student_subjects = student.get('subjects', [])
+                if not student_subjects and student.get('subject'):
+                    student_subjects = [student['subject']]
 
-            primary_subject = student_subjects[0] if student_subjects else 'Unknown'
-            students_by_subject[primary_subject].append(student)
+                primary_subject = student_subjects[0] if student_subjects else 'Unknown'
+                students_by_subject[primary_subject].append(student)
+                self._subject_mask(student)
 
-        for subject in students_by_subject:
-            random.shuffle(students_by_subject[subject])
+            for subject in students_by_subject:
+                random.shuffle(students_by_subject[subject])
 
-        room_distribution = self._calculate_optimal_room_distribution(students_by_subject, rooms)
+        with self._phase('quotas'):
+            room_distribution = self._calculate_optimal_room_distribution(students_by_subject, rooms)
 
         allocations = []
 
@@ -163,7 +286,8 @@ class AllocationService:
             if room_allocation['students']:
                 allocations.append(room_allocation)
 
-        summary = self._generate_enhanced_summary(allocations, students)
+        with self._phase('summary'):
+            summary = self._generate_enhanced_summary(allocations, students)
 
         return {
             'allocations': allocations,
@@ -172,25 +296,28 @@ class AllocationService:
         }
 
     def _allocate_optimal_packing_strategy(self, students, rooms):
-        shuffled_students = students.copy()
-        random.shuffle(shuffled_students)
+        with self._phase('grouping'):
+            shuffled_students = students.copy()
+            random.shuffle(shuffled_students)
 
-        students_by_subject = defaultdict(list)
-        for student in shuffled_students:
-            student_subjects = student.get('subjects', [])
-            if not student_subjects and student.get('subject'):
-                student_subjects = [student['subject']]
+            students_by_subject = defaultdict(list)
+            for student in shuffled_students:
+                student_subjects = student.get('subjects', [])
+                if not student_subjects and student.get('subject'):
+                    student_subjects = [student['subject']]
 
-            primary_subject = student_subjects[0] if student_subjects else 'Unknown'
-            students_by_subject[primary_subject].append(student)
+                primary_subject = student_subjects[0] if student_subjects else 'Unknown'
+                students_by_subject[primary_subject].append(student)
+                self._subject_mask(student)
 
-        sorted_rooms = sorted(rooms, key=lambda r: r['capacity'], reverse=True)
+            sorted_rooms = sorted(rooms, key=lambda r: r['capacity'], reverse=True)
 
         allocations = []
         total_allocated = 0
         total_students = len(students)
 
-        student_pool = self._create_optimal_student_pool(students_by_subject)
+        with self._phase('quotas'):
+            student_pool = self._create_optimal_student_pool(students_by_subject)
 
         for room in sorted_rooms:
             if total_allocated >= total_students:
@@ -211,12 +338,13 @@ class AllocationService:
                 allocations.append(room_allocation)
                 total_allocated += len(room_allocation['students'])
 
-                allocated_student_objects = [alloc['student'] for alloc in room_allocation['students']]
-                student_pool = [s for s in student_pool if s not in allocated_student_objects]
+                allocated_student_ids = {id(alloc['student']) for alloc in room_allocation['students']}
+                student_pool = [s for s in student_pool if id(s) not in allocated_student_ids]
 
-        summary = self._generate_enhanced_summary(allocations, students)
-        summary['rooms_saved'] = len(rooms) - len(allocations)
-        summary['utilization_efficiency'] = self._calculate_utilization_efficiency(allocations, rooms)
+        with self._phase('summary'):
+            summary = self._generate_enhanced_summary(allocations, students)
+            summary['rooms_saved'] = len(rooms) - len(allocations)
+            summary['utilization_efficiency'] = self._calculate_utilization_efficiency(allocations, rooms)
 
         return {
             'allocations': allocations,
@@ -244,101 +372,82 @@ class AllocationService:
     def _allocate_room_optimal_packing(self, room, student_pool, students_to_allocate):
         capacity = room['capacity']
         allocated_students = []
-        seat_subjects = {}
-
-        total_benches = capacity // 2
-        benches_per_row = 4
-        total_rows = (total_benches + benches_per_row - 1) // benches_per_row
-
-        rows = max(1, int(math.sqrt(capacity)))
-        cols = max(1, math.ceil(capacity / rows))
-        seat_positions = self._generate_optimal_seat_positions(capacity, rows, cols)
+        layout = layout_for_room(room)
+        index = SeatIndex(layout, self.MIN_DISTANCE)
+        seat_subjects = index.seat_subjects
 
         students_to_place = student_pool[:students_to_allocate]
 
-        for i, student in enumerate(students_to_place):
-            if i >= capacity:
-                break
+        with self._phase('seat_search'):
+            for i, student in enumerate(students_to_place):
+                if i >= capacity:
+                    break
 
-            student_subjects = student.get('subjects', [])
-            if not student_subjects and student.get('subject'):
-                student_subjects = [student['subject']]
-            primary_subject = student_subjects[0] if student_subjects else 'Unknown'
+                student_subjects = student.get('subjects', [])
+                if not student_subjects and student.get('subject'):
+                    student_subjects = [student['subject']]
+                primary_subject = student_subjects[0] if student_subjects else 'Unknown'
+                mask = self._subject_mask(student)
 
-            best_seat = self._find_optimal_packing_seat(
-                seat_positions, seat_subjects, primary_subject, i + 1
-            )
+                best_seat = self._find_optimal_packing_seat(
+                    index, mask, i + 1
+                )
 
-            if best_seat:
-                allocated_students.append({
-                    'seat_number': best_seat,
-                    'student': student
-                })
-                seat_subjects[best_seat] = primary_subject
+                if best_seat:
+                    allocated_students.append({
+                        'seat_number': best_seat,
+                        'student': student
+                    })
+                    index.place(best_seat, primary_subject, mask)
 
-        allocated_students.sort(key=lambda x: x['seat_number'])
+        with self._phase('metrics'):
+            allocated_students.sort(key=lambda x: x['seat_number'])
 
-        for allocation in allocated_students:
-            grid_info = self._calculate_seat_grid(allocation['seat_number'], capacity)
-            allocation['grid'] = grid_info
+            for allocation in allocated_students:
+                allocation['grid'] = layout.grid(allocation['seat_number'])
 
-        subject_breakdown = self._calculate_enhanced_breakdown(allocated_students, seat_subjects)
+            subject_breakdown = self._calculate_enhanced_breakdown(allocated_students, seat_subjects)
+            packing_efficiency = self._calculate_packing_efficiency(allocated_students, capacity)
+
+            if self.diagnostics:
+                self.diagnostics.count('strict_violations', index.count_strict_violations())
 
         return {
             'room': room,
             'students': allocated_students,
             'subject_breakdown': subject_breakdown,
             'utilization_rate': len(allocated_students) / capacity * 100,
-            'packing_efficiency': self._calculate_packing_efficiency(allocated_students, capacity),
-            'room_layout': {
-                'total_benches': total_benches,
-                'benches_per_row': benches_per_row,
-                'total_rows': total_rows,
-                'total_columns': benches_per_row,
-                'capacity': capacity
-            }
+            'packing_efficiency': packing_efficiency,
+            'room_layout': layout.to_dict()
         }
 
-    def _find_optimal_packing_seat(self, seat_positions, seat_subjects, subject, priority):
-        available_seats = [pos for pos in seat_positions if pos['seat'] not in seat_subjects]
-
-        if not available_seats:
+    def _find_optimal_packing_seat(self, index, mask, priority):
+        if not index.free_by_number:
             return None
 
+        near_masks = index.near_masks
+        scanned = 0
 
-        best_seat = None
-        best_score = -1
-
-        for seat_pos in available_seats:
-            seat_num = seat_pos['seat']
+        for seat_num in index.free_by_number:
+            scanned += 1
+            if not near_masks[seat_num] & mask:
+                if self.diagnostics:
+                    self.diagnostics.count('seats_scanned', scanned)
+                return seat_num
 
-            min_distance = self._calculate_min_distance_to_subject(
-                seat_subjects, seat_num, subject, len(seat_positions)
-            )
+        if self.diagnostics:
+            self.diagnostics.count('seats_scanned', scanned + len(index.free_by_position))
 
-            packing_score = len(seat_positions) - seat_num
-
-            if min_distance >= self.MIN_DISTANCE:
-                score = packing_score * 10 + min_distance
-            else:
-                score = min_distance - 100
+        distances = index.distances_for(mask)
+        best_seat = None
+        best_score = -1
 
-            if score > best_score:
-                best_score = score
+        for seat_num in index.free_by_position:
+            if distances[seat_num] > best_score:
+                best_score = distances[seat_num]
                 best_seat = seat_num
 
-        if best_seat is None:
-            for seat_pos in available_seats:
-                seat_num = seat_pos['seat']
-                min_distance = self._calculate_min_distance_to_subject(
-                    seat_subjects, seat_num, subject, len(seat_positions)
-                )
-
-                if min_distance > best_score:
-                    best_score = min_distance
-                    best_seat = seat_num
-
-        return best_seat or (available_seats[0]['seat'] if available_seats else None)
+        return best_seat
 
     def _calculate_utilization_efficiency(self, allocations, rooms):
         if not allocations:
@@ -408,8 +517,10 @@ class AllocationService:
                         room_data['assigned_count'] += take_count
                         remaining_students = remaining_students[take_count:]
 
+                remaining_students = deque(remaining_students)
                 room_idx = 0
-                while remaining_students and room_idx < len(room_ids):
+                rooms_without_space = 0
+                while remaining_students and rooms_without_space < len(room_ids):
                     room_id = room_ids[room_idx]
                     room_data = room_distribution[room_id]
 
@@ -417,8 +528,11 @@ class AllocationService:
                         if subject not in room_data['subjects']:
                             room_data['subjects'][subject] = []
 
-                        room_data['subjects'][subject].append(remaining_students.pop(0))
+                        room_data['subjects'][subject].append(remaining_students.popleft())
                         room_data['assigned_count'] += 1
+                        rooms_without_space = 0
+                    else:
+                        rooms_without_space += 1
 
                     room_idx = (room_idx + 1) % len(room_ids)
 
@@ -427,11 +541,9 @@ class AllocationService:
     def _allocate_separated_room(self, room, assigned_subjects, students_by_subject):
         capacity = room['capacity']
         allocated_students = []
-        seat_subjects = {}
-
-        total_benches = capacity // 2
-        benches_per_row = 4
-        total_rows = (total_benches + benches_per_row - 1) // benches_per_row
+        layout = layout_for_room(room)
+        index = SeatIndex(layout, self.MIN_DISTANCE)
+        seat_subjects = index.seat_subjects
 
         student_queue = []
         for subject, students in assigned_subjects.items():
@@ -440,46 +552,57 @@ class AllocationService:
 
         random.shuffle(student_queue)
 
-        seat_positions = self._generate_optimal_seat_positions(capacity,
-                                                             int(math.sqrt(capacity)) + 1,
-                                                             int(capacity / (int(math.sqrt(capacity)) + 1)) + 1)
+        unplaced = []
 
-        for student, subject in student_queue:
-            if len(allocated_students) >= capacity:
-                break
+        with self._phase('seat_search'):
+            for student, subject in student_queue:
+                if len(allocated_students) >= capacity:
+                    break
 
-            best_seat = self._find_best_seat_position(
-                seat_positions, seat_subjects, subject, capacity,
-                prefer_distance=self.PREFERRED_DISTANCE
-            )
+                mask = self._subject_mask(student)
+                best_seat = self._find_best_seat_position(
+                    index, mask, prefer_distance=self.PREFERRED_DISTANCE
+                )
 
-            if best_seat:
-                allocated_students.append({
-                    'seat_number': best_seat,
-                    'student': student
-                })
-                seat_subjects[best_seat] = subject
+                if best_seat:
+                    allocated_students.append({
+                        'seat_number': best_seat,
+                        'student': student
+                    })
+                    index.place(best_seat, subject, mask)
+                else:
+                    unplaced.append((student, subject))
+
+        if unplaced and index.free_by_position:
+            with self._phase('emergency_fill'):
+                for (student, subject), seat_num in zip(unplaced, list(index.free_by_position)):
+                    allocated_students.append({
+                        'seat_number': seat_num,
+                        'student': student
+                    })
+                    index.place(seat_num, subject, self._subject_mask(student))
 
-        allocated_students.sort(key=lambda x: x['seat_number'])
+                    if self.diagnostics:
+                        self.diagnostics.count('emergency_filled')
 
-        for allocation in allocated_students:
-            grid_info = self._calculate_seat_grid(allocation['seat_number'], capacity)
-            allocation['grid'] = grid_info
+        with self._phase('metrics'):
+            allocated_students.sort(key=lambda x: x['seat_number'])
+
+            for allocation in allocated_students:
+                allocation['grid'] = layout.grid(allocation['seat_number'])
 
-        subject_breakdown = self._calculate_enhanced_breakdown(allocated_students, seat_subjects)
+            subject_breakdown = self._calculate_enhanced_breakdown(allocated_students, seat_subjects)
+            distribution_score = self._calculate_distribution_score(seat_subjects, capacity)
+
+            if self.diagnostics:
+                self.diagnostics.count('strict_violations', index.count_strict_violations())
 
         return {
             'room': room,
             'students': allocated_students,
             'subject_breakdown': subject_breakdown,
-            'distribution_score': self._calculate_distribution_score(seat_subjects, capacity),
-            'room_layout': {
-                'total_benches': total_benches,
-                'benches_per_row': benches_per_row,
-                'total_rows': total_rows,
-                'total_columns': benches_per_row,
-                'capacity': capacity
-            }
+            'distribution_score': distribution_score,
+            'room_layout': layout.to_dict()
         }
 
     def _calculate_optimal_subject_order(self, students_by_subject):
@@ -497,31 +620,6 @@ class AllocationService:
             r.get('name', ''),
         ))
 
-    def _generate_optimal_seat_positions(self, capacity, rows, cols):
-        positions = []
-
-        for seat in range(1, capacity + 1):
-            row = (seat - 1) // cols
-            col = (seat - 1) % cols
-            positions.append({
-                'seat': seat,
-                'row': row,
-                'col': col,
-                'position_score': self._calculate_position_score(row, col, rows, cols)
-            })
-
-        return sorted(positions, key=lambda p: p['position_score'])
-
-    def _calculate_position_score(self, row, col, total_rows, total_cols):
-        center_row = total_rows / 2
-        center_col = total_cols / 2
-
-        distance_from_center = math.sqrt((row - center_row)**2 + (col - center_col)**2)
-
-        checkerboard_bonus = 10 if (row + col) % 2 == 0 else 0
-
-        return distance_from_center + checkerboard_bonus
-
     def _calculate_room_quotas(self, students_by_subject, room_capacity, remaining_students):
         quotas = {}
         total_students = sum(len(students) for students in students_by_subject.values())
@@ -539,40 +637,47 @@ class AllocationService:
 
         return quotas
 
-    def _find_best_seat_position(self, seat_positions, seat_subjects, subject, capacity, prefer_distance):
-        available_seats = [pos for pos in seat_positions
-                          if pos['seat'] not in seat_subjects]
+    def _find_best_seat_position(self, index, mask, prefer_distance):
+        available_seats = index.free_by_position
 
         if not available_seats:
             return None
 
+        if self.diagnostics:
+            self.diagnostics.count('seats_scanned', len(available_seats))
+
+        distances = index.distances_for(mask)
+        position_score = index.layout.position_score
         best_seat = None
         best_score = -1
 
-        for seat_pos in available_seats:
-            seat_num = seat_pos['seat']
-
-            min_distance = self._calculate_min_distance_to_subject(
-                seat_subjects, seat_num, subject, capacity
-            )
+        for seat_num in available_seats:
+            min_distance = distances[seat_num]
 
             if min_distance >= prefer_distance:
-                score = min_distance + seat_pos['position_score']
+                score = min_distance + position_score[seat_num]
                 if score > best_score:
                     best_score = score
                     best_seat = seat_num
 
         if best_seat is None and prefer_distance > self.MIN_DISTANCE:
-            return self._find_best_seat_position(
-                seat_positions, seat_subjects, subject, capacity, self.MIN_DISTANCE
-            )
+            if self.diagnostics:
+                self.diagnostics.count('distance_fallbacks')
+            return self._find_best_seat_position(index, mask, self.MIN_DISTANCE)
 
         if best_seat is None and prefer_distance == self.MIN_DISTANCE:
-            for seat_pos in available_seats:
-                seat_num = seat_pos['seat']
-                if self._can_place_subject_at_seat(seat_subjects, seat_num, subject, capacity):
+            for seat_num in available_seats:
+                if self.STRICT_MODE:
+                    if not index.conflicts_strict(seat_num, mask):
+                        return seat_num
+                elif distances[seat_num] >= self.MIN_DISTANCE:
                     return seat_num
 
+            if mask & self._exam_bits:
+                if self.diagnostics:
+                    self.diagnostics.count('exam_fallbacks')
+                return self._find_best_seat_position(index, mask & ~self._exam_bits, self.MIN_DISTANCE)
+
         return best_seat
 
     def _calculate_min_distance_to_subject(self, seat_subjects, seat_num, subject, capacity):
@@ -585,45 +690,18 @@ class AllocationService:
 
         return min_distance
 
-    def _calculate_seat_grid(self, seat_num, capacity):
-        total_benches = capacity // 2
-
-        benches_per_row = 4
-        total_rows = (total_benches + benches_per_row - 1) // benches_per_row
-
-        seat_idx = seat_num - 1
-
-        bench_num = seat_idx // 2
-
-        position = 'left' if seat_idx % 2 == 0 else 'right'
+    def _calculate_seat_grid(self, seat_num, capacity, layout=None):
+        layout = layout or compile_layout(capacity)
+        return layout.grid(seat_num)
 
-        row = bench_num // benches_per_row
-        col = bench_num % benches_per_row
-
-        return {
-            'row': row,
-            'col': col,
-            'position': position,
-            'bench_num': bench_num + 1
-        }
-
-    def _can_place_subject_at_seat(self, seat_subjects, seat_num, subject, capacity):
+    def _can_place_subject_at_seat(self, seat_subjects, seat_num, subject, capacity, layout=None):
         if self.STRICT_MODE:
-            current_grid = self._calculate_seat_grid(seat_num, capacity)
-
-            for existing_seat, existing_subject in seat_subjects.items():
-                if existing_subject != subject:
-                    continue
+            layout = layout or compile_layout(capacity)
 
-                existing_grid = self._calculate_seat_grid(existing_seat, capacity)
-
-                if current_grid['bench_num'] == existing_grid['bench_num']:
-                    return False
-
-                if current_grid['col'] == existing_grid['col']:
+            for neighbor in layout.conflict_neighbors[seat_num]:
+                if seat_subjects.get(neighbor) == subject:
                     return False
 
-
             return True
         else:
             return self._calculate_min_distance_to_subject(
@@ -647,21 +725,28 @@ class AllocationService:
         if not seat_subjects:
             return 0
 
-        subject_distances = defaultdict(list)
-
-        for seat1, subject1 in seat_subjects.items():
-            for seat2, subject2 in seat_subjects.items():
-                if seat1 < seat2 and subject1 == subject2:
-                    distance = abs(seat2 - seat1)
-                    subject_distances[subject1].append(distance)
+        seats_by_subject = defaultdict(list)
+        for seat_num in sorted(seat_subjects):
+            seats_by_subject[seat_subjects[seat_num]].append(seat_num)
 
         total_score = 0
-        for subject, distances in subject_distances.items():
-            if distances:
-                avg_distance = sum(distances) / len(distances)
-                total_score += avg_distance
+        scored_subjects = 0
+
+        for seats in seats_by_subject.values():
+            if len(seats) < 2:
+                continue
 
-        return round(total_score / len(subject_distances) if subject_distances else capacity, 2)
+            pair_distance_sum = 0
+            prefix_sum = 0
+            for i, seat_num in enumerate(seats):
+                pair_distance_sum += seat_num * i - prefix_sum
+                prefix_sum += seat_num
+
+            pair_count = len(seats) * (len(seats) - 1) // 2
+            total_score += pair_distance_sum / pair_count
+            scored_subjects += 1
+
+        return round(total_score / scored_subjects if scored_subjects else capacity, 2)
 
     def _optimize_allocations(self, allocations):
         for allocation in allocations:
@@ -701,7 +786,7 @@ class AllocationService:
         return quotas
 
     def _allocate_with_strategy(self, students_by_subject, sorted_subjects, subject_quotas,
-                               seat_positions, seat_subjects, allocated_students,
+                               index, allocated_students,
                                capacity, min_distance, strategy_name):
         allocated_count = len(allocated_students)
         max_iterations = min(capacity * 2, 200)
@@ -716,17 +801,17 @@ class AllocationService:
                 if not students_by_subject[subject] or subject_quotas.get(subject, 0) <= 0:
                     continue
 
-                best_seat = self._find_best_seat_position(
-                    seat_positions, seat_subjects, subject, capacity, min_distance
-                )
+                student = students_by_subject[subject][0]
+                mask = self._subject_mask(student)
+                best_seat = self._find_best_seat_position(index, mask, min_distance)
 
                 if best_seat:
-                    student = students_by_subject[subject].pop(0)
+                    students_by_subject[subject].popleft()
                     allocated_students.append({
                         'seat_number': best_seat,
                         'student': student
                     })
-                    seat_subjects[best_seat] = subject
+                    index.place(best_seat, subject, mask)
                     subject_quotas[subject] -= 1
                     allocated_count += 1
                     made_allocation = True
@@ -740,70 +825,59 @@ class AllocationService:
         return allocated_count
 
     def _emergency_fill_seats(self, students_by_subject, sorted_subjects,
-                             seat_positions, seat_subjects, allocated_students, capacity):
+                             index, allocated_students, capacity):
         allocated_count = len(allocated_students)
+        available_seats = list(index.free_by_position)
+        next_seat = 0
 
-        available_seats = [pos['seat'] for pos in seat_positions
-                          if pos['seat'] not in seat_subjects]
-
-        all_remaining_students = []
         for subject in sorted_subjects:
-            for student in students_by_subject[subject]:
-                all_remaining_students.append((student, subject))
+            remaining = students_by_subject[subject]
 
-        for i, (student, subject) in enumerate(all_remaining_students):
-            if i >= len(available_seats) or allocated_count >= capacity:
-                break
-
-            seat_num = available_seats[i]
-            allocated_students.append({
-                'seat_number': seat_num,
-                'student': student
-            })
-            seat_subjects[seat_num] = subject
-            allocated_count += 1
-
-        allocated_subjects = {}
-        for alloc in allocated_students[-len(all_remaining_students):]:
-            student = alloc['student']
-            student_subjects = student.get('subjects', [])
-            if not student_subjects and student.get('subject'):
-                student_subjects = [student['subject']]
-            primary_subject = student_subjects[0] if student_subjects else 'Unknown'
+            while remaining and next_seat < len(available_seats) and allocated_count < capacity:
+                student = remaining.popleft()
+                seat_num = available_seats[next_seat]
+                next_seat += 1
 
-            if primary_subject not in allocated_subjects:
-                allocated_subjects[primary_subject] = []
-            allocated_subjects[primary_subject].append(student)
+                allocated_students.append({
+                    'seat_number': seat_num,
+                    'student': student
+                })
+                index.place(seat_num, subject, self._subject_mask(student))
+                allocated_count += 1
 
-        for subject, allocated_students_list in allocated_subjects.items():
-            if subject in students_by_subject:
-                for student in allocated_students_list:
-                    if student in students_by_subject[subject]:
-                        students_by_subject[subject].remove(student)
+                if self.diagnostics:
+                    self.diagnostics.count('emergency_filled')
 
-    def _calculate_separation_quality(self, seat_subjects, rows, cols):
+    def _calculate_separation_quality(self, seat_subjects, layout):
         if not seat_subjects:
             return 0
 
+        seat_row = layout.seat_row
+        seat_x = layout.seat_x
+        occupied = len(seat_subjects)
+        total_pairs = occupied * (occupied - 1) // 2
+
+        seats_by_subject = defaultdict(list)
+        for seat_num in sorted(seat_subjects):
+            seats_by_subject[seat_subjects[seat_num]].append(seat_num)
+
         total_score = 0
-        total_pairs = 0
+        same_subject_pairs = 0
+
+        for seats in seats_by_subject.values():
+            for i, seat1 in enumerate(seats):
+                for seat2 in seats[i + 1:]:
+                    spatial_distance = math.hypot(seat_row[seat2] - seat_row[seat1], seat_x[seat2] - seat_x[seat1])
+                    total_score += spatial_distance * 0.8 if spatial_distance >= 2 else -2
+                same_subject_pairs += len(seats) - i - 1
+
+        total_score += layout.SEPARATION_RADIUS * (total_pairs - same_subject_pairs)
 
         for seat1, subject1 in seat_subjects.items():
-            for seat2, subject2 in seat_subjects.items():
-                if seat1 < seat2:
-                    total_pairs += 1
-
-                    row1, col1 = divmod(seat1 - 1, cols)
-                    row2, col2 = divmod(seat2 - 1, cols)
-                    spatial_distance = math.sqrt((row2 - row1)**2 + (col2 - col1)**2)
-
-                    if subject1 == subject2:
-                        if spatial_distance >= 2:
-                            total_score += spatial_distance * 0.8
-                        else:
-                            total_score -= 2
-                    else:
-                        total_score += min(spatial_distance, 3)
+            for seat2, spatial_distance in layout.near_seats[seat1]:
+                subject2 = seat_subjects.get(seat2)
+                if subject2 is not None and subject2 != subject1:
+                    total_score -= layout.SEPARATION_RADIUS - spatial_distance
 
         return round(total_score / max(total_pairs, 1), 2)
 
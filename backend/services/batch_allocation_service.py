@@ -0,0 +1,103 @@
+import os
+import time
+from bson import ObjectId
+from concurrent.futures import ProcessPoolExecutor
+from models.database import Allocation
+from services.allocation_service import AllocationService
+from services.seat_index import SubjectInterner
+from utils.room_layout import layout_for_room
+
+_worker_rooms = None
+_worker_subject_bits = None
+
+def _init_worker(rooms, subjects):
+    global _worker_rooms, _worker_subject_bits
+    for room in rooms:
+        layout_for_room(room)
+    _worker_rooms = rooms
+    _worker_subject_bits = SubjectInterner()
+    _worker_subject_bits.mask(subjects)
+
+def _allocate_session(task):
+    session_key, students, strategy, collect_diagnostics = task
+    service = AllocationService(collect_diagnostics=collect_diagnostics, subject_bits=_worker_subject_bits)
+    return session_key, service.allocate_seats(students, _worker_rooms, strategy)
+
+class BatchAllocationService:
+    @staticmethod
+    def partition_by_session(students, sessions):
+        subject_sessions = {}
+        for session in sessions:
+            for subject in session['subjects']:
+                subject_sessions.setdefault(subject, []).append(session['session_key'])
+
+        rosters = {session['session_key']: [] for session in sessions}
+        for student in students:
+            by_session = {}
+            for subject in student.get('subjects', []):
+                for session_key in subject_sessions.get(subject, ()):
+                    by_session.setdefault(session_key, []).append(subject)
+
+            for session_key, subjects in by_session.items():
+                rosters[session_key].append({**student, 'subjects': subjects, 'subject': subjects[0]})
+
+        return rosters
+
+    @staticmethod
+    def allocate_sessions(rosters, rooms, strategy='mixed', workers=None, collect_diagnostics=False):
+        tasks = [(session_key, students, strategy, collect_diagnostics) for session_key, students in rosters.items() if students]
+        subjects = sorted({subject for _, students, _, _ in tasks for student in students for subject in student['subjects']})
+        workers = workers or min(len(tasks), os.cpu_count() or 1)
+
+        if workers <= 1 or len(tasks) <= 1:
+            _init_worker(rooms, subjects)
+            return dict(map(_allocate_session, tasks))
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rooms, subjects)) as pool:
+            return dict(pool.map(_allocate_session, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    @staticmethod
+    def run(students, sessions, rooms, strategy='mixed', workers=None, collect_diagnostics=False):
+        started = time.perf_counter()
+        rosters = BatchAllocationService.partition_by_session(students, sessions)
+        partitioned = time.perf_counter()
+        results = BatchAllocationService.allocate_sessions(rosters, rooms, strategy, workers, collect_diagnostics)
+        allocated = time.perf_counter()
+
+        batch_id = ObjectId()
+        session_keys = [session['session_key'] for session in sessions if session['session_key'] in results]
+        allocation_ids = Allocation.create_many([
+            {
+                'strategy': strategy,
+                'subject_filter': '',
+                'allocations': results[session_key]['allocations'],
+                'allocation_summary': results[session_key]['summary'],
+                'session': session_key
+            }
+            for session_key in session_keys
+        ], batch_id=batch_id)
+        stored = time.perf_counter()
+
+        summaries = []
+        for session_key, allocation_id in zip(session_keys, allocation_ids):
+            summary = results[session_key]['summary']
+            summaries.append({
+                'session': session_key,
+                'allocation_id': str(allocation_id),
+                'total_students': summary['total_students'],
+                'total_allocated': summary['total_allocated'],
+                'unallocated': summary['total_students'] - summary['total_allocated'],
+                'rooms_used': len(results[session_key]['allocations']),
+                'quality_rating': summary.get('quality_rating')
+            })
+
+        return {
+            'batch_id': str(batch_id),
+            'sessions': summaries,
+            'skipped_sessions': [session_key for session_key, students in rosters.items() if not students],
+            'timings_ms': {
+                'partition': round((partitioned - started) * 1000, 2),
+                'allocate': round((allocated - partitioned) * 1000, 2),
+                'store': round((stored - allocated) * 1000, 2)
+            }
+        }
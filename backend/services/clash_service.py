@@ -0,0 +1,63 @@
+from collections import Counter
+
+MAX_REPORTED_CLASHES = 1000
+
+class ClashService:
+    @staticmethod
+    def registration_keys(students, sessions):
+        slots_by_subject = {}
+        for session in sessions:
+            slot = (session['date'], session['session'])
+            for subject in session['subjects']:
+                slots_by_subject.setdefault(subject, []).append(slot)
+
+        keys = []
+        for position, student in enumerate(students):
+            subjects = student.get('subjects') or ([student['subject']] if student.get('subject') else [])
+            for subject in subjects:
+                for date, session in slots_by_subject.get(subject, ()):
+                    keys.append((student['roll_number'], date, session, subject, position))
+        return keys
+
+    @staticmethod
+    def detect(students, sessions, limit=MAX_REPORTED_CLASHES):
+        keys = ClashService.registration_keys(students, sessions)
+        keys.sort()
+
+        clashes = []
+        by_session = Counter()
+        clashing_students = set()
+        start = 0
+
+        for end in range(1, len(keys) + 1):
+            if end < len(keys) and keys[end][:3] == keys[start][:3]:
+                continue
+
+            if end - start > 1:
+                roll_number, date, session = keys[start][:3]
+                subjects = sorted({key[3] for key in keys[start:end]})
+                if len(subjects) > 1:
+                    session_key = f"{date}-{session}"
+                    by_session[session_key] += 1
+                    clashing_students.add(roll_number)
+                    if len(clashes) < limit:
+                        student = students[keys[start][4]]
+                        clashes.append({
+                            'roll_number': roll_number,
+                            'name': student.get('name'),
+                            'department': student.get('department'),
+                            'session': session_key,
+                            'date': date,
+                            'session_name': session,
+                            'subjects': subjects
+                        })
+            start = end
+
+        return {
+            'students_checked': len(students),
+            'registrations': len(keys),
+            'clash_count': sum(by_session.values()),
+            'clashing_students': len(clashing_students),
+            'by_session': dict(sorted(by_session.items())),
+            'clashes': clashes
+        }
@@ -0,0 +1,31 @@
+import time
+from collections import defaultdict, Counter
+from contextlib import contextmanager, nullcontext
+
+NO_PHASE = nullcontext()
+
+class AllocationDiagnostics:
+    COUNTERS = ('seats_scanned', 'distance_fallbacks', 'emergency_filled', 'strict_violations')
+
+    def __init__(self):
+        self.phases = defaultdict(float)
+        self.counters = Counter({name: 0 for name in self.COUNTERS})
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def to_dict(self):
+        return {
+            'phases_ms': {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            'counters': dict(self.counters),
+            'total_ms': round((time.perf_counter() - self._started) * 1000, 3)
+        }
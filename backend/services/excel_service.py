@@ -144,7 +144,8 @@ class ExcelService:
         ws['A1'].alignment = Alignment(horizontal='center')
 
         room_layout = room_alloc.get('room_layout', {})
-        ws['A2'] = f"Capacity: {room['capacity']} | Allocated: {len(students)} | Benches: {(len(students) + 1) // 2}"
+        seats_per_bench = room_layout.get('seats_per_bench', 2)
+        ws['A2'] = f"Capacity: {room['capacity']} | Allocated: {len(students)} | Benches: {(len(students) + seats_per_bench - 1) // seats_per_bench}"
         ws.merge_cells('A2:F2')
         ws['A2'].alignment = Alignment(horizontal='center')
         ws['A2'].font = Font(italic=True)
@@ -243,25 +244,39 @@ class ExcelService:
         total_rows = room_layout.get('total_rows', 0)
         total_cols = room_layout.get('total_columns', 0)
         benches_per_row = room_layout.get('benches_per_row', 4)
+        seats_per_bench = room_layout.get('seats_per_bench', 2)
+        aisles = set(room_layout.get('aisles', []))
 
-        ws['A2'] = f"Layout: {total_rows} rows × {total_cols} columns | {benches_per_row} benches per row | 2 seats per bench"
+        ws['A2'] = f"Layout: {total_rows} rows × {total_cols} columns | {benches_per_row} benches per row | {seats_per_bench} seats per bench"
         ws.merge_cells('A2:F2')
         ws['A2'].alignment = Alignment(horizontal='center')
         ws['A2'].font = Font(italic=True)
 
+        if seats_per_bench == 2:
+            slot_labels = ['L', 'R']
+        elif seats_per_bench == 3:
+            slot_labels = ['L', 'M', 'R']
+        else:
+            slot_labels = [str(slot + 1) for slot in range(seats_per_bench)]
+        legacy_slots = {'left': 0, 'right': seats_per_bench - 1}
+
         grid_map = {}
         for student_alloc in students:
             grid = student_alloc.get('grid', {})
             row = grid.get('row', 0)
             col = grid.get('col', 0)
-            position = grid.get('position', 'left')
+            slot = grid.get('slot', legacy_slots.get(grid.get('position'), 0))
 
-            if row not in grid_map:
-                grid_map[row] = {}
-            if col not in grid_map[row]:
-                grid_map[row][col] = {'left': None, 'right': None}
+            grid_map.setdefault(row, {}).setdefault(col, {})[slot] = student_alloc
 
-            grid_map[row][col][position] = student_alloc
+        bench_columns = []
+        excel_col = 2
+        for col_idx in range(total_cols):
+            if col_idx in aisles:
+                ws.column_dimensions[get_column_letter(excel_col)].width = 3
+                excel_col += 1
+            bench_columns.append(excel_col)
+            excel_col += seats_per_bench
 
         start_row = 4
         current_row = start_row
@@ -271,9 +286,9 @@ class ExcelService:
         ws.cell(row=current_row, column=1).font = self.header_font
         ws.cell(row=current_row, column=1).alignment = Alignment(horizontal='center', vertical='center')
 
-        for col_idx in range(total_cols):
-            excel_col = 2 + (col_idx * 2)
-            ws.merge_cells(start_row=current_row, start_column=excel_col, end_row=current_row, end_column=excel_col + 1)
+        for col_idx, excel_col in enumerate(bench_columns):
+            if seats_per_bench > 1:
+                ws.merge_cells(start_row=current_row, start_column=excel_col, end_row=current_row, end_column=excel_col + seats_per_bench - 1)
             cell = ws.cell(row=current_row, column=excel_col, value=f"Col {col_idx}")
             cell.font = self.header_font
             cell.fill = self.header_fill
@@ -282,20 +297,13 @@ class ExcelService:
         current_row += 1
 
         ws.cell(row=current_row, column=1, value="").fill = self.subheader_fill
-        for col_idx in range(total_cols):
-            excel_col = 2 + (col_idx * 2)
-
-            cell_l = ws.cell(row=current_row, column=excel_col, value="L")
-            cell_l.font = self.subheader_font
-            cell_l.fill = self.subheader_fill
-            cell_l.alignment = Alignment(horizontal='center', vertical='center')
-            cell_l.border = self.border
-
-            cell_r = ws.cell(row=current_row, column=excel_col + 1, value="R")
-            cell_r.font = self.subheader_font
-            cell_r.fill = self.subheader_fill
-            cell_r.alignment = Alignment(horizontal='center', vertical='center')
-            cell_r.border = self.border
+        for excel_col in bench_columns:
+            for slot, label in enumerate(slot_labels):
+                cell = ws.cell(row=current_row, column=excel_col + slot, value=label)
+                cell.font = self.subheader_font
+                cell.fill = self.subheader_fill
+                cell.alignment = Alignment(horizontal='center', vertical='center')
+                cell.border = self.border
 
         current_row += 1
 
@@ -306,50 +314,35 @@ class ExcelService:
             cell.font = self.subheader_font
             cell.alignment = Alignment(horizontal='center', vertical='center')
 
-            for col_idx in range(total_cols):
-                excel_col = 2 + (col_idx * 2)
-
-                bench = grid_map.get(row_idx, {}).get(col_idx, {'left': None, 'right': None})
-
-                if bench['left']:
-                    student = bench['left']['student']
-                    subjects = student.get('subjects', [student.get('subject', 'N/A')])
-                    primary_subject = subjects[0] if subjects else 'N/A'
-                    cell_value = f"{student['roll_number']}\n{primary_subject[:8]}"
-
-                    cell = ws.cell(row=current_row, column=excel_col, value=cell_value)
-                    cell.fill = self.left_seat_fill
-                    cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                    cell.border = self.border
-                    cell.font = Font(size=9)
-                else:
-                    cell = ws.cell(row=current_row, column=excel_col, value="")
-                    cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
-                    cell.border = self.border
-
-                if bench['right']:
-                    student = bench['right']['student']
-                    subjects = student.get('subjects', [student.get('subject', 'N/A')])
-                    primary_subject = subjects[0] if subjects else 'N/A'
-                    cell_value = f"{student['roll_number']}\n{primary_subject[:8]}"
-
-                    cell = ws.cell(row=current_row, column=excel_col + 1, value=cell_value)
-                    cell.fill = self.right_seat_fill
-                    cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                    cell.border = self.border
-                    cell.font = Font(size=9)
-                else:
-                    cell = ws.cell(row=current_row, column=excel_col + 1, value="")
-                    cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
-                    cell.border = self.border
+            for col_idx, excel_col in enumerate(bench_columns):
+                bench = grid_map.get(row_idx, {}).get(col_idx, {})
+
+                for slot in range(seats_per_bench):
+                    seat_fill = self.left_seat_fill if slot % 2 == 0 else self.right_seat_fill
+
+                    if slot in bench:
+                        student = bench[slot]['student']
+                        subjects = student.get('subjects', [student.get('subject', 'N/A')])
+                        primary_subject = subjects[0] if subjects else 'N/A'
+                        cell_value = f"{student['roll_number']}\n{primary_subject[:8]}"
+
+                        cell = ws.cell(row=current_row, column=excel_col + slot, value=cell_value)
+                        cell.fill = seat_fill
+                        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+                        cell.border = self.border
+                        cell.font = Font(size=9)
+                    else:
+                        cell = ws.cell(row=current_row, column=excel_col + slot, value="")
+                        cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
+                        cell.border = self.border
 
             ws.row_dimensions[current_row].height = 35
             current_row += 1
 
         ws.column_dimensions['A'].width = 10
-        for col_idx in range(total_cols * 2):
-            col_letter = get_column_letter(2 + col_idx)
-            ws.column_dimensions[col_letter].width = 12
+        for excel_col in bench_columns:
+            for slot in range(seats_per_bench):
+                ws.column_dimensions[get_column_letter(excel_col + slot)].width = 12
 
     def _create_multi_exam_summary_sheet(self, wb, allocation):
         ws = wb.create_sheet("Summary")
@@ -0,0 +1,134 @@
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+from utils.room_layout import strict_columns
+
+class FeasibilityService:
+    STRATEGIES = ('mixed', 'separated', 'optimal_packing')
+
+    def analyze(self, subject_counts, primary_counts, rooms, strategies=None, total_students=None):
+        subject_counts = Counter({subject: count for subject, count in subject_counts.items() if count > 0})
+        primary_counts = {subject: count for subject, count in primary_counts.items() if count > 0}
+
+        room_stats = [{
+            'name': room.get('name', ''),
+            'capacity': room['capacity'],
+            'max_per_subject': strict_columns(room),
+            'max_subject_share': round(strict_columns(room) / room['capacity'] * 100, 2)
+        } for room in rooms]
+
+        if total_students is None:
+            total_students = sum(primary_counts.values())
+        largest_subject = max(subject_counts.values(), default=0)
+        rooms_for_seats = self._rooms_to_reach([r['capacity'] for r in room_stats], total_students)
+        rooms_for_separation = self._rooms_to_reach([r['max_per_subject'] for r in room_stats], largest_subject)
+        min_rooms_needed = (
+            max(rooms_for_seats, rooms_for_separation)
+            if rooms_for_seats is not None and rooms_for_separation is not None else None
+        )
+
+        return {
+            'total_students': total_students,
+            'total_capacity': sum(r['capacity'] for r in room_stats),
+            'subject_count': len(subject_counts),
+            'largest_subject': subject_counts.most_common(1)[0][0] if subject_counts else None,
+            'min_rooms_needed': min_rooms_needed,
+            'rooms': room_stats,
+            'strategies': {
+                strategy: self._analyze_strategy(strategy, room_stats, primary_counts, subject_counts,
+                                                 total_students, min_rooms_needed)
+                for strategy in (strategies or self.STRATEGIES)
+            }
+        }
+
+    def _rooms_to_reach(self, values, target):
+        if target <= 0:
+            return 0
+
+        total = 0
+        for count, value in enumerate(sorted(values, reverse=True), 1):
+            total += value
+            if total >= target:
+                return count
+
+        return None
+
+    def _rooms_used(self, strategy, room_stats, total_students):
+        if strategy == 'separated':
+            return room_stats
+
+        if strategy == 'mixed':
+            ordered = sorted(room_stats, key=lambda r: (-r['capacity'], r['name']))
+        else:
+            ordered = sorted(room_stats, key=lambda r: r['capacity'], reverse=True)
+
+        used = []
+        seats = 0
+        for room in ordered:
+            if seats >= total_students:
+                break
+            used.append(room)
+            seats += room['capacity']
+
+        return used
+
+    def _analyze_strategy(self, strategy, room_stats, primary_counts, subject_counts,
+                          total_students, min_rooms_needed):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        used = self._rooms_used(strategy, room_stats, total_students)
+        capacity = sum(room['capacity'] for room in used)
+        columns = sum(room['max_per_subject'] for room in used)
+        placed = min(total_students, capacity)
+        seated_counts = {subject: min(count, placed) for subject, count in subject_counts.items()}
+
+        conflict_free_capacity = min(
+            capacity,
+            sum(min(room['capacity'], len(seated_counts) * room['max_per_subject']) for room in used),
+            sum(min(count, columns) for count in seated_counts.values())
+        )
+
+        widest_room = max((room['max_per_subject'] for room in used), default=0)
+        subjects = {}
+        worst_excess = 0
+        for subject, count in subject_counts.items():
+            seated = seated_counts[subject]
+            excess = max(0, seated - columns)
+            worst_excess = max(worst_excess, excess)
+            subjects[subject] = {
+                'students': count,
+                'max_conflict_free': min(seated, columns),
+                'max_per_room': min(seated, widest_room),
+                'forced_violations': excess
+            }
+
+        forced_violations = max(placed - conflict_free_capacity, worst_excess)
+
+        if strategy == 'separated' and used:
+            seated_groups = [min(count, placed) for count in primary_counts.values()]
+            forced_violations = min(placed, max(forced_violations, self._even_split_excess(used, seated_groups)))
+
+        return {
+            'rooms_used': len(used),
+            'min_rooms_needed': min_rooms_needed,
+            'seats_available': capacity,
+            'unallocated': total_students - placed,
+            'conflict_free_capacity': conflict_free_capacity,
+            'expected_forced_violations': forced_violations,
+            'max_subject_share': round(columns / placed * 100, 2) if placed else 0,
+            'feasible': forced_violations == 0 and placed == total_students,
+            'subjects': subjects
+        }
+
+    def _even_split_excess(self, used, group_counts):
+        columns = sorted(room['max_per_subject'] for room in used)
+        prefix = [0] + list(accumulate(columns))
+        total = 0
+
+        for count in group_counts:
+            share = count // len(columns)
+            below = bisect_left(columns, share)
+            total += below * share - prefix[below]
+
+        return total
@@ -0,0 +1,79 @@
+from models.database import Student, Session
+from utils.xlsx_import import parse_application_workbooks
+from utils.timetable_import import iter_timetable_workbooks
+
+class ImportService:
+    @staticmethod
+    def drop_cross_file_duplicates(workbooks):
+        first_seen = {}
+        for workbook in workbooks:
+            kept = []
+            for row_num, student in workbook['students']:
+                roll_number = student['roll_number']
+                file, first_row = first_seen.setdefault(roll_number, (workbook['file'], row_num))
+                if file != workbook['file']:
+                    workbook['errors'].append((row_num, f"Duplicate roll_number '{roll_number}' (also in {file} row {first_row})"))
+                    continue
+                kept.append((row_num, student))
+            workbook['students'] = kept
+        return workbooks
+
+    @staticmethod
+    def import_application_workbooks(paths, mode='upsert', workers=None):
+        totals = {'created': 0, 'updated': 0, 'unchanged': 0}
+        files = []
+        errors = []
+
+        workbooks = ImportService.drop_cross_file_duplicates(list(parse_application_workbooks(paths, workers)))
+        for workbook in workbooks:
+            rows = workbook['students']
+            counts, write_errors = {}, []
+            if rows:
+                if mode == 'upsert':
+                    counts, write_errors = Student.bulk_upsert(
+                        [student for _, student in rows], row_numbers=[row_num for row_num, _ in rows]
+                    )
+                else:
+                    created, write_errors = Student.bulk_create(
+                        [student for _, student in rows], row_numbers=[row_num for row_num, _ in rows]
+                    )
+                    counts = {'created': created}
+
+            for key, value in counts.items():
+                totals[key] += value
+            file_errors = workbook['errors'] + write_errors
+            errors.extend(f"{workbook['file']}: Row {row_num}: {message}" for row_num, message in sorted(file_errors))
+            files.append({
+                'file': workbook['file'],
+                'department': workbook['metadata'].get('department'),
+                'semester': workbook['metadata'].get('semester'),
+                'students': len(rows),
+                'errors': len(file_errors),
+                **counts
+            })
+
+        return totals, files, errors
+
+    @staticmethod
+    def import_timetable_workbooks(paths, sheets=None):
+        totals = {'created': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        files = []
+        errors = []
+
+        for workbook in iter_timetable_workbooks(paths, sheets):
+            counts = Session.import_slots(workbook['slots'], workbook['file'])
+            for key, value in counts.items():
+                totals[key] += value
+            errors.extend(f"{workbook['file']} [{sheet}]: Row {row_num}: {message}" for sheet, row_num, message in workbook['errors'])
+            files.append({
+                'file': workbook['file'],
+                'sheets': workbook['sheets'],
+                'slots': len(workbook['slots']),
+                'sessions': len({(slot['date'], slot['session']) for slot in workbook['slots']}),
+                'skipped_rows': workbook['skipped'],
+                'superseded_slots': len(workbook['superseded']),
+                'superseded': workbook['superseded'],
+                'errors': len(workbook['errors'])
+            })
+
+        return totals, files, errors
@@ -0,0 +1,136 @@
+import io
+import os
+import math
+from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+INSTITUTION_NAME = os.getenv('INSTITUTION_NAME', '')
+DEFAULT_SPARE_PERCENT = float(os.getenv('INDENT_SPARE_PERCENT', '5'))
+SESSION_TIMES = {
+    'FN': os.getenv('FN_EXAM_TIME', '09:00 AM to 12:00 PM'),
+    'AN': os.getenv('AN_EXAM_TIME', '01:30 PM to 04:30 PM'),
+}
+
+class IndentService:
+    @staticmethod
+    def parse_subject_spare(value):
+        overrides = {}
+        for item in (value or '').split(','):
+            subject, _, percent = item.partition(':')
+            if subject.strip() and percent.strip():
+                overrides[subject.strip()] = float(percent)
+        return overrides
+
+    @staticmethod
+    def aggregate(headers, subject_info=None, spare_percent=DEFAULT_SPARE_PERCENT, subject_spare=None):
+        subject_info = subject_info or {}
+        subject_spare = subject_spare or {}
+        sessions = {}
+
+        for header in headers:
+            session_key = header.get('session') or header.get('subject_filter') or str(header['_id'])
+            session = sessions.get(session_key)
+            if session is None:
+                date, _, name = session_key.rpartition('-') if session_key[-3:] in ('-FN', '-AN') else ('', '', '')
+                session = sessions[session_key] = {
+                    'session': session_key,
+                    'date': date or None,
+                    'session_name': name or None,
+                    'subjects': {},
+                    'halls': [],
+                    'total_students': 0
+                }
+
+            for room_index, room_entry in enumerate(header.get('rooms') or header.get('allocations') or []):
+                hall = (room_entry.get('room') or {}).get('name') or room_entry.get('room_id') or f"Room {room_index + 1}"
+                session['total_students'] += sum(room_entry.get('subject_breakdown', {}).values())
+                papers = room_entry.get('paper_breakdown') or room_entry.get('subject_breakdown', {})
+                for subject, count in sorted(papers.items()):
+                    spare = math.ceil(count * subject_spare.get(subject, spare_percent) / 100)
+                    session['halls'].append({
+                        'hall': hall, 'subject': subject, 'students': count, 'spare': spare, 'papers': count + spare
+                    })
+
+                    totals = session['subjects'].get(subject)
+                    if totals is None:
+                        totals = session['subjects'][subject] = {
+                            'subject': subject, 'title': None, 'branch': None, **subject_info.get(subject, {}),
+                            'students': 0, 'spare': 0, 'papers': 0, 'halls': 0
+                        }
+                    totals['students'] += count
+                    totals['spare'] += spare
+                    totals['papers'] += count + spare
+                    totals['halls'] += 1
+
+        result = []
+        for session_key in sorted(sessions):
+            session = sessions[session_key]
+            session['subjects'] = sorted(session['subjects'].values(), key=lambda totals: totals['subject'])
+            session['total_papers'] = sum(totals['papers'] for totals in session['subjects'])
+            result.append(session)
+
+        return {
+            'spare_percent': spare_percent,
+            'subject_spare': subject_spare,
+            'sessions': result,
+            'total_students': sum(session['total_students'] for session in result),
+            'total_papers': sum(session['total_papers'] for session in result)
+        }
+
+    @staticmethod
+    def to_xlsx(indent, title=None):
+        wb = Workbook(write_only=True)
+        bold = Font(bold=True)
+        generated_on = datetime.now().strftime('%d %b %Y     %I:%M:%S %p')
+
+        for session in indent['sessions']:
+            ws = wb.create_sheet(session['session'][:31])
+
+            ws.column_dimensions['A'].width = 20
+            ws.column_dimensions['B'].width = 16
+            ws.column_dimensions['C'].width = 50
+            ws.column_dimensions['D'].width = 24
+
+            if INSTITUTION_NAME:
+                ws.append([_bold(ws, INSTITUTION_NAME, bold)])
+            ws.append([_bold(ws, f"Question Paper Indent - {title}" if title else "Question Paper Indent", bold)])
+
+            exam_date = session.get('date')
+            if exam_date:
+                exam_date = datetime.strptime(exam_date, '%Y-%m-%d').strftime('%d.%m.%Y')
+            ws.append([
+                f"ExamDate = {exam_date or session['session']}", None, None,
+                f"ExamTime = {SESSION_TIMES.get(session.get('session_name'), session.get('session_name') or '')}"
+            ])
+            ws.append([])
+
+            ws.append([_bold(ws, label, bold) for label in (
+                'Number of Students', 'SUBJECT CODE', 'SUBJECT TITLE', 'Branch', 'Spare', 'Total Papers'
+            )])
+            for totals in session['subjects']:
+                ws.append([totals['students'], totals['subject'], totals['title'], totals['branch'], totals['spare'], totals['papers']])
+            ws.append([sum(totals['students'] for totals in session['subjects']), None, None, _bold(ws, 'Total', bold), None, session['total_papers']])
+            ws.append([])
+
+            ws.append([_bold(ws, 'Hall-wise Indent', bold)])
+            ws.append([_bold(ws, label, bold) for label in ('Hall', 'SUBJECT CODE', 'Number of Students', 'Spare', 'Total Papers')])
+            for hall in session['halls']:
+                ws.append([hall['hall'], hall['subject'], hall['students'], hall['spare'], hall['papers']])
+            ws.append([])
+
+            ws.append([None, None, 'Generated On :', generated_on])
+
+        if not indent['sessions']:
+            wb.create_sheet('QuestionPaperIndent')
+
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+def _bold(ws, value, font):
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = font
+    return cell
@@ -0,0 +1,228 @@
+import io
+import re
+from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+DEFAULT_MAX_GAP = 3
+RANGE_DASH = ' – '
+EXCEPT_OPEN = ' (except '
+EXCEPT_CLOSE = ')'
+LIST_SEPARATOR = ', '
+ROLL_PATTERN = re.compile(r'^(.*?)(\d+)$')
+NATURAL_PATTERN = re.compile(r'(\d+)')
+
+class RollRangeService:
+    GROUP_FIELDS = ('department', 'year', 'subject', 'exam_name', '')
+
+    @staticmethod
+    def natural_key(roll_number):
+        return tuple(
+            (1, int(part), len(part)) if part.isdigit() else (0, part.lower(), 0)
+            for part in NATURAL_PATTERN.split(roll_number) if part
+        )
+
+    @staticmethod
+    def split_roll(roll_number):
+        match = ROLL_PATTERN.match(roll_number)
+        if not match:
+            return roll_number, None, 0
+        return match.group(1), int(match.group(2)), len(match.group(2))
+
+    @staticmethod
+    def _shortest_split(numbers, length):
+        unset = (float('inf'), 0)
+        single = plain = gapped = unset
+        best = []
+
+        separator = len(LIST_SEPARATOR)
+        except_marks = len(EXCEPT_OPEN) + len(EXCEPT_CLOSE) - separator
+
+        # (length, entry start) if this roll ends a single entry, a gapless range (plain) or a range with gaps (gapped)
+        for position, number in enumerate(numbers):
+            listed = (number - numbers[position - 1] - 1) * (length + separator) if position else 0
+            opened = (single[0] + len(RANGE_DASH) + length, single[1])
+            if listed:
+                plain, gapped = unset, min((opened[0] + listed + except_marks, opened[1]),
+                                           (plain[0] + listed + except_marks, plain[1]), (gapped[0] + listed, gapped[1]))
+            else:
+                plain = min(opened, plain)
+            single = ((best[-1][0] + separator if best else 0) + length, position)
+            best.append(min(single, plain, gapped))
+
+        segments = []
+        end = len(numbers) - 1
+        while end >= 0:
+            start = best[end][1]
+            segments.append((start, end))
+            end = start - 1
+        return segments[::-1]
+
+    @staticmethod
+    def compact(roll_numbers, max_gap=DEFAULT_MAX_GAP, presorted=False):
+        ordered = roll_numbers if presorted else sorted(roll_numbers, key=RollRangeService.natural_key)
+        runs = []
+
+        for roll_number in ordered:
+            prefix, number, width = RollRangeService.split_roll(roll_number)
+            run = runs[-1] if runs else None
+            if (run is not None and number is not None and run['series'] == (prefix, width)
+                    and 0 < number - run['numbers'][-1] <= max_gap + 1):
+                run['rolls'].append(roll_number)
+                run['numbers'].append(number)
+                continue
+            runs.append({'series': (prefix, width), 'rolls': [roll_number], 'numbers': [number]})
+
+        compacted = []
+        for run in runs:
+            prefix, width = run['series']
+            rolls, numbers = run['rolls'], run['numbers']
+            for start, end in RollRangeService._shortest_split(numbers, len(rolls[0])):
+                compacted.append({
+                    'from': rolls[start],
+                    'to': rolls[end],
+                    'count': end - start + 1,
+                    'gaps': [
+                        f"{prefix}{missing:0{width}d}"
+                        for position in range(start, end)
+                        for missing in range(numbers[position] + 1, numbers[position + 1])
+                    ]
+                })
+        return compacted
+
+    @staticmethod
+    def format_range(entry):
+        if entry['from'] == entry['to']:
+            return entry['from']
+        text = f"{entry['from']}{RANGE_DASH}{entry['to']}"
+        if entry['gaps']:
+            text += f"{EXCEPT_OPEN}{LIST_SEPARATOR.join(entry['gaps'])}{EXCEPT_CLOSE}"
+        return text
+
+    @staticmethod
+    def hall_ranges(rows, group_by='department', max_gap=DEFAULT_MAX_GAP):
+        keyed = sorted(
+            (
+                row.get('room_name') or row.get('room_id') or '',
+                str(row.get(group_by) or 'All') if group_by else 'All',
+                RollRangeService.natural_key(row['roll_number']),
+                row['roll_number']
+            )
+            for row in rows if row.get('roll_number')
+        )
+
+        halls = []
+        line_count = 0
+        start = 0
+        for end in range(1, len(keyed) + 1):
+            if end < len(keyed) and keyed[end][:2] == keyed[start][:2]:
+                continue
+
+            hall_name, group = keyed[start][:2]
+            if not halls or halls[-1]['hall'] != hall_name:
+                halls.append({'hall': hall_name, 'total': 0, 'groups': []})
+
+            ranges = RollRangeService.compact([item[3] for item in keyed[start:end]], max_gap, presorted=True)
+            halls[-1]['groups'].append({
+                'group': group,
+                'count': end - start,
+                'ranges': ranges,
+                'text': LIST_SEPARATOR.join(RollRangeService.format_range(entry) for entry in ranges)
+            })
+            halls[-1]['total'] += end - start
+            line_count += len(ranges)
+            start = end
+
+        halls.sort(key=lambda hall: RollRangeService.natural_key(hall['hall']))
+        return {
+            'group_by': group_by,
+            'max_gap': max_gap,
+            'total_students': len(keyed),
+            'hall_count': len(halls),
+            'range_count': line_count,
+            'halls': halls
+        }
+
+    @staticmethod
+    def to_xlsx(report, title=None):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Hall Ranges')
+        bold = Font(bold=True)
+
+        for column, width in zip('ABCD', (14, 14, 90, 10)):
+            ws.column_dimensions[column].width = width
+
+        heading = WriteOnlyCell(ws, value=title or 'Hall Allotment')
+        heading.font = Font(bold=True, size=14)
+        ws.append([heading])
+        ws.append([])
+
+        labels = []
+        for label in ('Hall', (report['group_by'] or 'Group').title(), 'Roll Numbers', 'Count'):
+            cell = WriteOnlyCell(ws, value=label)
+            cell.font = bold
+            labels.append(cell)
+        ws.append(labels)
+
+        for hall in report['halls']:
+            for index, group in enumerate(hall['groups']):
+                ws.append([hall['hall'] if index == 0 else None, group['group'], group['text'], group['count']])
+            total = WriteOnlyCell(ws, value=hall['total'])
+            total.font = bold
+            ws.append([None, None, 'Hall total', total])
+
+        ws.append([])
+        ws.append([None, None, 'Total students', report['total_students']])
+
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    @staticmethod
+    def to_pdf(report, title=None):
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36)
+        styles = getSampleStyleSheet()
+        cell_style = styles['BodyText']
+        cell_style.fontSize = 9
+        cell_style.leading = 11
+
+        story = [
+            Paragraph(title or 'Hall Allotment', styles['Title']),
+            Paragraph(f"Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
+                      f"{report['total_students']} students in {report['hall_count']} halls", styles['Normal']),
+            Spacer(1, 12)
+        ]
+
+        data = [['Hall', (report['group_by'] or 'Group').title(), 'Roll Numbers', 'Count']]
+        hall_rows = []
+        for hall in report['halls']:
+            hall_rows.append(len(data))
+            for index, group in enumerate(hall['groups']):
+                data.append([hall['hall'] if index == 0 else '', group['group'], Paragraph(group['text'], cell_style), str(group['count'])])
+        data.append(['', '', 'Total students', str(report['total_students'])])
+
+        table = Table(data, colWidths=[0.8*inch, 0.9*inch, 4.8*inch, 0.6*inch], repeatRows=1)
+        style = [
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')
+        ]
+        style.extend(('LINEABOVE', (0, row), (-1, row), 1.2, colors.black) for row in hall_rows[1:])
+        table.setStyle(TableStyle(style))
+        story.append(table)
+
+        doc.build(story)
+        buffer.seek(0)
+        return buffer
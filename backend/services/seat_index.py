@@ -0,0 +1,98 @@
+class SubjectInterner:
+    def __init__(self):
+        self.bits = {}
+
+    def bit(self, subject):
+        bit = self.bits.get(subject)
+        if bit is None:
+            bit = 1 << len(self.bits)
+            self.bits[subject] = bit
+        return bit
+
+    def mask(self, subjects):
+        mask = 0
+        for subject in subjects:
+            mask |= self.bit(subject)
+        return mask
+
+class SeatIndex:
+    def __init__(self, layout, near_radius=2):
+        self.layout = layout
+        self.capacity = layout.capacity
+        self.near_radius = near_radius
+        self.seat_subjects = {}
+        self.seat_masks = {}
+        self.free_by_position = [pos['seat'] for pos in layout.seat_positions]
+        self.free_by_number = list(range(1, layout.capacity + 1))
+        self.near_masks = [0] * (layout.capacity + 1)
+        self.strict_masks = [0] * (layout.capacity + 1)
+        self._distances = {}
+
+    def _bit_distances(self, bit):
+        distances = self._distances.get(bit)
+        if distances is None:
+            distances = [self.capacity] * (self.capacity + 1)
+            self._distances[bit] = distances
+        return distances
+
+    def distances_for(self, mask):
+        arrays = []
+        while mask:
+            bit = mask & -mask
+            distances = self._distances.get(bit)
+            if distances is not None:
+                arrays.append(distances)
+            mask ^= bit
+
+        if not arrays:
+            return [self.capacity] * (self.capacity + 1)
+        if len(arrays) == 1:
+            return arrays[0]
+        return list(map(min, *arrays))
+
+    def conflicts_strict(self, seat_num, mask):
+        return self.strict_masks[seat_num] & mask
+
+    def place(self, seat_num, subject, mask):
+        self.seat_subjects[seat_num] = subject
+        self.seat_masks[seat_num] = mask
+        self.free_by_position.remove(seat_num)
+        self.free_by_number.remove(seat_num)
+
+        remaining = mask
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+
+            distances = self._bit_distances(bit)
+            distances[seat_num] = 0
+
+            seat = seat_num - 1
+            while seat >= 1 and seat_num - seat < distances[seat]:
+                distances[seat] = seat_num - seat
+                seat -= 1
+
+            seat = seat_num + 1
+            while seat <= self.capacity and seat - seat_num < distances[seat]:
+                distances[seat] = seat - seat_num
+                seat += 1
+
+        near_masks = self.near_masks
+        for seat in range(max(1, seat_num - self.near_radius + 1), min(self.capacity, seat_num + self.near_radius - 1) + 1):
+            if seat != seat_num:
+                near_masks[seat] |= mask
+
+        strict_masks = self.strict_masks
+        for neighbor in self.layout.conflict_neighbors[seat_num]:
+            strict_masks[neighbor] |= mask
+
+    def count_strict_violations(self):
+        violations = 0
+        seat_masks = self.seat_masks
+
+        for seat_num, mask in seat_masks.items():
+            for neighbor in self.layout.conflict_neighbors[seat_num]:
+                if neighbor > seat_num and seat_masks.get(neighbor, 0) & mask:
+                    violations += 1
+
+        return violations
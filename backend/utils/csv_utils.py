@@ -1,148 +1,258 @@
 import csv
 import io
-from typing import List, Dict, Any
+import itertools
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Callable
+from utils.room_layout import normalize_layout_fields, validate_capacity
+
+STREAM_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+def _year(value: str, row_num: int):
+    if value.isdigit():
+        return int(value) or None
+    if 'year' in value.lower():
+        for char in value:
+            if char.isdigit():
+                return int(char) or None
+    return None
+
+def _subjects(value: str, row_num: int):
+    subjects = [s.strip() for s in value.split(',')]
+    if '' in subjects:
+        subjects = [s for s in subjects if s]
+    return subjects or None
+
+def _capacity(value: str, row_num: int):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Row {row_num}: Invalid capacity '{value}' - must be a number")
+
+STUDENT_COLUMNS = (
+    ('name', ('name', 'student_name', 'student name'), None, 'Missing student name'),
+    ('roll_number', ('roll_number', 'roll number', 'roll_no', 'rollno', 'id'), None, 'Missing roll number'),
+    ('year', ('year', 'class', 'semester'), _year, 'Missing or invalid year'),
+    ('subjects', ('subjects', 'subject', 'courses', 'course'), _subjects, 'Missing subjects'),
+)
+
+ROOM_COLUMNS = (
+    ('name', ('name', 'room_name', 'room name', 'room'), None, 'Missing room name'),
+    ('capacity', ('capacity', 'seats', 'size', 'max_capacity'), _capacity, 'Missing capacity'),
+    ('benches_per_row', ('benches_per_row', 'benches per row', 'benches'), None, None),
+    ('seats_per_bench', ('seats_per_bench', 'seats per bench', 'bench_size'), None, None),
+    ('aisles', ('aisles', 'aisle_positions', 'aisle positions'), None, None),
+)
+
+SUBJECT_COLUMNS = (
+    ('name', ('name', 'subject_name', 'subject name', 'subject', 'code', 'subject_code'), None, 'Missing subject name'),
+)
+
+@lru_cache(maxsize=256)
+def _room_layout(capacity: int, benches_per_row, seats_per_bench, aisles) -> Tuple[Tuple[str, Any], ...]:
+    layout_fields = {
+        field: value for field, value in
+        (('benches_per_row', benches_per_row), ('seats_per_bench', seats_per_bench), ('aisles', aisles))
+        if value is not None
+    }
+    layout = normalize_layout_fields(layout_fields)
+    validate_capacity(capacity, layout.get('benches_per_row'), layout.get('seats_per_bench'))
+    return tuple(layout.items())
+
+def _finish_room(row: Dict[str, Any], row_num: int) -> Dict[str, Any]:
+    if row['capacity'] <= 0:
+        raise ValueError(f"Row {row_num}: Capacity must be greater than 0")
+
+    try:
+        layout = _room_layout(row['capacity'], row['benches_per_row'], row['seats_per_bench'], row['aisles'])
+    except ValueError as e:
+        raise ValueError(f"Row {row_num}: {str(e)}")
+
+    room = {
+        'name': row['name'],
+        'capacity': row['capacity']
+    }
+    for field, value in layout:
+        room[field] = list(value) if isinstance(value, list) else value
+    return room
+
+FILE_TYPES = {
+    'students': (STUDENT_COLUMNS, None),
+    'rooms': (ROOM_COLUMNS, _finish_room),
+    'subjects': (SUBJECT_COLUMNS, None),
+}
+
+def compile_row_parser(fieldnames: List[str], file_type: str) -> Callable[[List[str], int], Dict[str, Any]]:
+    if file_type not in FILE_TYPES:
+        raise ValueError(f"Unsupported file type: {file_type}")
+    columns, finish = FILE_TYPES[file_type]
+
+    positions = {}
+    for index, fieldname in enumerate(fieldnames):
+        positions[(fieldname or '').strip().lower()] = index
+
+    resolved = [
+        (field, tuple(positions[alias] for alias in aliases if alias in positions), convert, missing)
+        for field, aliases, convert, missing in columns
+    ]
+    absent = {field: None for field, indices, _, _ in resolved if not indices}
+    plan = tuple((field, indices[1:], convert) for field, indices, convert, _ in resolved if indices)
+    primary = [indices[0] for _, indices, _, _ in resolved if indices]
+    fetch = itemgetter(*primary, *primary[:1]) if primary else None
+    required = tuple((field, missing) for field, _, _, missing in resolved if missing)
+
+    def fetch_padded(values: List[str]) -> Tuple[str, ...]:
+        width = len(values)
+        return tuple(values[index] if index < width else '' for index in primary)
+
+    def parse(values: List[str], row_num: int) -> Dict[str, Any]:
+        if not ''.join(values).strip():
+            return None
+
+        try:
+            raw_values = fetch(values) if fetch else ()
+        except IndexError:
+            raw_values = fetch_padded(values)
+
+        row = dict(absent)
+        for (field, fallbacks, convert), value in zip(plan, map(str.strip, raw_values)):
+            if not value and fallbacks:
+                value = next((values[i].strip() for i in fallbacks if i < len(values) and values[i].strip()), '')
+            if value:
+                row[field] = convert(value, row_num) if convert else value
+            else:
+                row[field] = None
+
+        if None in row.values():
+            for field, missing in required:
+                if row[field] is None:
+                    raise ValueError(f"Row {row_num}: {missing}")
+
+        return finish(row, row_num) if finish else row
+
+    return parse
+
+def iter_parsed_rows(lines: Iterable[str], file_type: str) -> Iterator[Tuple[int, Callable, List[str]]]:
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    parse_row = compile_row_parser(header, file_type)
+
+    row_num = 1
+    for values in reader:
+        if not values:
+            continue
+        row_num += 1
+        yield row_num, parse_row, values
 
 def parse_csv_content(csv_content: str, file_type: str) -> List[Dict[str, Any]]:
+    return [parsed_row for _, parsed_row in parse_csv_rows(csv_content, file_type)]
+
+def parse_csv_rows(csv_content: str, file_type: str) -> List[Tuple[int, Dict[str, Any]]]:
     try:
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
         data = []
 
-        for row_num, row in enumerate(csv_reader, start=2):
-            if file_type == 'students':
-                parsed_row = parse_student_row(row, row_num)
-            elif file_type == 'rooms':
-                parsed_row = parse_room_row(row, row_num)
-            elif file_type == 'subjects':
-                parsed_row = parse_subject_row(row, row_num)
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
+        reader = csv.reader(io.StringIO(csv_content))
+        header = next(reader, None)
+        if header is None:
+            return data
+        parse_row = compile_row_parser(header, file_type)
 
-            if parsed_row:
-                data.append(parsed_row)
+        row_num = 1
+        for values in reader:
+            if values:
+                row_num += 1
+                parsed_row = parse_row(values, row_num)
+                if parsed_row:
+                    data.append((row_num, parsed_row))
 
         return data
 
     except Exception as e:
         raise ValueError(f"Error parsing CSV: {str(e)}")
 
-def parse_student_row(row: Dict[str, str], row_num: int) -> Dict[str, Any]:
-    clean_row = {k.strip().lower(): v.strip() for k, v in row.items() if v.strip()}
+def iter_csv_rows(lines: Iterable[str], file_type: str, errors: List[Tuple[int, str]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    for row_num, parse_row, values in iter_parsed_rows(lines, file_type):
+        try:
+            parsed_row = parse_row(values, row_num)
+        except ValueError as e:
+            message = str(e)
+            prefix = f"Row {row_num}: "
+            errors.append((row_num, message[len(prefix):] if message.startswith(prefix) else message))
+            continue
 
-    if not clean_row:
-        return None
+        if parsed_row:
+            yield row_num, parsed_row
 
-    name_keys = ['name', 'student_name', 'student name']
-    roll_keys = ['roll_number', 'roll number', 'roll_no', 'rollno', 'id']
-    year_keys = ['year', 'class', 'semester']
-    subject_keys = ['subjects', 'subject', 'courses', 'course']
+def import_csv_stream(lines: Iterable[str], file_type: str, write_chunk, chunk_size: int = None) -> Dict[str, Any]:
+    parse_errors = []
+    report = []
+    counts = {}
+    valid_rows = 0
+    invalid_rows = 0
+    write_failures = 0
+    rows = iter_csv_rows(lines, file_type, parse_errors)
 
-    name = None
-    for key in name_keys:
-        if key in clean_row:
-            name = clean_row[key]
-            break
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size or STREAM_CHUNK_SIZE))
+        chunk_errors = list(parse_errors)
+        invalid_rows += len(parse_errors)
+        parse_errors.clear()
 
-    roll_number = None
-    for key in roll_keys:
-        if key in clean_row:
-            roll_number = clean_row[key]
-            break
+        if chunk:
+            valid_rows += len(chunk)
+            written, write_errors = write_chunk([parsed for _, parsed in chunk], [row_num for row_num, _ in chunk])
+            for key, value in (written if isinstance(written, dict) else {'created': written}).items():
+                counts[key] = counts.get(key, 0) + value
+            write_failures += len(write_errors)
+            chunk_errors.extend(write_errors)
 
-    year = None
-    for key in year_keys:
-        if key in clean_row:
-            year_str = clean_row[key]
-            if year_str.isdigit():
-                year = int(year_str)
-            elif 'year' in year_str.lower():
-                for char in year_str:
-                    if char.isdigit():
-                        year = int(char)
-                        break
-            break
+        report.extend(sorted(chunk_errors)[:max(MAX_REPORTED_ERRORS - len(report), 0)])
 
-    subjects = []
-    for key in subject_keys:
-        if key in clean_row:
-            subject_str = clean_row[key]
-            subjects = [s.strip() for s in subject_str.split(',') if s.strip()]
+        if not chunk:
             break
 
-    if not name:
-        raise ValueError(f"Row {row_num}: Missing student name")
-    if not roll_number:
-        raise ValueError(f"Row {row_num}: Missing roll number")
-    if not year:
-        raise ValueError(f"Row {row_num}: Missing or invalid year")
-    if not subjects:
-        raise ValueError(f"Row {row_num}: Missing subjects")
-
     return {
-        'name': name,
-        'roll_number': roll_number,
-        'year': year,
-        'subjects': subjects
+        'counts': counts,
+        'total_rows': valid_rows + invalid_rows,
+        'invalid_rows': invalid_rows,
+        'failed_writes': write_failures,
+        'errors': report
     }
 
-def parse_room_row(row: Dict[str, str], row_num: int) -> Dict[str, Any]:
-    clean_row = {k.strip().lower(): v.strip() for k, v in row.items() if v.strip()}
-
-    if not clean_row:
-        return None
 
-    name_keys = ['name', 'room_name', 'room name', 'room']
-    capacity_keys = ['capacity', 'seats', 'size', 'max_capacity']
+def upload_lines(file_storage) -> Iterable[str]:
+    return io.TextIOWrapper(file_storage.stream, encoding='utf-8-sig', newline='')
 
-    name = None
-    for key in name_keys:
-        if key in clean_row:
-            name = clean_row[key]
-            break
 
-    capacity = None
-    for key in capacity_keys:
-        if key in clean_row:
-            capacity_str = clean_row[key]
-            try:
-                capacity = int(capacity_str)
-            except ValueError:
-                raise ValueError(f"Row {row_num}: Invalid capacity '{capacity_str}' - must be a number")
-            break
-
-    if not name:
-        raise ValueError(f"Row {row_num}: Missing room name")
-    if capacity is None:
-        raise ValueError(f"Row {row_num}: Missing capacity")
-    if capacity <= 0:
-        raise ValueError(f"Row {row_num}: Capacity must be greater than 0")
-    if capacity > 50:
-        raise ValueError(f"Row {row_num}: Capacity cannot exceed 50 seats")
-
-    return {
-        'name': name,
-        'capacity': capacity
+def stream_summary(report: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+    summary = {
+        **{f"{key}_count": value for key, value in report['counts'].items()},
+        'total_rows': report['total_rows'],
+        'invalid_rows': report['invalid_rows'],
+        'failed_writes': report['failed_writes'],
+        'elapsed_ms': round(elapsed * 1000, 2),
+        'rows_per_second': round(report['total_rows'] / elapsed, 1) if elapsed > 0 else None
     }
+    if report['errors']:
+        summary['errors'] = [f"Row {row_num}: {message}" for row_num, message in report['errors']]
+    return summary
 
-def parse_subject_row(row: Dict[str, str], row_num: int) -> Dict[str, Any]:
-    clean_row = {k.strip().lower(): v.strip() for k, v in row.items() if v.strip()}
-
-    if not clean_row:
-        return None
 
-    name_keys = ['name', 'subject_name', 'subject name', 'subject', 'code', 'subject_code']
+def _parse_dict_row(row: Dict[str, str], row_num: int, file_type: str) -> Dict[str, Any]:
+    items = [(key, value or '') for key, value in row.items() if key is not None]
+    return compile_row_parser([key for key, _ in items], file_type)([value for _, value in items], row_num)
 
-    name = None
-    for key in name_keys:
-        if key in clean_row:
-            name = clean_row[key]
-            break
+def parse_student_row(row: Dict[str, str], row_num: int) -> Dict[str, Any]:
+    return _parse_dict_row(row, row_num, 'students')
 
-    if not name:
-        raise ValueError(f"Row {row_num}: Missing subject name")
+def parse_room_row(row: Dict[str, str], row_num: int) -> Dict[str, Any]:
+    return _parse_dict_row(row, row_num, 'rooms')
 
-    return {
-        'name': name
-    }
+def parse_subject_row(row: Dict[str, str], row_num: int) -> Dict[str, Any]:
+    return _parse_dict_row(row, row_num, 'subjects')
 
 def generate_sample_csv(file_type: str) -> str:
     if file_type == 'students':
@@ -151,10 +261,11 @@ John Doe,2021001,1,Mathematics
 Jane Smith,2021002,2,"Physics,Chemistry"
 Bob Johnson,2021003,1,Computer Science"""
     elif file_type == 'rooms':
-        return """name,capacity
-Room A,30
-Room B,40
-Room C,50"""
+        return """name,capacity,benches_per_row,seats_per_bench,aisles
+Room A,30,4,2,
+Room B,40,4,2,2
+Room C,50,4,2,2
+Drawing Hall,36,4,3,"""
     elif file_type == 'subjects':
         return """name
 Mathematics
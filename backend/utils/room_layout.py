@@ -0,0 +1,178 @@
+import math
+from functools import lru_cache
+
+DEFAULT_BENCHES_PER_ROW = 4
+DEFAULT_SEATS_PER_BENCH = 2
+MAX_BENCHES_PER_ROW = 20
+MAX_SEATS_PER_BENCH = 6
+MAX_ROWS = 50
+
+POSITION_LABELS = {
+    1: ('center',),
+    2: ('left', 'right'),
+    3: ('left', 'middle', 'right'),
+}
+
+class RoomLayout:
+    SEPARATION_RADIUS = 3
+
+    def __init__(self, capacity, benches_per_row, seats_per_bench, aisles):
+        self.capacity = capacity
+        self.benches_per_row = benches_per_row
+        self.seats_per_bench = seats_per_bench
+        self.aisles = aisles
+        self.total_benches = (capacity + seats_per_bench - 1) // seats_per_bench
+        self.total_rows = (self.total_benches + benches_per_row - 1) // benches_per_row
+        self.position_labels = POSITION_LABELS.get(
+            seats_per_bench, tuple(f'seat_{slot + 1}' for slot in range(seats_per_bench))
+        )
+
+        aisles_before = [sum(1 for aisle in aisles if aisle <= col) for col in range(benches_per_row)]
+        self.total_width = benches_per_row * seats_per_bench + len(aisles)
+
+        self.seat_row = [0] * (capacity + 1)
+        self.seat_col = [0] * (capacity + 1)
+        self.seat_x = [0] * (capacity + 1)
+        self.seat_bench = [0] * (capacity + 1)
+        self.seat_slot = [0] * (capacity + 1)
+        self.position_score = [0.0] * (capacity + 1)
+
+        center_row = self.total_rows / 2
+        center_x = self.total_width / 2
+        bench_seats = {}
+        column_seats = {}
+
+        for seat in range(1, capacity + 1):
+            bench_idx, slot = divmod(seat - 1, seats_per_bench)
+            row, col = divmod(bench_idx, benches_per_row)
+            x = col * seats_per_bench + slot + aisles_before[col]
+
+            self.seat_row[seat] = row
+            self.seat_col[seat] = col
+            self.seat_x[seat] = x
+            self.seat_bench[seat] = bench_idx + 1
+            self.seat_slot[seat] = slot
+
+            checkerboard_bonus = 10 if (row + x) % 2 == 0 else 0
+            self.position_score[seat] = math.hypot(row - center_row, x - center_x) + checkerboard_bonus
+
+            bench_seats.setdefault(bench_idx, []).append(seat)
+            column_seats.setdefault(col, []).append(seat)
+
+        self.conflict_neighbors = [()] * (capacity + 1)
+        for seat in range(1, capacity + 1):
+            neighbors = set(bench_seats[self.seat_bench[seat] - 1])
+            neighbors.update(column_seats[self.seat_col[seat]])
+            neighbors.discard(seat)
+            self.conflict_neighbors[seat] = tuple(sorted(neighbors))
+
+        seat_at = {(self.seat_row[seat], self.seat_x[seat]): seat for seat in range(1, capacity + 1)}
+        reach = self.SEPARATION_RADIUS
+        self.near_seats = [()] * (capacity + 1)
+        for seat in range(1, capacity + 1):
+            row, x = self.seat_row[seat], self.seat_x[seat]
+            near = []
+            for other_row in range(row, row + reach):
+                for other_x in range(x - reach + 1, x + reach):
+                    other = seat_at.get((other_row, other_x))
+                    if other is None or other <= seat:
+                        continue
+                    distance = math.hypot(other_row - row, other_x - x)
+                    if distance < reach:
+                        near.append((other, distance))
+            self.near_seats[seat] = tuple(near)
+
+        self.seat_positions = tuple(sorted(
+            ({
+                'seat': seat,
+                'row': self.seat_row[seat],
+                'col': self.seat_x[seat],
+                'position_score': self.position_score[seat]
+            } for seat in range(1, capacity + 1)),
+            key=lambda p: p['position_score']
+        ))
+
+    def grid(self, seat_num):
+        return {
+            'row': self.seat_row[seat_num],
+            'col': self.seat_col[seat_num],
+            'position': self.position_labels[self.seat_slot[seat_num]],
+            'slot': self.seat_slot[seat_num],
+            'bench_num': self.seat_bench[seat_num]
+        }
+
+    def to_dict(self):
+        return {
+            'total_benches': self.total_benches,
+            'benches_per_row': self.benches_per_row,
+            'seats_per_bench': self.seats_per_bench,
+            'aisles': list(self.aisles),
+            'total_rows': self.total_rows,
+            'total_columns': self.benches_per_row,
+            'capacity': self.capacity
+        }
+
+@lru_cache(maxsize=256)
+def compile_layout(capacity, benches_per_row=DEFAULT_BENCHES_PER_ROW,
+                   seats_per_bench=DEFAULT_SEATS_PER_BENCH, aisles=()):
+    return RoomLayout(capacity, benches_per_row, seats_per_bench, tuple(sorted(set(aisles))))
+
+def layout_for_room(room):
+    return compile_layout(
+        room['capacity'],
+        room.get('benches_per_row') or DEFAULT_BENCHES_PER_ROW,
+        room.get('seats_per_bench') or DEFAULT_SEATS_PER_BENCH,
+        tuple(room.get('aisles') or ())
+    )
+
+def strict_columns(room):
+    seats_per_bench = room.get('seats_per_bench') or DEFAULT_SEATS_PER_BENCH
+    total_benches = (room['capacity'] + seats_per_bench - 1) // seats_per_bench
+    return min(room.get('benches_per_row') or DEFAULT_BENCHES_PER_ROW, total_benches)
+
+def parse_aisles(value):
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        value = [part for part in value.replace(';', ',').split(',') if part.strip()]
+    try:
+        return sorted(set(int(aisle) for aisle in value))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid aisle positions '{value}' - must be bench column numbers")
+
+def normalize_layout_fields(data):
+    layout = {}
+
+    for field, maximum in (('benches_per_row', MAX_BENCHES_PER_ROW), ('seats_per_bench', MAX_SEATS_PER_BENCH)):
+        if data.get(field) in (None, ''):
+            continue
+        try:
+            value = int(data[field])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {field} '{data[field]}' - must be a number")
+        if value <= 0 or value > maximum:
+            raise ValueError(f"{field} must be between 1 and {maximum}")
+        layout[field] = value
+
+    if 'aisles' in data:
+        aisles = parse_aisles(data['aisles'])
+        benches_per_row = layout.get('benches_per_row', DEFAULT_BENCHES_PER_ROW)
+        for aisle in aisles:
+            if aisle <= 0 or aisle >= benches_per_row:
+                raise ValueError(f"Aisle position {aisle} must be between 1 and {benches_per_row - 1}")
+        layout['aisles'] = aisles
+
+    return layout
+
+def validate_capacity(capacity, benches_per_row=None, seats_per_bench=None):
+    benches_per_row = benches_per_row or DEFAULT_BENCHES_PER_ROW
+    seats_per_bench = seats_per_bench or DEFAULT_SEATS_PER_BENCH
+    max_capacity = MAX_ROWS * benches_per_row * seats_per_bench
+
+    if capacity <= 0:
+        raise ValueError("Room capacity must be greater than 0")
+    if capacity > max_capacity:
+        raise ValueError(
+            f"Room capacity cannot exceed {max_capacity} seats for a layout of "
+            f"{benches_per_row} benches per row × {seats_per_bench} seats per bench (max {MAX_ROWS} rows)"
+        )
@@ -0,0 +1,133 @@
+import os
+import glob
+from datetime import datetime
+from typing import List, Dict, Any, Iterator
+from openpyxl import load_workbook
+from utils.xlsx_import import _label, _text
+
+TIMETABLE_PATTERNS = ('*TT*.xlsx', '*[Tt]ime[Tt]able*.xlsx')
+HEADER_SCAN_ROWS = 10
+
+COLUMN_ALIASES = {
+    'subject': ('course code', 'subject code', 'course_code', 'code'),
+    'title': ('course title', 'subject title', 'course name', 'subject name'),
+    'department': ('dep.', 'dept.', 'dept', 'department', 'branch'),
+    'semester': ('sem', 'semester'),
+    'type': ('type',),
+    'regulation': ('regulations', 'regulation'),
+    'date': ('date', 'exam date'),
+    'session': ('session',),
+    'rescheduled': ('rescheduled date', 'revised date'),
+}
+
+SESSION_NAMES = {'FN': 'FN', 'FORENOON': 'FN', 'MORNING': 'FN', 'AN': 'AN', 'AFTERNOON': 'AN', 'EVENING': 'AN'}
+
+def normalize_session(value) -> str:
+    return SESSION_NAMES.get(''.join(ch for ch in _text(value).upper() if ch.isalpha())) if value is not None else None
+
+def _resolve_header(row) -> Dict[str, int]:
+    labels = [_label(value) for value in row]
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in labels:
+                columns[field] = labels.index(alias)
+                break
+    return columns if 'subject' in columns and 'date' in columns and 'session' in columns else None
+
+def _slot(row, columns):
+    date_index = next((i for i in range(columns['date'], len(row)) if isinstance(row[i], datetime)), None)
+    if date_index is None:
+        return None, None
+
+    date = row[date_index]
+    session = next((normalize_session(value) for value in row[date_index + 1:] if normalize_session(value)), None)
+
+    rescheduled = columns.get('rescheduled')
+    if rescheduled is not None and rescheduled < len(row) and isinstance(row[rescheduled], datetime):
+        date = row[rescheduled]
+        session = next((normalize_session(value) for value in row[rescheduled + 1:rescheduled + 2] if normalize_session(value)), session)
+
+    return date.strftime('%Y-%m-%d'), session
+
+def parse_timetable_workbook(path: str, sheets: List[str] = None) -> Dict[str, Any]:
+    result = {'file': os.path.basename(path), 'sheets': [], 'slots': [], 'skipped': 0, 'superseded': [], 'errors': []}
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    slots_by_subject = {}
+
+    try:
+        for sheet in workbook.worksheets:
+            if sheets and sheet.title.strip() not in sheets:
+                continue
+            sheet.reset_dimensions()
+            columns = None
+            sheet_slots = {}
+
+            for row_num, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                if columns is None:
+                    if row_num > HEADER_SCAN_ROWS:
+                        break
+                    columns = _resolve_header(row)
+                    continue
+
+                cell = lambda field: row[columns[field]] if field in columns and columns[field] < len(row) else None
+                subject = _text(cell('subject'))
+                if not subject:
+                    continue
+
+                date, session = _slot(row, columns)
+                if date is None:
+                    result['skipped'] += 1
+                    continue
+                if session is None:
+                    result['errors'].append((sheet.title.strip(), row_num, f"No FN/AN session for {subject} on {date}"))
+                    continue
+
+                departments = [d.strip() for d in _text(cell('department')).replace('\n', ',').split(',') if d.strip()]
+                slot = sheet_slots.setdefault((subject, date, session), {
+                    'subject': subject,
+                    'date': date,
+                    'session': session,
+                    'title': ' '.join(_text(cell('title')).split()),
+                    'departments': [],
+                    'semester': _text(cell('semester')),
+                    'type': _text(cell('type')).upper(),
+                    'regulation': _text(cell('regulation')),
+                    'sheet': sheet.title.strip(),
+                })
+                slot['departments'].extend(d for d in departments if d not in slot['departments'])
+
+            if columns is None:
+                result['errors'].append((sheet.title.strip(), 0, f"No header row with course code, date and session columns in the first {HEADER_SCAN_ROWS} rows"))
+                continue
+
+            result['sheets'].append(sheet.title.strip())
+            replaced = {}
+            for slot in sheet_slots.values():
+                if slot['subject'] not in replaced:
+                    replaced[slot['subject']] = slots_by_subject.pop(slot['subject'], [])
+                slots_by_subject.setdefault(slot['subject'], []).append(slot)
+            for subject, slots in replaced.items():
+                new_slots = [f"{new['date']}-{new['session']}" for new in slots_by_subject[subject]]
+                result['superseded'].extend({
+                    'subject': subject,
+                    'old_slot': f"{slot['date']}-{slot['session']}",
+                    'old_sheet': slot['sheet'],
+                    'new_slot': ', '.join(new_slots),
+                    'new_sheet': sheet.title.strip()
+                } for slot in slots if f"{slot['date']}-{slot['session']}" not in new_slots)
+    finally:
+        workbook.close()
+
+    result['slots'] = [slot for slots in slots_by_subject.values() for slot in slots]
+    return result
+
+def find_timetable_workbooks(folder: str) -> List[str]:
+    paths = set()
+    for pattern in TIMETABLE_PATTERNS:
+        paths.update(glob.glob(os.path.join(folder, pattern)))
+    return sorted(paths)
+
+def iter_timetable_workbooks(paths: List[str], sheets: List[str] = None) -> Iterator[Dict[str, Any]]:
+    for path in paths:
+        yield parse_timetable_workbook(path, sheets)
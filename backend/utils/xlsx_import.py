@@ -0,0 +1,120 @@
+import os
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Iterator
+from openpyxl import load_workbook
+
+APPLICATION_PATTERNS = ('Exam Applications Preview*.xlsx', '*SEM3*.xlsx')
+HEADER_SCAN_ROWS = 40
+
+COLUMN_ALIASES = {
+    'roll_number': ('usn', 'register no', 'register number', 'reg no', 'reg. no', 'regno', 'roll no', 'roll number', 'roll_number'),
+    'name': ('student name', 'name of the student', 'name', 'student_name'),
+    'section': ('section',),
+    'regular': ('regular courses', 'courses', 'subjects', 'subject codes'),
+    'arrear': ('arrear courses', 'arrears'),
+}
+
+METADATA_FIELDS = {
+    'academic year': 'academic_year',
+    'degree': 'degree',
+    'dept id': 'department',
+    'department': 'department',
+    'regulation': 'regulation',
+    'term number': 'semester',
+    'semester': 'semester',
+}
+
+def _label(value) -> str:
+    return ' '.join(str(value).split()).lower() if value is not None else ''
+
+def _text(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def _course_codes(*cells) -> List[str]:
+    codes = []
+    for cell in cells:
+        for code in _text(cell).split(','):
+            code = code.strip()
+            if code and code not in codes:
+                codes.append(code)
+    return codes
+
+def _resolve_header(row) -> Dict[str, int]:
+    labels = [_label(value) for value in row]
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in labels:
+                columns[field] = labels.index(alias)
+                break
+    return columns if 'roll_number' in columns and 'name' in columns and 'regular' in columns else None
+
+def parse_application_workbook(path: str) -> Dict[str, Any]:
+    result = {'file': os.path.basename(path), 'metadata': {}, 'students': [], 'errors': []}
+    workbook = load_workbook(path, read_only=True, data_only=True)
+
+    try:
+        sheet = workbook.worksheets[0]
+        sheet.reset_dimensions()
+        columns = None
+        year = semester = None
+
+        for row_num, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+            if columns is None:
+                if row_num > HEADER_SCAN_ROWS:
+                    break
+                columns = _resolve_header(row)
+                if columns is None and len(row) > 1 and _label(row[0]) in METADATA_FIELDS and row[1] is not None:
+                    result['metadata'][METADATA_FIELDS[_label(row[0])]] = _text(row[1])
+                elif columns is not None and result['metadata'].get('semester', '').isdigit():
+                    semester = int(result['metadata']['semester'])
+                    year = (semester + 1) // 2
+                continue
+
+            cell = lambda field: row[columns[field]] if field in columns and columns[field] < len(row) else None
+            roll_number, name = _text(cell('roll_number')), _text(cell('name'))
+            subjects = _course_codes(cell('regular'), cell('arrear'))
+
+            if not roll_number and not name and not subjects:
+                continue
+            if not roll_number:
+                result['errors'].append((row_num, 'Missing register number'))
+            elif not name:
+                result['errors'].append((row_num, 'Missing student name'))
+            elif not subjects:
+                result['errors'].append((row_num, 'No registered courses'))
+            elif year is None:
+                result['errors'].append((row_num, 'Missing or invalid Term Number in workbook header'))
+            else:
+                student = {'name': name, 'roll_number': roll_number, 'year': year, 'subjects': subjects, 'semester': semester}
+                if result['metadata'].get('department'):
+                    student['department'] = result['metadata']['department']
+                result['students'].append((row_num, student))
+
+        if columns is None:
+            result['errors'].append((0, f"No header row with register number, name and course columns in the first {HEADER_SCAN_ROWS} rows"))
+    finally:
+        workbook.close()
+
+    return result
+
+def find_application_workbooks(folder: str) -> List[str]:
+    paths = set()
+    for pattern in APPLICATION_PATTERNS:
+        paths.update(glob.glob(os.path.join(folder, pattern)))
+    return sorted(paths)
+
+def parse_application_workbooks(paths: List[str], workers: int = None) -> Iterator[Dict[str, Any]]:
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield parse_application_workbook(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse_application_workbook, paths)
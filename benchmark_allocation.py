@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+import random
+import tempfile
+sys.path.append('backend')
+
+from services.allocation_service import AllocationService
+from utils.room_layout import layout_for_room
+
+STRATEGIES = ['mixed', 'separated', 'optimal_packing']
+TARGET_MS = 200
+
+def build_students(count, subject_count, seed=42):
+    rng = random.Random(seed)
+    subjects = [f"SUB{i + 1:03d}" for i in range(subject_count)]
+    students = []
+
+    for i in range(count):
+        student_subjects = rng.sample(subjects, 2)
+        students.append({
+            '_id': f"student-{i}",
+            'name': f"Student {i}",
+            'roll_number': f"22CS{i + 1:04d}",
+            'year': rng.randint(1, 4),
+            'subjects': student_subjects,
+            'subject': student_subjects[0]
+        })
+
+    return students
+
+def build_hall(capacity, benches_per_row=10, seats_per_bench=2, number=1):
+    return {
+        '_id': f"hall-{capacity}-{number}",
+        'name': f"Exam Hall {capacity}-{number}",
+        'capacity': capacity,
+        'benches_per_row': benches_per_row,
+        'seats_per_bench': seats_per_bench,
+        'aisles': [benches_per_row // 2]
+    }
+
+def run_case(label, students, rooms, repeat=3):
+    print(f"\n{label}: {len(students)} students, {len(rooms)} room(s), "
+          f"{sum(room['capacity'] for room in rooms)} seats")
+
+    results = {}
+    for strategy in STRATEGIES:
+        timings = []
+        result = None
+        for _ in range(repeat):
+            service = AllocationService(collect_diagnostics=True)
+            start = time.perf_counter()
+            result = service.allocate_seats([dict(s) for s in students], rooms, strategy)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        best = min(timings)
+        summary = result['summary']
+        diagnostics = summary['diagnostics']
+        phases = ", ".join(f"{name}={ms:.1f}" for name, ms in diagnostics['phases_ms'].items())
+        status = "✅" if best < TARGET_MS else "❌"
+
+        print(f"  {status} {strategy:16s} {best:8.1f} ms | allocated {summary['total_allocated']}/{summary['total_students']} "
+              f"| {summary['quality_rating']}")
+        print(f"      phases(ms): {phases}")
+        print(f"      counters:   {diagnostics['counters']}")
+        results[strategy] = best
+
+    return results
+
+def benchmark_large_hall():
+    students = build_students(400, 8)
+    return run_case("400-seat hall", students, [build_hall(400)])
+
+def benchmark_mixed_halls():
+    students = build_students(1200, 12)
+    rooms = [build_hall(400), build_hall(240, 8), build_hall(120, 6, 2), build_hall(48, 4, 3), build_hall(400, number=2)]
+    return run_case("Combined session", students, rooms, repeat=1)
+
+def build_exams(count, subjects_per_exam=4, seed=42):
+    rng = random.Random(seed)
+    exams = [{
+        'exam_name': f"Programme {chr(65 + e)}",
+        'subjects': [f"P{chr(65 + e)}{s + 1:02d}" for s in range(subjects_per_exam)],
+        'duration': 180
+    } for e in range(4)]
+    students = []
+
+    for i in range(count):
+        exam = exams[i % len(exams)]
+        subject = rng.choice(exam['subjects'])
+        students.append({
+            '_id': f"student-{i}",
+            'name': f"Student {i}",
+            'roll_number': f"22MX{i + 1:05d}",
+            'year': rng.randint(1, 4),
+            'subjects': [subject],
+            'subject': subject
+        })
+
+    return students, exams
+
+def neighbour_clashes(allocations, field):
+    clashes = 0
+    for room_allocation in allocations:
+        layout = layout_for_room(room_allocation['room'])
+        seats = {seat['seat_number']: seat['student'] for seat in room_allocation['students']}
+        for seat_num, student in seats.items():
+            for neighbour, distance in layout.near_seats[seat_num]:
+                if distance <= 1 and neighbour in seats and seats[neighbour][field] == student[field]:
+                    clashes += 1
+    return clashes
+
+def benchmark_multi_exam(student_count=3200):
+    students, exams = build_exams(student_count)
+    rooms = [build_hall(400, number=n) for n in range(1, student_count // 400 + 1)]
+    print(f"\nCombined multi-exam session: {student_count} students, {len(exams)} exams, {len(rooms)} rooms")
+
+    for strategy in ('mixed', 'multi_exam'):
+        service = AllocationService(collect_diagnostics=True)
+        start = time.perf_counter()
+        result = service.allocate_seats([dict(s) for s in students], rooms, strategy, exams)
+        elapsed = (time.perf_counter() - start) * 1000
+        summary = result['summary']
+        exam_of = {subject: exam['exam_name'] for exam in exams for subject in exam['subjects']}
+        for room_allocation in result['allocations']:
+            for seat in room_allocation['students']:
+                seat['student'].setdefault('exam_name', exam_of[seat['student']['subject']])
+
+        print(f"  {strategy:12s} {elapsed:8.1f} ms | allocated {summary['total_allocated']}/{summary['total_students']} "
+              f"| adjacent same exam {neighbour_clashes(result['allocations'], 'exam_name')} "
+              f"| adjacent same subject {neighbour_clashes(result['allocations'], 'subject')}")
+
+def timed(label, func):
+    start = time.perf_counter()
+    value = func()
+    print(f"  {label:28s} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return value
+
+def benchmark_storage(backend, student_count=3000, lookups=1000):
+    os.environ['STORAGE_BACKEND'] = backend
+    os.environ['MONGODB_DATABASE'] = 'exam_allocator_benchmark'
+    os.environ['EMBEDDED_DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'benchmark.db')
+
+    from models.storage import open_storage
+    import models.database as database
+
+    database.storage = storage = open_storage(backend)
+    for name in ('students', 'rooms', 'subjects', 'allocations', 'seat_assignments', 'subject_stats', 'sessions'):
+        setattr(database, f"{name}_collection", storage.collection(name))
+
+    print(f"\nStorage round trip ({backend}): {student_count} students, {lookups} seat lookups")
+    try:
+        storage.ping()
+    except Exception as e:
+        print(f"  ⚠️  {backend} not reachable, skipping: {e}")
+        return
+
+    database.Allocation.delete_all()
+    database.Student.delete_all()
+    database.Room.delete_all()
+    database.ensure_indexes()
+
+    students = build_students(student_count, 12)
+    halls = [build_hall(400, number=n) for n in range(1, student_count // 400 + 2)]
+
+    timed("Student.bulk_create", lambda: database.Student.bulk_create(
+        [{key: value for key, value in s.items() if key != '_id'} for s in students]))
+    timed("Room.bulk_create", lambda: database.Room.bulk_create(
+        [{key: value for key, value in h.items() if key != '_id'} for h in halls]))
+    roster = timed("iter_for_allocation", lambda: list(database.Student.iter_for_allocation()))
+    rooms = [dict(room, _id=str(room['_id'])) for room in database.Room.get_all()]
+    result = timed("allocate (mixed)", lambda: AllocationService().allocate_seats(roster, rooms, 'mixed'))
+    allocation_id = timed("Allocation.create", lambda: database.Allocation.create(
+        'mixed', '', result['allocations'], result['summary']))
+    timed("Allocation.get_by_id", lambda: database.Allocation.get_by_id(allocation_id))
+    timed("Allocation.list_summaries", lambda: database.Allocation.list_summaries())
+    sample = random.Random(7).sample(roster, min(lookups, len(roster)))
+    timed(f"{len(sample)} seat lookups", lambda: [
+        database.Allocation.find_seat(allocation_id, s['roll_number']) for s in sample])
+
+    database.Allocation.delete_all()
+    database.Student.delete_all()
+    database.Room.delete_all()
+
+if __name__ == "__main__":
+    if '--storage' in sys.argv:
+        backends = sys.argv[sys.argv.index('--storage') + 1:] or ['embedded', 'mongo']
+        print("=" * 60)
+        print("STORAGE BENCHMARK SUITE")
+        print("=" * 60)
+        for backend in backends:
+            benchmark_storage(backend)
+        sys.exit(0)
+
+    print("=" * 60)
+    print("ALLOCATION BENCHMARK SUITE")
+    print("=" * 60)
+
+    hall_results = benchmark_large_hall()
+    benchmark_mixed_halls()
+    benchmark_multi_exam()
+
+    print("\n" + "=" * 60)
+    if all(ms < TARGET_MS for ms in hall_results.values()):
+        print(f"ALL STRATEGIES PLACE A 400-SEAT HALL UNDER {TARGET_MS} ms ✅")
+    else:
+        print(f"SOME STRATEGIES EXCEED {TARGET_MS} ms FOR A 400-SEAT HALL ❌")
+    print("=" * 60)
@@ -0,0 +1,108 @@
+import gc
+import io
+import csv
+import sys
+import time
+sys.path.append('backend')
+
+from utils.csv_utils import compile_row_parser, parse_csv_rows
+
+ROWS = 100_000
+EXTRA_COLUMNS = ['Sr No', 'Department', 'Section', 'Email', 'Phone', 'Gender', 'Category',
+                 'Admission Type', 'Fee Status', 'Hostel', 'Guardian', 'Address']
+
+def legacy_parse_student_row(row, row_num):
+    clean_row = {k.strip().lower(): v.strip() for k, v in row.items() if v.strip()}
+
+    if not clean_row:
+        return None
+
+    fields = {}
+    for field, keys in (('name', ['name', 'student_name', 'student name']),
+                        ('roll_number', ['roll_number', 'roll number', 'roll_no', 'rollno', 'id']),
+                        ('year', ['year', 'class', 'semester']),
+                        ('subjects', ['subjects', 'subject', 'courses', 'course'])):
+        for key in keys:
+            if key in clean_row:
+                fields[field] = clean_row[key]
+                break
+
+    year = None
+    year_str = fields.get('year', '')
+    if year_str.isdigit():
+        year = int(year_str)
+    elif 'year' in year_str.lower():
+        for char in year_str:
+            if char.isdigit():
+                year = int(char)
+                break
+
+    subjects = [s.strip() for s in fields.get('subjects', '').split(',') if s.strip()]
+
+    if not fields.get('name') or not fields.get('roll_number') or not year or not subjects:
+        raise ValueError(f"Row {row_num}: incomplete row")
+
+    return {'name': fields['name'], 'roll_number': fields['roll_number'], 'year': year, 'subjects': subjects}
+
+def build_students_csv(count, extra_columns=()):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['Student Name', 'Roll Number', 'Year', 'Subjects', *extra_columns])
+    for i in range(count):
+        extras = [f"{column} {i % 97}" for column in extra_columns]
+        writer.writerow([f"Student {i}", f"22CS{i:06d}", i % 4 + 1, f"SUB{i % 40:03d},SUB{(i + 7) % 40:03d}", *extras])
+    return out.getvalue()
+
+def best_of(func, repeat=5):
+    timings = []
+    result = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+    return min(timings), result
+
+def run_case(label, csv_content):
+    print(f"\n{label}: {ROWS:,} rows")
+
+    dict_rows = list(csv.DictReader(io.StringIO(csv_content)))
+    list_rows = list(csv.reader(io.StringIO(csv_content)))
+    parse_row = compile_row_parser(list_rows[0], 'students')
+
+    legacy_ms, legacy = best_of(lambda: [
+        (row_num, legacy_parse_student_row(row, row_num)) for row_num, row in enumerate(dict_rows, start=2)
+    ])
+    compiled_ms, compiled = best_of(lambda: [
+        (row_num, parse_row(values, row_num)) for row_num, values in enumerate(list_rows[1:], start=2)
+    ])
+    legacy_total_ms, _ = best_of(lambda: [
+        (row_num, legacy_parse_student_row(row, row_num))
+        for row_num, row in enumerate(csv.DictReader(io.StringIO(csv_content)), start=2)
+    ], repeat=3)
+    compiled_total_ms, _ = best_of(lambda: parse_csv_rows(csv_content, 'students'), repeat=3)
+
+    identical = legacy == compiled
+    print(f"  row parse stage:  per-row headers {legacy_ms:8.1f} ms | compiled {compiled_ms:8.1f} ms | "
+          f"{legacy_ms / compiled_ms:.1f}x")
+    print(f"  read + parse:     per-row headers {legacy_total_ms:8.1f} ms | compiled {compiled_total_ms:8.1f} ms | "
+          f"{legacy_total_ms / compiled_total_ms:.1f}x ({ROWS / compiled_total_ms * 1000:,.0f} rows/s)")
+    print(f"  {'✅' if identical else '❌'} identical output")
+    return identical
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("CSV PARSE BENCHMARK")
+    print("=" * 60)
+
+    results = [
+        run_case("Students, 4 columns", build_students_csv(ROWS)),
+        run_case(f"Students, {4 + len(EXTRA_COLUMNS)}-column registrar export", build_students_csv(ROWS, EXTRA_COLUMNS)),
+    ]
+
+    print("\n" + "=" * 60)
+    print("COMPILED PARSER MATCHES PER-ROW PARSING ✅" if all(results) else "COMPILED PARSER OUTPUT DIFFERS ❌")
+    print("=" * 60)
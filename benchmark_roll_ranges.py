@@ -0,0 +1,75 @@
+import sys
+import time
+import random
+sys.path.append('backend')
+
+from services.roll_range_service import RollRangeService
+
+STUDENTS = 4000
+HALL_CAPACITY = 60
+DEPARTMENTS = {'CSE': '104', 'ECE': '106', 'EEE': '105', 'MECH': '114', 'CE': '103', 'IT': '205',
+               'AI': '243', 'BME': '121', 'RA': '125', 'AT': '102', 'CS(CS)': '149', 'CS(AIML)': '148'}
+ABSENT_RATE = 0.04
+
+def build_rolls(seed=7):
+    rng = random.Random(seed)
+    per_department = STUDENTS // len(DEPARTMENTS)
+    rolls = []
+    for department, code in DEPARTMENTS.items():
+        number = seated = 0
+        while seated < per_department:
+            number += 1
+            if rng.random() >= ABSENT_RATE:
+                rolls.append((department, f"310623{code}{number:03d}"))
+                seated += 1
+    return rolls
+
+def seat_rows(rolls, shuffle=False):
+    ordered = list(rolls)
+    if shuffle:
+        random.Random(11).shuffle(ordered)
+    return [
+        {'room_name': str(1101 + index // HALL_CAPACITY), 'department': department, 'roll_number': roll_number}
+        for index, (department, roll_number) in enumerate(ordered)
+    ]
+
+def expand(report):
+    rolls = []
+    for hall in report['halls']:
+        for group in hall['groups']:
+            for entry in group['ranges']:
+                prefix, start, width = RollRangeService.split_roll(entry['from'])
+                _, end, _ = RollRangeService.split_roll(entry['to'])
+                gaps = set(entry['gaps'])
+                rolls.extend(
+                    (hall['hall'], group['group'], f"{prefix}{number:0{width}d}")
+                    for number in range(start, end + 1) if f"{prefix}{number:0{width}d}" not in gaps
+                )
+    return sorted(rolls)
+
+def run_case(label, rows):
+    started = time.perf_counter()
+    report = RollRangeService.hall_ranges(rows)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    expected = sorted((row['room_name'], row['department'], row['roll_number']) for row in rows)
+    matches = expand(report) == expected
+    print(f"\n{label}: {report['total_students']:,} students in {report['hall_count']} halls")
+    print(f"  {report['range_count']:,} notice lines in {elapsed_ms:.1f} ms")
+    print(f"  {'✅' if matches else '❌'} ranges expand back to the seat rows")
+    return matches
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("HALL ROLL-RANGE BENCHMARK")
+    print("=" * 60)
+
+    rolls = build_rolls()
+    results = [
+        run_case("Seated in roll order", seat_rows(rolls)),
+        run_case("Seated in random order", seat_rows(rolls, shuffle=True)),
+    ]
+
+    print("\n" + "=" * 60)
+    print("RANGES ROUND-TRIP ✅" if all(results) else "RANGES DO NOT ROUND-TRIP ❌")
+    print("=" * 60)
@@ -0,0 +1,3 @@
+import os
+
+os.environ['STORAGE_BACKEND'] = os.getenv('TEST_STORAGE_BACKEND', 'memory')
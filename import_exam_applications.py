@@ -0,0 +1,34 @@
+import sys
+import time
+sys.path.append('backend')
+
+from models.database import ensure_indexes
+from utils.xlsx_import import find_application_workbooks
+from services.import_service import ImportService
+
+args = sys.argv[1:]
+mode = 'insert' if '--insert' in args else 'upsert'
+workers = int(args[args.index('--workers') + 1]) if '--workers' in args else None
+folder = next((arg for arg in args if not arg.startswith('--') and not arg.isdigit()), 'real_data')
+
+paths = find_application_workbooks(folder)
+if not paths:
+    print(f"❌ No 'Exam Applications Preview*.xlsx' or '*SEM3*.xlsx' workbooks found in {folder}")
+    sys.exit(1)
+
+ensure_indexes()
+print(f"Importing {len(paths)} workbooks from {folder} ({mode} mode)...")
+started = time.perf_counter()
+totals, files, errors = ImportService.import_application_workbooks(paths, mode, workers)
+elapsed = time.perf_counter() - started
+
+for summary in files:
+    print(f"  • {summary['file']}: {summary['students']} students "
+          f"({summary.get('department') or '?'} sem {summary.get('semester') or '?'}, {summary['errors']} errors)")
+
+print(f"✅ {totals['created']} created, {totals['updated']} updated, {totals['unchanged']} unchanged "
+      f"in {elapsed:.2f}s")
+if errors:
+    print(f"⚠️  {len(errors)} rows skipped:")
+    for error in errors[:20]:
+        print(f"     {error}")
@@ -0,0 +1,41 @@
+import sys
+import time
+sys.path.append('backend')
+
+from models.database import ensure_indexes, Session
+from utils.timetable_import import find_timetable_workbooks
+from services.import_service import ImportService
+
+args = sys.argv[1:]
+sheets = [sheet.strip() for sheet in args[args.index('--sheets') + 1].split(',')] if '--sheets' in args else None
+positional = [arg for i, arg in enumerate(args) if not arg.startswith('--') and (i == 0 or args[i - 1] != '--sheets')]
+folder = positional[0] if positional else 'real_data'
+
+paths = find_timetable_workbooks(folder) if not folder.endswith('.xlsx') else [folder]
+if not paths:
+    print(f"❌ No '*TT*.xlsx' timetable workbooks found in {folder}")
+    sys.exit(1)
+
+ensure_indexes()
+print(f"Importing {len(paths)} timetables from {folder}...")
+started = time.perf_counter()
+totals, files, errors = ImportService.import_timetable_workbooks(paths, sheets)
+elapsed = time.perf_counter() - started
+
+for summary in files:
+    print(f"  • {summary['file']}: {summary['slots']} exam slots in {summary['sessions']} sessions "
+          f"({len(summary['sheets'])} sheets, {summary['skipped_rows']} rows without a date, "
+          f"{summary['superseded_slots']} slots superseded by later sheets)")
+    for change in summary['superseded'][:10]:
+        print(f"     {change['subject']}: {change['old_slot']} ({change['old_sheet']}) → "
+              f"{change['new_slot']} ({change['new_sheet']})")
+    if len(summary['superseded']) > 10:
+        print(f"     ... {len(summary['superseded']) - 10} more")
+
+print(f"✅ {totals['created']} sessions created, {totals['updated']} updated, {totals['unchanged']} unchanged, "
+      f"{totals['removed']} removed in {elapsed:.2f}s")
+print(f"   {len(Session.get_subject_index())} course codes mapped to sessions")
+if errors:
+    print(f"⚠️  {len(errors)} rows skipped:")
+    for error in errors[:20]:
+        print(f"     {error}")
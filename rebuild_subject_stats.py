@@ -0,0 +1,12 @@
+import sys
+sys.path.append('backend')
+
+from models.database import SubjectStats
+
+print("Rebuilding subject_stats from the students collection...")
+subject_count = SubjectStats.rebuild()
+print(f"✅ Rebuilt counts for {subject_count} subjects")
+
+for stat in SubjectStats.get_all():
+    years = ', '.join(f"Year {year}: {count}" for year, count in sorted(stat.get('by_year', {}).items()))
+    print(f"  • {stat['subject']}: {stat['count']} students ({years})")
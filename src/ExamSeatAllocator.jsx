@@ -128,11 +128,6 @@ const ExamSeatAllocator = () => {
       return;
     }
 
-    if (capacity > 50) {
-      showError('Room capacity cannot exceed 50 seats');
-      return;
-    }
-
     setLoading(true);
     try {
       await ApiClient.createRoom({
@@ -837,13 +832,12 @@ const ExamSeatAllocator = () => {
             />
             <input
               type="number"
-              placeholder="Room Capacity (Max: 50)"
+              placeholder="Room Capacity"
               value={currentRoom.capacity}
               onChange={(e) => setCurrentRoom({...currentRoom, capacity: e.target.value})}
               className="w-full p-3 border-2 border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500 focus:border-blue-500 text-gray-800"
               disabled={loading}
               min="1"
-              max="50"
             />
             <button
               onClick={addRoom}
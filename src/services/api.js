@@ -166,10 +166,21 @@ class ApiClient {
   }
 
 
-  async uploadStudentsCSV(csvContent) {
+  async uploadStudentsCSV(csvContent, mode = 'insert') {
     return this.request('/students/csv/upload', {
       method: 'POST',
-      body: JSON.stringify({ csv_content: csvContent }),
+      body: JSON.stringify({ csv_content: csvContent, mode }),
+    });
+  }
+
+  async uploadCSVFile(type, file, mode = 'insert') {
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('mode', mode);
+    return this.request(`/${type}/csv/upload`, {
+      method: 'POST',
+      headers: {},
+      body: formData,
     });
   }
 
@@ -201,8 +212,12 @@ class ApiClient {
   }
 
 
-  async getAllocations() {
-    return this.request('/allocations');
+  async getAllocations(limit = 20, cursor = null) {
+    const params = new URLSearchParams({ limit });
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+    return this.request(`/allocations?${params}`);
   }
 
   async createAllocation(strategy = 'mixed', subjectFilter = '') {
@@ -223,6 +238,10 @@ class ApiClient {
     return this.request('/allocations/latest');
   }
 
+  async findSeat(rollNumber, allocationId = 'latest') {
+    return this.request(`/allocations/${allocationId}/seat/${encodeURIComponent(rollNumber)}`);
+  }
+
   async generateReport(allocationId) {
     return this.request(`/allocations/${allocationId}/report`);
   }
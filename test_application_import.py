@@ -0,0 +1,86 @@
+import sys
+sys.path.append('backend')
+
+from openpyxl import Workbook
+from models.database import students_collection, subject_stats_collection
+from utils.xlsx_import import _resolve_header, parse_application_workbook
+from services.import_service import ImportService
+
+def write_workbook(path, rows):
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    return str(path)
+
+def application(path, department, semester, students):
+    return write_workbook(path, [
+        ['Exam Applications Preview'],
+        ['Academic Year', '2025-26'],
+        ['Dept  Id', department],
+        ['Term Number', semester],
+        [],
+        ['S.No', 'USN', 'Student Name', 'Section', 'Regular Courses', 'Arrear Courses'],
+        *students
+    ])
+
+def test_resolve_header_matches_aliases_and_needs_the_key_columns():
+    assert _resolve_header(['S.No', ' USN ', 'Name of the  Student', 'Courses', 'Arrears']) == {
+        'roll_number': 1, 'name': 2, 'regular': 3, 'arrear': 4
+    }
+    assert _resolve_header(['Reg. No', 'Name', 'Section', 'Subject Codes']) == {
+        'roll_number': 0, 'name': 1, 'section': 2, 'regular': 3
+    }
+    assert _resolve_header(['USN', 'Student Name', 'Section']) is None
+    assert _resolve_header(['Dept Id', 'CSE']) is None
+
+def test_metadata_rows_above_the_header_set_department_and_year(tmp_path):
+    path = application(tmp_path / 'CSE-SEM3.xlsx', 'CSE', 3, [
+        [1, '310623104001', 'Asha', 'A', '2311CSC301T, 2311MAB304T', '231GES201T'],
+        [2, 310623104002, 'Bala', 'A', '2311CSC301T', None],
+        [3, None, 'Chitra', 'A', '2311CSC301T', None],
+        [4, '310623104004', 'Dev', 'A', None, None],
+        [],
+    ])
+    result = parse_application_workbook(path)
+
+    assert result['metadata'] == {'academic_year': '2025-26', 'department': 'CSE', 'semester': '3'}
+    assert result['students'] == [
+        (7, {'name': 'Asha', 'roll_number': '310623104001', 'year': 2, 'semester': 3, 'department': 'CSE',
+             'subjects': ['2311CSC301T', '2311MAB304T', '231GES201T']}),
+        (8, {'name': 'Bala', 'roll_number': '310623104002', 'year': 2, 'semester': 3, 'department': 'CSE',
+             'subjects': ['2311CSC301T']}),
+    ]
+    assert result['errors'] == [(9, 'Missing register number'), (10, 'No registered courses')]
+
+def test_workbook_without_a_header_row_is_reported(tmp_path):
+    path = write_workbook(tmp_path / 'notes.xlsx', [['Term Number', 3], ['USN', 'Student Name']])
+    result = parse_application_workbook(path)
+    assert result['students'] == []
+    assert result['errors'] == [(0, 'No header row with register number, name and course columns in the first 40 rows')]
+
+def test_register_numbers_in_two_workbooks_are_reported_not_overwritten(tmp_path):
+    students_collection.delete_many({})
+    subject_stats_collection.delete_many({})
+    first = application(tmp_path / 'BME-SEM3.xlsx', 'BME', 3, [
+        [1, '310623121001', 'Asha', 'A', '2311BMC301T', None],
+        [2, '310623121002', 'Bala', 'A', '2311BMC301T', None],
+    ])
+    second = application(tmp_path / 'Exam Applications Preview ForBE - BME-SEM3.xlsx', 'BME', 3, [
+        [1, '310623121002', 'Bala', 'A', '2311BMC301T, AT', None],
+        [2, '310623121003', 'Chitra', 'A', '2311BMC301T', None],
+    ])
+
+    totals, files, errors = ImportService.import_application_workbooks([first, second], workers=1)
+
+    assert totals == {'created': 3, 'updated': 0, 'unchanged': 0}
+    assert [(summary['file'], summary['students'], summary['errors']) for summary in files] == [
+        ('BME-SEM3.xlsx', 2, 0), ('Exam Applications Preview ForBE - BME-SEM3.xlsx', 1, 1)
+    ]
+    assert errors == [
+        "Exam Applications Preview ForBE - BME-SEM3.xlsx: Row 7: "
+        "Duplicate roll_number '310623121002' (also in BME-SEM3.xlsx row 8)"
+    ]
+    assert students_collection.find_one({'roll_number': '310623121002'}, {'_id': 0, 'subjects': 1}) == {
+        'subjects': ['2311BMC301T']
+    }
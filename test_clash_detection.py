@@ -0,0 +1,52 @@
+import sys
+sys.path.append('backend')
+
+from services.clash_service import ClashService
+
+SESSIONS = [
+    {'session_key': '2025-11-18-FN', 'date': '2025-11-18', 'session': 'FN', 'subjects': ['MA101', 'PH101']},
+    {'session_key': '2025-11-18-AN', 'date': '2025-11-18', 'session': 'AN', 'subjects': ['CS101']},
+    {'session_key': '2025-11-19-FN', 'date': '2025-11-19', 'session': 'FN', 'subjects': ['EC101', 'MA101']},
+]
+
+def test_two_papers_in_one_session_is_a_clash():
+    students = [{'roll_number': 'CS001', 'name': 'Asha', 'department': 'CSE', 'subjects': ['PH101', 'MA101']}]
+    report = ClashService.detect(students, SESSIONS)
+
+    assert (report['students_checked'], report['registrations']) == (1, 3)
+    assert (report['clash_count'], report['clashing_students']) == (1, 1)
+    assert report['by_session'] == {'2025-11-18-FN': 1}
+    assert report['clashes'] == [{
+        'roll_number': 'CS001', 'name': 'Asha', 'department': 'CSE', 'session': '2025-11-18-FN',
+        'date': '2025-11-18', 'session_name': 'FN', 'subjects': ['MA101', 'PH101']
+    }]
+
+def test_papers_in_different_sessions_are_not_flagged():
+    students = [
+        {'roll_number': 'CS002', 'subjects': ['PH101', 'CS101']},
+        {'roll_number': 'CS003', 'subjects': ['CS101', 'EC101']},
+        {'roll_number': 'CS004', 'subjects': ['MA101']},
+        {'roll_number': 'CS005', 'subjects': ['EC101', 'EC101']},
+        {'roll_number': 'CS006', 'subject': 'PH101'},
+        {'roll_number': 'CS007', 'subjects': ['XX999']},
+    ]
+    report = ClashService.detect(students, SESSIONS)
+
+    assert report['registrations'] == 9
+    assert (report['clash_count'], report['clashing_students']) == (0, 0)
+    assert report['by_session'] == {} and report['clashes'] == []
+
+def test_every_clashing_session_is_counted_but_the_list_is_limited():
+    students = [
+        {'roll_number': 'IT001', 'subjects': ['MA101', 'PH101', 'EC101']},
+        {'roll_number': 'IT002', 'subjects': ['EC101', 'MA101']},
+        {'roll_number': 'IT003', 'subjects': ['CS101']},
+    ]
+    report = ClashService.detect(students, SESSIONS, limit=1)
+
+    assert report['by_session'] == {'2025-11-18-FN': 1, '2025-11-19-FN': 2}
+    assert (report['clash_count'], report['clashing_students']) == (3, 2)
+    assert report['clashes'] == [{
+        'roll_number': 'IT001', 'name': None, 'department': None, 'session': '2025-11-18-FN',
+        'date': '2025-11-18', 'session_name': 'FN', 'subjects': ['MA101', 'PH101']
+    }]
@@ -0,0 +1,57 @@
+import sys
+sys.path.append('backend')
+
+from models.storage import open_storage
+from models.database import CollectionCache
+
+class CountingCollection:
+    def __init__(self, collection):
+        self.collection = collection
+        self.reads = 0
+
+    def find(self, *args, **kwargs):
+        self.reads += 1
+        return self.collection.find(*args, **kwargs)
+
+    def update_one(self, *args, **kwargs):
+        return self.collection.update_one(*args, **kwargs)
+
+def workers(poll_interval):
+    versions = CountingCollection(open_storage('memory').collection('cache_versions'))
+    return versions, CollectionCache(versions, poll_interval=poll_interval), CollectionCache(versions, poll_interval=poll_interval)
+
+def test_hits_are_served_from_memory_between_polls():
+    versions, cache, _ = workers(poll_interval=60)
+    loads = []
+    loader = lambda: loads.append(1) or [{'name': 'Hall A'}]
+
+    for _ in range(5):
+        assert cache.get('rooms', 'all', loader) == [{'name': 'Hall A'}]
+    assert (len(loads), versions.reads) == (1, 1)
+    assert (cache.stats()['hits'], cache.stats()['misses'], cache.stats()['polls']) == (4, 1, 1)
+
+def test_local_bump_invalidates_at_once_and_other_workers_on_the_next_poll():
+    versions, writer, reader = workers(poll_interval=0)
+    rooms = [{'name': 'Hall A'}]
+    assert reader.get('rooms', 'all', lambda: list(rooms)) == [{'name': 'Hall A'}]
+    assert writer.get('rooms', 'all', lambda: list(rooms)) == [{'name': 'Hall A'}]
+
+    rooms.append({'name': 'Hall B'})
+    writer.bump('rooms')
+    assert len(writer.get('rooms', 'all', lambda: list(rooms))) == 2
+    assert len(reader.get('rooms', 'all', lambda: list(rooms))) == 2
+
+    reader.poll_interval = 60
+    writer.bump('rooms')
+    rooms.append({'name': 'Hall C'})
+    assert len(reader.get('rooms', 'all', lambda: list(rooms))) == 2
+    assert reader.stats()['versions'] == {'rooms': 1}
+
+def test_callers_get_copies_of_cached_entries():
+    _, cache, _ = workers(poll_interval=60)
+    first = cache.get('students', 'all', lambda: [{'roll_number': 'CS001', 'subjects': ['CS101']}])
+    first[0]['subjects'].append('MA101')
+    first[0]['_id'] = 'changed'
+    first.append({})
+
+    assert cache.get('students', 'all', lambda: []) == [{'roll_number': 'CS001', 'subjects': ['CS101']}]
@@ -0,0 +1,233 @@
+import csv
+import io
+import sys
+sys.path.append('backend')
+
+import pytest
+from utils.csv_utils import compile_row_parser, parse_csv_rows, import_csv_stream
+from utils.room_layout import normalize_layout_fields, validate_capacity
+
+def legacy_student_row(row, row_num):
+    clean_row = {k.strip().lower(): v.strip() for k, v in row.items() if v.strip()}
+    if not clean_row:
+        return None
+
+    fields = {}
+    for field, keys in (('name', ['name', 'student_name', 'student name']),
+                        ('roll_number', ['roll_number', 'roll number', 'roll_no', 'rollno', 'id']),
+                        ('year', ['year', 'class', 'semester']),
+                        ('subjects', ['subjects', 'subject', 'courses', 'course'])):
+        for key in keys:
+            if key in clean_row:
+                fields[field] = clean_row[key]
+                break
+
+    year = None
+    year_str = fields.get('year', '')
+    if year_str.isdigit():
+        year = int(year_str)
+    elif 'year' in year_str.lower():
+        for char in year_str:
+            if char.isdigit():
+                year = int(char)
+                break
+    subjects = [s.strip() for s in fields.get('subjects', '').split(',') if s.strip()]
+
+    if not fields.get('name'):
+        raise ValueError(f"Row {row_num}: Missing student name")
+    if not fields.get('roll_number'):
+        raise ValueError(f"Row {row_num}: Missing roll number")
+    if not year:
+        raise ValueError(f"Row {row_num}: Missing or invalid year")
+    if not subjects:
+        raise ValueError(f"Row {row_num}: Missing subjects")
+    return {'name': fields['name'], 'roll_number': fields['roll_number'], 'year': year, 'subjects': subjects}
+
+def legacy_room_row(row, row_num):
+    clean_row = {k.strip().lower(): v.strip() for k, v in row.items() if v.strip()}
+    if not clean_row:
+        return None
+
+    name = next((clean_row[key] for key in ['name', 'room_name', 'room name', 'room'] if key in clean_row), None)
+    capacity = None
+    for key in ['capacity', 'seats', 'size', 'max_capacity']:
+        if key in clean_row:
+            try:
+                capacity = int(clean_row[key])
+            except ValueError:
+                raise ValueError(f"Row {row_num}: Invalid capacity '{clean_row[key]}' - must be a number")
+            break
+
+    if not name:
+        raise ValueError(f"Row {row_num}: Missing room name")
+    if capacity is None:
+        raise ValueError(f"Row {row_num}: Missing capacity")
+    if capacity <= 0:
+        raise ValueError(f"Row {row_num}: Capacity must be greater than 0")
+
+    layout_fields = {}
+    for field, keys in (('benches_per_row', ['benches_per_row', 'benches per row', 'benches']),
+                        ('seats_per_bench', ['seats_per_bench', 'seats per bench', 'bench_size']),
+                        ('aisles', ['aisles', 'aisle_positions', 'aisle positions'])):
+        for key in keys:
+            if key in clean_row:
+                layout_fields[field] = clean_row[key]
+                break
+
+    try:
+        layout = normalize_layout_fields(layout_fields)
+        validate_capacity(capacity, layout.get('benches_per_row'), layout.get('seats_per_bench'))
+    except ValueError as e:
+        raise ValueError(f"Row {row_num}: {str(e)}")
+    return {'name': name, 'capacity': capacity, **layout}
+
+def legacy_subject_row(row, row_num):
+    clean_row = {k.strip().lower(): v.strip() for k, v in row.items() if v.strip()}
+    if not clean_row:
+        return None
+    keys = ['name', 'subject_name', 'subject name', 'subject', 'code', 'subject_code']
+    name = next((clean_row[key] for key in keys if key in clean_row), None)
+    if not name:
+        raise ValueError(f"Row {row_num}: Missing subject name")
+    return {'name': name}
+
+LEGACY = {'students': legacy_student_row, 'rooms': legacy_room_row, 'subjects': legacy_subject_row}
+
+def outcome(parse, row, row_num):
+    try:
+        return parse(row, row_num)
+    except ValueError as e:
+        return f"error: {e}"
+
+def legacy_results(csv_content, file_type):
+    reader = csv.DictReader(io.StringIO(csv_content), restval='')
+    return [(row_num, outcome(LEGACY[file_type], row, row_num)) for row_num, row in enumerate(reader, start=2)]
+
+def compiled_results(csv_content, file_type):
+    reader = csv.reader(io.StringIO(csv_content))
+    parse = compile_row_parser(next(reader), file_type)
+    results = []
+    row_num = 1
+    for values in reader:
+        if values:
+            row_num += 1
+            results.append((row_num, outcome(parse, values, row_num)))
+    return results
+
+def assert_same(csv_content, file_type):
+    compiled = compiled_results(csv_content, file_type)
+    assert compiled == legacy_results(csv_content, file_type)
+    return compiled
+
+def test_fallback_alias_used_when_primary_column_is_blank():
+    results = assert_same(
+        "name,student_name,roll_number,rollno,year,class,subjects,courses\n"
+        "Asha,,CS001,,2,,CS101,\n"
+        ",Bala,,CS002,,3,,\"IT201, MA101\"\n"
+        ",,CS003,,2,,CS101,\n",
+        'students'
+    )
+    assert results == [
+        (2, {'name': 'Asha', 'roll_number': 'CS001', 'year': 2, 'subjects': ['CS101']}),
+        (3, {'name': 'Bala', 'roll_number': 'CS002', 'year': 3, 'subjects': ['IT201', 'MA101']}),
+        (4, 'error: Row 4: Missing student name'),
+    ]
+
+def test_header_aliases_are_trimmed_and_case_insensitive():
+    assert_same(
+        " Student Name ,ROLL NO,Class,Course,Email\n"
+        "Chitra,IT001,Year 2,\" CS101 , ,MA101 \",chitra@example.com\n"
+        "Dev,IT002,II year,CS101,\n",
+        'students'
+    )
+
+def test_rows_shorter_than_the_header():
+    results = assert_same(
+        "name,roll_number,year,subjects,department\n"
+        "Asha,CS001,2,CS101\n"
+        "Bala,CS002,2\n"
+        "Chitra\n",
+        'students'
+    )
+    assert [result for _, result in results] == [
+        {'name': 'Asha', 'roll_number': 'CS001', 'year': 2, 'subjects': ['CS101']},
+        'error: Row 3: Missing subjects',
+        'error: Row 4: Missing roll number',
+    ]
+
+def test_blank_rows_are_skipped_without_shifting_row_numbers():
+    content = "name,roll_number,year,subjects\nAsha,CS001,2,CS101\n\n,,,\n  , ,,\nBala,,2,CS101\n"
+    results = assert_same(content, 'students')
+    assert results == [
+        (2, {'name': 'Asha', 'roll_number': 'CS001', 'year': 2, 'subjects': ['CS101']}),
+        (3, None),
+        (4, None),
+        (5, 'error: Row 5: Missing roll number'),
+    ]
+    assert parse_csv_rows("name,roll_number,year,subjects\nAsha,CS001,2,CS101\n\n,,,\n", 'students') == [
+        (2, {'name': 'Asha', 'roll_number': 'CS001', 'year': 2, 'subjects': ['CS101']})
+    ]
+
+def test_student_error_messages():
+    results = assert_same(
+        "name,roll_number,year,subjects\n"
+        ",CS001,2,CS101\n"
+        "Asha,,2,CS101\n"
+        "Asha,CS001,0,CS101\n"
+        "Asha,CS001,first,CS101\n"
+        "Asha,CS001,2,\" , \"\n",
+        'students'
+    )
+    assert [result for _, result in results] == [
+        'error: Row 2: Missing student name',
+        'error: Row 3: Missing roll number',
+        'error: Row 4: Missing or invalid year',
+        'error: Row 5: Missing or invalid year',
+        'error: Row 6: Missing subjects',
+    ]
+
+    with pytest.raises(ValueError) as error:
+        parse_csv_rows("name,roll_number,year,subjects\nAsha,CS001,2,CS101\nBala,,2,CS101\n", 'students')
+    assert str(error.value) == 'Error parsing CSV: Row 3: Missing roll number'
+
+def test_streaming_import_reports_errors_without_the_row_prefix():
+    written = []
+    report = import_csv_stream(
+        io.StringIO("name,roll_number,year,subjects\nAsha,CS001,2,CS101\nBala,,2,CS101\n\nChitra,CS003,x,CS101\n"),
+        'students', lambda rows, row_numbers: (written.extend(row_numbers) or len(rows), [])
+    )
+    assert written == [2]
+    assert report['errors'] == [(3, 'Missing roll number'), (4, 'Missing or invalid year')]
+    assert (report['total_rows'], report['invalid_rows']) == (3, 2)
+
+def test_rooms_match_including_invalid_layouts():
+    results = assert_same(
+        "room,seats,benches,bench_size,aisles\n"
+        "Hall A,40,4,2,2\n"
+        "Hall B,36,4,3,\n"
+        "Hall C,30,0,2,\n"
+        "Hall D,30,4,9,\n"
+        "Hall E,500,4,2,\n"
+        "Hall F,30,four,2,\n"
+        "Hall G,30,4,2,7\n"
+        "Hall H,ten,4,2,\n"
+        "Hall I,0,4,2,\n"
+        ",30,4,2,\n"
+        "Hall K,,4,2,\n",
+        'rooms'
+    )
+    outcomes = [result for _, result in results]
+    assert outcomes[0] == {'name': 'Hall A', 'capacity': 40, 'benches_per_row': 4, 'seats_per_bench': 2, 'aisles': [2]}
+    assert all(isinstance(result, str) and result.startswith(f"error: Row {row_num}: ")
+               for row_num, result in results[2:])
+    assert outcomes[7:] == [
+        "error: Row 9: Invalid capacity 'ten' - must be a number",
+        'error: Row 10: Capacity must be greater than 0',
+        'error: Row 11: Missing room name',
+        'error: Row 12: Missing capacity',
+    ]
+
+def test_subjects_fall_back_to_code_column():
+    assert assert_same("subject_name,code\nMathematics,MA101\n,PH101\n,\n", 'subjects') == [
+        (2, {'name': 'Mathematics'}), (3, {'name': 'PH101'}), (4, None)
+    ]
@@ -0,0 +1,86 @@
+import sys
+sys.path.append('backend')
+
+import pytest
+
+from models.database import (
+    storage, ensure_indexes, students_collection, subjects_collection, allocations_collection,
+    seat_assignments_collection
+)
+from bson import ObjectId
+
+def plan_stages(plan):
+    stages = [plan.get('stage')]
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            stages.extend(plan_stages(plan[key]))
+    for child in plan.get('inputStages', []):
+        stages.extend(plan_stages(child))
+    return stages
+
+def check(label, cursor):
+    winning_plan = cursor.explain()['queryPlanner']['winningPlan']
+    stages = plan_stages(winning_plan)
+    index_backed = 'IXSCAN' in stages and 'COLLSCAN' not in stages
+    sorted_in_memory = 'SORT' in stages
+    ok = index_backed and not sorted_in_memory
+    print(f"{'✅' if ok else '❌'} {label}: {' -> '.join(s for s in stages if s)}")
+    return ok
+
+def mongo_unavailable():
+    if storage.name != 'mongo':
+        return f"STORAGE_BACKEND is '{storage.name}', explain-plan checks only apply to MongoDB"
+    try:
+        storage.ping()
+    except Exception as e:
+        return f"MongoDB not reachable: {e}"
+    return None
+
+def run_checks():
+    created, failed = ensure_indexes()
+    print("Indexes:", ', '.join(created))
+    for index_name, error in failed.items():
+        print(f"❌ {index_name}: {error}")
+
+    results = [
+        check("student by roll_number", students_collection.find({'roll_number': 'CS001'})),
+        check("Student.get_by_subject", students_collection.find({
+            '$or': [{'subject': 'CS101'}, {'subjects': 'CS101'}]
+        })),
+        check("Student.get_by_subjects", students_collection.find({
+            '$or': [{'subject': {'$in': ['CS101', 'IT201']}}, {'subjects': {'$in': ['CS101', 'IT201']}}]
+        })),
+        check("subject by name", subjects_collection.find({'name': 'CS101'})),
+        check("Allocation.get_latest", allocations_collection.find({}).sort('created_at', -1).limit(1)),
+        check("Allocation.list_summaries", allocations_collection.find(
+            {}, {'strategy': 1, 'subject_filter': 1, 'allocation_summary': 1, 'created_at': 1}
+        ).sort([('created_at', -1), ('_id', -1)]).limit(21)),
+        check("SeatAssignment.get_by_allocation", seat_assignments_collection.find(
+            {'allocation_id': ObjectId()}
+        ).sort([('room_id', 1), ('seat', 1)])),
+        check("SeatAssignment.get_by_room", seat_assignments_collection.find(
+            {'allocation_id': ObjectId(), 'room_id': 'room-1'}
+        ).sort('seat', 1)),
+        check("SeatAssignment.get_by_roll_number", seat_assignments_collection.find(
+            {'allocation_id': ObjectId(), 'roll_number': 'CS001'}
+        )),
+    ]
+    return not failed and all(results)
+
+def test_common_queries_are_index_backed():
+    reason = mongo_unavailable()
+    if reason:
+        pytest.skip(reason)
+    assert run_checks()
+
+if __name__ == "__main__":
+    reason = mongo_unavailable()
+    if reason:
+        print(f"⚠️  {reason}, skipping index checks")
+        sys.exit(0)
+
+    if not run_checks():
+        print("\n❌ Some queries are not index-backed")
+        sys.exit(1)
+
+    print("\n✅ All common queries are index-backed")
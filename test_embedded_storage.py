@@ -0,0 +1,209 @@
+import sys
+sys.path.append('backend')
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from models.storage import open_storage, EmbeddedStorage, UpdateOne
+
+PEOPLE = [
+    {'_id': 1, 'name': 'Asha', 'year': 2, 'tags': ['cs', 'math'], 'room': {'name': 'A1', 'floor': 1}},
+    {'_id': 2, 'name': 'Bala', 'year': 3, 'tags': ['it'], 'room': {'name': 'B2', 'floor': 2}},
+    {'_id': 3, 'name': 'Chitra', 'year': 2, 'tags': [], 'nickname': None},
+    {'_id': 4, 'name': 'Dev', 'year': 1, 'tags': ['cs'], 'rooms': [{'name': 'A1', 'seats': 30}, {'name': 'C3', 'seats': 40}]},
+]
+
+def people():
+    collection = open_storage('memory').collection('people')
+    collection.insert_many([dict(person) for person in PEOPLE])
+    return collection
+
+def ids(cursor):
+    return [doc['_id'] for doc in cursor]
+
+def test_equality_dotted_and_array_matching():
+    collection = people()
+    assert ids(collection.find({'year': 2})) == [1, 3]
+    assert ids(collection.find({'room.floor': 2})) == [2]
+    assert ids(collection.find({'tags': 'cs'})) == [1, 4]
+    assert ids(collection.find({'tags': ['it']})) == [2]
+    assert ids(collection.find({'rooms.name': 'C3'})) == [4]
+    assert ids(collection.find({'nickname': None})) == [1, 2, 3, 4]
+    assert ids(collection.find({'year': 2, 'tags': 'math'})) == [1]
+
+def test_query_operators():
+    collection = people()
+    assert ids(collection.find({'year': {'$in': [1, 3]}})) == [2, 4]
+    assert ids(collection.find({'tags': {'$in': ['math', 'it']}})) == [1, 2]
+    assert ids(collection.find({'tags': {'$nin': ['cs']}})) == [2, 3]
+    assert ids(collection.find({'tags': {'$ne': 'cs'}})) == [2, 3]
+    assert ids(collection.find({'room': {'$exists': True}})) == [1, 2]
+    assert ids(collection.find({'room': {'$exists': False}})) == [3, 4]
+    assert ids(collection.find({'year': {'$gte': 2, '$lt': 3}})) == [1, 3]
+    assert ids(collection.find({'rooms.seats': {'$gt': 35}})) == [4]
+    assert ids(collection.find({'name': {'$gt': 5}})) == []
+    assert ids(collection.find({'$or': [{'year': 3}, {'tags': 'math'}]})) == [1, 2]
+    assert ids(collection.find({'$and': [{'year': {'$lte': 2}}, {'tags': 'cs'}]})) == [1, 4]
+    with pytest.raises(ValueError):
+        list(collection.find({'year': {'$regex': '2'}}))
+
+def test_projection():
+    collection = people()
+    assert collection.find_one({'_id': 1}, {'name': 1}) == {'_id': 1, 'name': 'Asha'}
+    assert collection.find_one({'_id': 1}, {'_id': 0, 'room.name': 1}) == {'room': {'name': 'A1'}}
+    assert collection.find_one({'_id': 4}, {'_id': 0, 'rooms.name': 1}) == {'rooms': [{'name': 'A1'}, {'name': 'C3'}]}
+    assert collection.find_one({'_id': 2}, {'tags': 0, 'room': 0}) == {'_id': 2, 'name': 'Bala', 'year': 3}
+    assert collection.find_one({'_id': 3}, {'missing': 1}) == {'_id': 3}
+
+    projected = collection.find_one({'_id': 1})
+    projected['tags'].append('changed')
+    assert collection.find_one({'_id': 1})['tags'] == ['cs', 'math']
+
+def test_sort_limit_and_find_one():
+    collection = people()
+    assert ids(collection.find({}).sort('year', -1)) == [2, 1, 3, 4]
+    assert ids(collection.find({}).sort([('year', 1), ('_id', -1)])) == [4, 3, 1, 2]
+    assert ids(collection.find({}).sort('room.floor', 1)) == [3, 4, 1, 2]
+    assert ids(collection.find({}).sort('_id', -1).limit(2)) == [4, 3]
+    assert collection.find_one({'year': 2}, {'_id': 1}, sort=[('_id', -1)]) == {'_id': 3}
+    assert collection.find_one({'year': 9}) is None
+
+def test_update_operators():
+    collection = people()
+    result = collection.update_one({'_id': 1}, {
+        '$set': {'room.floor': 4, 'stats.count': 1},
+        '$inc': {'year': 1, 'visits': 2},
+        '$unset': {'tags': ''},
+        '$setOnInsert': {'created': True}
+    })
+    assert (result.matched_count, result.modified_count, result.upserted_id) == (1, 1, None)
+    assert collection.find_one({'_id': 1}) == {
+        '_id': 1, 'name': 'Asha', 'year': 3, 'room': {'name': 'A1', 'floor': 4},
+        'stats': {'count': 1}, 'visits': 2
+    }
+
+    unchanged = collection.update_one({'_id': 2}, {'$set': {'year': 3}})
+    assert (unchanged.matched_count, unchanged.modified_count) == (1, 0)
+
+    missing = collection.update_one({'_id': 99}, {'$set': {'year': 1}})
+    assert (missing.matched_count, missing.modified_count, missing.upserted_id) == (0, 0, None)
+    assert collection.find_one({'_id': 99}) is None
+
+    with pytest.raises(ValueError):
+        collection.update_one({'_id': 2}, {'$push': {'tags': 'x'}})
+
+def test_upsert_seeds_from_equality_fields():
+    collection = people()
+    result = collection.update_one(
+        {'name': 'Esha', 'year': {'$gte': 1}},
+        {'$set': {'tags': ['ece']}, '$setOnInsert': {'created': True}, '$inc': {'visits': 1}},
+        upsert=True
+    )
+    assert result.matched_count == 0 and result.upserted_id is not None
+    doc = collection.find_one({'_id': result.upserted_id}, {'_id': 0})
+    assert doc == {'name': 'Esha', 'tags': ['ece'], 'created': True, 'visits': 1}
+
+    again = collection.update_one({'name': 'Esha'}, {'$setOnInsert': {'created': False}, '$inc': {'visits': 1}}, upsert=True)
+    assert (again.matched_count, again.upserted_id) == (1, None)
+    assert collection.find_one({'name': 'Esha'}, {'_id': 0, 'created': 1, 'visits': 1}) == {'created': True, 'visits': 2}
+
+def test_unique_indexes():
+    collection = people()
+    collection.create_index([('name', 1)], unique=True, name='name_unique')
+    collection.create_index([('year', 1)], name='year_1')
+
+    with pytest.raises(DuplicateKeyError) as error:
+        collection.insert_one({'name': 'Asha'})
+    assert error.value.code == 11000
+    assert error.value.details['keyValue'] == {'name': 'Asha'}
+
+    with pytest.raises(DuplicateKeyError):
+        collection.update_one({'_id': 2}, {'$set': {'name': 'Asha'}})
+    assert collection.find_one({'_id': 2}, {'name': 1}) == {'_id': 2, 'name': 'Bala'}
+
+    collection.update_one({'_id': 2}, {'$set': {'name': 'Balan', 'year': 1}})
+    collection.insert_one({'name': 'Bala', 'year': 1})
+    assert ids(collection.find({'year': 1}))[:2] == [2, 4]
+    assert ids(collection.find({'year': {'$in': [3]}})) == []
+
+    with pytest.raises(DuplicateKeyError):
+        collection.create_index([('year', 1)], unique=True, name='year_unique')
+    collection.insert_one({'name': 'Farah', 'year': 2})
+
+def test_insert_many_ordered_and_unordered():
+    collection = open_storage('memory').collection('people')
+    collection.insert_one({'_id': 2})
+
+    with pytest.raises(BulkWriteError) as error:
+        collection.insert_many([{'_id': 1}, {'_id': 2}, {'_id': 3}], ordered=True)
+    assert error.value.details['nInserted'] == 1
+    assert [e['index'] for e in error.value.details['writeErrors']] == [1]
+    assert ids(collection.find({})) == [2, 1]
+
+    with pytest.raises(BulkWriteError) as error:
+        collection.insert_many([{'_id': 4}, {'_id': 2}, {'_id': 5}, {'_id': 1}], ordered=False)
+    assert error.value.details['nInserted'] == 2
+    assert [e['index'] for e in error.value.details['writeErrors']] == [1, 3]
+    assert sorted(ids(collection.find({}))) == [1, 2, 4, 5]
+
+def test_bulk_write_counts_and_write_errors():
+    collection = people()
+    collection.create_index([('name', 1)], unique=True, name='name_unique')
+
+    result = collection.bulk_write([
+        UpdateOne({'_id': 1}, {'$inc': {'year': 1}}),
+        UpdateOne({'_id': 2}, {'$set': {'year': 3}}),
+        UpdateOne({'name': 'Gita'}, {'$set': {'year': 1}}, upsert=True)
+    ])
+    assert (result.matched_count, result.modified_count, result.upserted_count) == (2, 1, 1)
+    assert list(result.upserted_ids) == [2]
+
+    requests = [
+        UpdateOne({'_id': 1}, {'$set': {'name': 'Bala'}}),
+        UpdateOne({'_id': 2}, {'$set': {'year': 9}}),
+        UpdateOne({'name': 'Hari'}, {'$set': {'name': 'Dev'}}, upsert=True),
+        UpdateOne({'_id': 3}, {'$set': {'year': 9}})
+    ]
+    with pytest.raises(BulkWriteError) as error:
+        collection.bulk_write(requests, ordered=False)
+    details = error.value.details
+    assert [e['index'] for e in details['writeErrors']] == [0, 2]
+    assert all(e['code'] == 11000 for e in details['writeErrors'])
+    assert (details['nMatched'], details['nModified']) == (2, 2)
+    assert ids(collection.find({'year': 9})) == [2, 3]
+
+    with pytest.raises(BulkWriteError) as error:
+        collection.bulk_write([UpdateOne({'_id': 4}, {'$set': {'year': 8}}), *requests], ordered=True)
+    assert [e['index'] for e in error.value.details['writeErrors']] == [1]
+    assert ids(collection.find({'year': 8})) == [4]
+    assert collection.find_one({'name': 'Hari'}) is None
+
+def test_delete():
+    collection = people()
+    assert collection.delete_one({'year': 2}).deleted_count == 1
+    assert ids(collection.find({'year': 2})) == [3]
+    assert collection.delete_many({'tags': 'cs'}).deleted_count == 1
+    assert collection.delete_many({}).deleted_count == 2
+    assert ids(collection.find({})) == []
+
+def test_failed_transaction_rolls_back_memory_and_disk(tmp_path):
+    path = str(tmp_path / 'store.db')
+    storage = EmbeddedStorage(path)
+    collection = storage.collection('people')
+    collection.create_index([('name', 1)], unique=True, name='name_unique')
+    collection.insert_many([dict(person) for person in PEOPLE])
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction() as db:
+            collection._update_in(db, {'_id': 1}, {'$set': {'name': 'Zara', 'year': 7}})
+            collection._update_in(db, {'name': 'New'}, {'$set': {'year': 7}}, upsert=True)
+            collection._store({'_id': 5, 'name': 'Isha'})
+            raise RuntimeError('write failed')
+
+    assert collection.find_one({'_id': 1}, {'name': 1, 'year': 1}) == {'_id': 1, 'name': 'Asha', 'year': 2}
+    assert ids(collection.find({'year': 7})) == []
+    assert ids(collection.find({'name': 'Asha'})) == [1]
+    assert collection.find_one({'name': 'Zara'}) is None
+    collection.insert_one({'_id': 5, 'name': 'Zara'})
+
+    reopened = EmbeddedStorage(path).collection('people')
+    assert list(reopened.find({}).sort('_id', 1)) == list(collection.find({}).sort('_id', 1))
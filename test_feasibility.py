@@ -0,0 +1,77 @@
+import sys
+sys.path.append('backend')
+
+from collections import Counter
+from app import create_app
+from models.database import (Student, Room, SubjectStats, students_collection, rooms_collection,
+                             sessions_collection, subject_stats_collection)
+from services.feasibility_service import FeasibilityService
+
+STUDENTS = [
+    ('Asha', 'CS001', 2, ['CS101', 'MA101']),
+    ('Bala', 'CS002', 2, ['CS101']),
+    ('Chitra', 'CS003', 2, ['MA101', 'CS101']),
+    ('Dev', 'IT001', 3, ['IT201', 'MA101']),
+    ('Esha', 'IT002', 3, ['IT201']),
+    ('Farah', 'IT003', 3, ['PH101']),
+]
+
+def setup_data():
+    for collection in (students_collection, rooms_collection, sessions_collection, subject_stats_collection):
+        collection.delete_many({})
+    for name, roll_number, year, subjects in STUDENTS:
+        Student.create(name, roll_number, year, subjects)
+    Room.create('1101', 4, 2, 2)
+    Room.create('1102', 6, 3, 2)
+    sessions_collection.insert_one({'session_key': '2025-11-18-FN', 'date': '2025-11-18', 'session': 'FN',
+                                    'subjects': ['CS101', 'MA101']})
+    return create_app().test_client()
+
+def roster_counts(students):
+    subject_counts = Counter(subject for *_, subjects in students for subject in set(subjects))
+    primary_counts = Counter(subjects[0] for *_, subjects in students)
+    return subject_counts, primary_counts
+
+def test_subject_stats_track_primary_subjects_through_updates():
+    setup_data()
+    assert SubjectStats.get_counts(field='primary') == {'CS101': 2, 'MA101': 1, 'IT201': 2, 'PH101': 1}
+
+    student = students_collection.find_one({'roll_number': 'CS003'})
+    Student.update(str(student['_id']), subjects=['CS101', 'MA101'])
+    Student.delete(str(students_collection.find_one({'roll_number': 'IT003'})['_id']))
+    assert SubjectStats.get_counts(field='primary') == {'CS101': 3, 'MA101': 0, 'IT201': 2}
+    assert SubjectStats.get_counts(['CS101', 'MA101']) == {'CS101': 3, 'MA101': 3}
+
+    for stat in subject_stats_collection.find({}, {'_id': 1}):
+        subject_stats_collection.update_one({'_id': stat['_id']}, {'$unset': {'primary': ''}})
+    SubjectStats.ensure_built()
+    assert SubjectStats.get_counts(field='primary') == {'CS101': 3, 'MA101': 0, 'IT201': 2}
+
+def test_report_matches_the_roster_without_loading_it():
+    client = setup_data()
+    report = client.post('/api/allocations/feasibility', json={}).get_json()
+
+    subject_counts, primary_counts = roster_counts(STUDENTS)
+    expected = FeasibilityService().analyze(subject_counts, primary_counts, Room.get_all())
+    assert report == expected
+    assert (report['total_students'], report['subject_count']) == (6, 4)
+
+def test_session_report_counts_only_the_session_papers():
+    client = setup_data()
+    report = client.post('/api/allocations/feasibility', json={'session': '2025-11-18-FN', 'strategy': 'mixed'}).get_json()
+
+    assert (report['total_students'], report['subject_count'], report['clash_papers']) == (4, 2, 2)
+    assert list(report['strategies']) == ['mixed']
+    assert {subject: stats['students'] for subject, stats in report['strategies']['mixed']['subjects'].items()} == {
+        'CS101': 3, 'MA101': 3
+    }
+
+def test_request_errors():
+    client = setup_data()
+    assert client.post('/api/allocations/feasibility', json={'session': '2025-01-01-FN'}).status_code == 404
+    assert client.post('/api/allocations/feasibility', json={'subject_filter': 'XX999'}).status_code == 400
+    assert client.post('/api/allocations/feasibility', json={'subject_filter': 'IT201'}).get_json()['total_students'] == 2
+
+    rooms_collection.delete_many({})
+    response = client.post('/api/allocations/feasibility', json={'strategy': 'bogus'})
+    assert (response.status_code, response.get_json()) == (400, {'error': 'Unknown strategy: bogus'})
@@ -0,0 +1,69 @@
+import sys
+sys.path.append('backend')
+
+from models.database import Allocation
+from services.indent_service import IndentService
+
+HEADERS = [
+    {'_id': 'a1', 'session': '2025-11-18-FN', 'rooms': [
+        {'room_id': 'r1', 'room': {'name': '1101'}, 'subject_breakdown': {'MA101': 30, 'PH101': 21}},
+        {'room_id': 'r2', 'room': {'name': '1102'}, 'subject_breakdown': {'MA101': 19, 'PH101': 1}},
+    ]},
+    {'_id': 'a2', 'session': '2025-11-18-AN', 'allocations': [
+        {'room': {'name': 'Drawing Hall'}, 'subject_breakdown': {'CS101': 40}},
+    ]},
+]
+
+def totals_by_subject(session):
+    return {totals['subject']: (totals['students'], totals['spare'], totals['papers'], totals['halls'])
+            for totals in session['subjects']}
+
+def test_spare_copies_are_rounded_up_per_hall_and_summed_per_subject():
+    indent = IndentService.aggregate(HEADERS, spare_percent=5)
+    afternoon, forenoon = indent['sessions']
+
+    assert [(hall['hall'], hall['subject'], hall['students'], hall['spare'], hall['papers']) for hall in forenoon['halls']] == [
+        ('1101', 'MA101', 30, 2, 32),
+        ('1101', 'PH101', 21, 2, 23),
+        ('1102', 'MA101', 19, 1, 20),
+        ('1102', 'PH101', 1, 1, 2),
+    ]
+    assert totals_by_subject(forenoon) == {'MA101': (49, 3, 52, 2), 'PH101': (22, 3, 25, 2)}
+    assert (forenoon['date'], forenoon['session_name']) == ('2025-11-18', 'FN')
+    assert (forenoon['total_students'], forenoon['total_papers']) == (71, 77)
+
+    assert afternoon['halls'] == [{'hall': 'Drawing Hall', 'subject': 'CS101', 'students': 40, 'spare': 2, 'papers': 42}]
+    assert (indent['total_students'], indent['total_papers']) == (111, 119)
+
+def test_per_subject_spare_overrides_the_default():
+    subject_spare = IndentService.parse_subject_spare('PH101:20, CS101:0,bad,:5')
+    assert subject_spare == {'PH101': 20.0, 'CS101': 0.0}
+
+    indent = IndentService.aggregate(HEADERS, spare_percent=10, subject_spare=subject_spare)
+    afternoon, forenoon = indent['sessions']
+
+    assert totals_by_subject(forenoon) == {'MA101': (49, 5, 54, 2), 'PH101': (22, 6, 28, 2)}
+    assert totals_by_subject(afternoon) == {'CS101': (40, 0, 40, 1)}
+
+def test_subject_titles_and_branches_come_from_the_timetable():
+    info = {'MA101': {'title': 'Calculus', 'branch': 'CSE, IT'}}
+    forenoon = IndentService.aggregate(HEADERS[:1], subject_info=info, spare_percent=0)['sessions'][0]
+
+    assert [(t['subject'], t['title'], t['branch'], t['spare']) for t in forenoon['subjects']] == [
+        ('MA101', 'Calculus', 'CSE, IT', 0), ('PH101', None, None, 0)
+    ]
+
+def test_clashing_students_get_a_paper_for_every_subject_in_the_session():
+    seats = [
+        {'seat_number': 1, 'student': {'roll_number': 'CS001', 'subjects': ['MA101', 'PH101'], 'subject': 'MA101'}},
+        {'seat_number': 2, 'student': {'roll_number': 'CS002', 'subjects': ['PH101'], 'subject': 'PH101'}},
+        {'seat_number': 3, 'student': {'roll_number': 'CS003', 'subject': 'MA101'}},
+    ]
+    allocations = [{'room': {'name': '1101'}, 'students': seats, 'subject_breakdown': {'MA101': 2, 'PH101': 1}}]
+    header, _ = Allocation._build('mixed', '', allocations, {}, session='2025-11-18-FN')
+    assert header['rooms'][0]['paper_breakdown'] == {'MA101': 2, 'PH101': 2}
+    assert 'paper_breakdown' not in Allocation._build('mixed', '', allocations, {})[0]['rooms'][0]
+
+    session = IndentService.aggregate([header], spare_percent=10)['sessions'][0]
+    assert totals_by_subject(session) == {'MA101': (2, 1, 3, 1), 'PH101': (2, 1, 3, 1)}
+    assert (session['total_students'], session['total_papers']) == (3, 6)
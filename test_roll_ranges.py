@@ -0,0 +1,91 @@
+import sys
+import random
+import itertools
+sys.path.append('backend')
+
+from services.roll_range_service import RollRangeService
+
+def expand(entry):
+    prefix, start, width = RollRangeService.split_roll(entry['from'])
+    _, end, _ = RollRangeService.split_roll(entry['to'])
+    return [f"{prefix}{number:0{width}d}" for number in range(start, end + 1)
+            if f"{prefix}{number:0{width}d}" not in entry['gaps']]
+
+def notice_text(entries):
+    return ', '.join(RollRangeService.format_range(entry) for entry in entries)
+
+def interleaved_hall():
+    cse = [f"310623104{n:03d}" for n in [1, 2, 3, 4, 5, 6, 8, 9, 10, 11, 12, 14, 15, 16, 17, 18, 19, 20]]
+    cse += [f"310623104{n:03d}" for n in range(22, 60, 3)]
+    ece = [f"310623106{n:03d}" for n in [2, 4, 6, 7, 8, 10, 11, 12, 13, 14, 16, 18, 19, 20, 21, 22, 23, 24]]
+    lateral = ['310623104301', '310623104302', '310623104303', '310623104305']
+    return cse, ece, lateral
+
+def test_interleaved_rolls_keep_gapped_ranges_when_they_read_shorter():
+    cse, ece, lateral = interleaved_hall()
+    rolls = cse + ece + lateral
+    entries = RollRangeService.compact(list(reversed(rolls)))
+
+    assert [roll for entry in entries for roll in expand(entry)] == sorted(rolls, key=RollRangeService.natural_key)
+    assert sum(entry['count'] for entry in entries) == len(rolls)
+    assert notice_text(entries) == (
+        '310623104001 – 310623104022 (except 310623104007, 310623104013, 310623104021), '
+        '310623104025, 310623104028, 310623104031, 310623104034, 310623104037, 310623104040, '
+        '310623104043, 310623104046, 310623104049, 310623104052, 310623104055, 310623104058, '
+        '310623104301 – 310623104303, 310623104305, '
+        '310623106002 – 310623106024 (except 310623106003, 310623106005, 310623106009, 310623106015, 310623106017)'
+    )
+    assert len(notice_text(entries)) < len(', '.join(rolls))
+
+def test_sparse_runs_are_printed_roll_by_roll():
+    rolls = [f"310623243{n:03d}" for n in (1, 3, 5, 7, 10)]
+    entries = RollRangeService.compact(rolls)
+    assert [entry['from'] for entry in entries] == rolls
+    assert all(entry['count'] == 1 and entry['gaps'] == [] for entry in entries)
+
+def test_dense_head_and_sparse_tail_split_where_the_text_is_shortest():
+    rolls = ['CS001', 'CS002', 'CS003', 'CS005', 'CS006', 'CS009', 'CS011', 'CS012', 'CS013', 'CS014']
+    assert notice_text(RollRangeService.compact(rolls)) == 'CS001 – CS014 (except CS004, CS007, CS008, CS010)'
+    assert notice_text(RollRangeService.compact(rolls, max_gap=1)) == 'CS001 – CS003, CS005, CS006, CS009, CS011 – CS014'
+
+    dense = ['CS001', 'CS002', 'CS003', 'CS005', 'CS006', 'CS007', 'CS008', 'CS010', 'CS011', 'CS012']
+    assert notice_text(RollRangeService.compact(dense, max_gap=1)) == 'CS001 – CS012 (except CS004, CS009)'
+
+def test_series_prefixes_and_widths_are_never_merged():
+    entries = RollRangeService.compact(['CS099', 'CS100', 'CS101', 'IT100', 'CS0102', 'GUEST'])
+    assert [(entry['from'], entry['to'], entry['count']) for entry in entries] == [
+        ('CS099', 'CS101', 3), ('CS0102', 'CS0102', 1), ('GUEST', 'GUEST', 1), ('IT100', 'IT100', 1)
+    ]
+
+def test_hall_ranges_group_by_department_and_round_trip():
+    cse, ece, lateral = interleaved_hall()
+    rows = [{'room_name': '1102' if index % 2 else '1101', 'department': 'CSE', 'roll_number': roll}
+            for index, roll in enumerate(cse + lateral)]
+    rows += [{'room_name': '1101', 'department': 'ECE', 'roll_number': roll} for roll in ece]
+    report = RollRangeService.hall_ranges(rows)
+
+    assert (report['total_students'], report['hall_count']) == (len(rows), 2)
+    assert [(hall['hall'], hall['total'], [group['group'] for group in hall['groups']]) for hall in report['halls']] == [
+        ('1101', 36, ['CSE', 'ECE']), ('1102', 17, ['CSE'])
+    ]
+    assert report['range_count'] == sum(len(group['ranges']) for hall in report['halls'] for group in hall['groups'])
+    seated = sorted((hall['hall'], group['group'], roll) for hall in report['halls']
+                    for group in hall['groups'] for entry in group['ranges'] for roll in expand(entry))
+    assert seated == sorted((row['room_name'], row['department'], row['roll_number']) for row in rows)
+
+def test_split_is_the_shortest_of_every_partition():
+    rng = random.Random(3)
+    for _ in range(500):
+        numbers = sorted(rng.sample(range(1, 30), rng.randint(1, 9)))
+        rolls = [f"CS{number:03d}" for number in numbers]
+        best = None
+        for cuts in itertools.product((False, True), repeat=len(rolls) - 1):
+            starts = [0] + [position + 1 for position, cut in enumerate(cuts) if cut]
+            entries = [
+                {'from': rolls[start], 'to': rolls[end - 1],
+                 'gaps': [f"CS{n:03d}" for n in range(numbers[start], numbers[end - 1]) if n not in numbers]}
+                for start, end in zip(starts, starts[1:] + [len(rolls)])
+            ]
+            text = notice_text(entries)
+            best = text if best is None or len(text) < len(best) else best
+        assert len(notice_text(RollRangeService.compact(rolls, max_gap=30))) == len(best)
@@ -0,0 +1,26 @@
+import sys
+sys.path.append('backend')
+
+from app import create_app
+from models.database import students_collection, subject_stats_collection, SubjectStats
+
+def client():
+    students_collection.delete_many({})
+    subject_stats_collection.delete_many({})
+    return create_app().test_client()
+
+def test_duplicate_roll_number_is_a_conflict_on_create_and_update():
+    api = client()
+    asha = {'name': 'Asha', 'roll_number': 'CS001', 'year': 2, 'subjects': ['CS101']}
+    assert api.post('/api/students', json=asha).status_code == 201
+    bala_id = api.post('/api/students', json={**asha, 'name': 'Bala', 'roll_number': 'CS002'}).get_json()['student_id']
+
+    response = api.post('/api/students', json={**asha, 'name': 'Asha K'})
+    assert (response.status_code, response.get_json()) == (409, {'error': "A student with roll number 'CS001' already exists"})
+
+    response = api.put(f'/api/students/{bala_id}', json={'roll_number': 'CS001'})
+    assert (response.status_code, response.get_json()) == (409, {'error': "A student with roll number 'CS001' already exists"})
+
+    assert students_collection.find_one({'name': 'Bala'})['roll_number'] == 'CS002'
+    assert SubjectStats.get_counts() == {'CS101': 2}
+    assert api.put(f'/api/students/{bala_id}', json={'roll_number': 'CS003'}).status_code == 200
@@ -0,0 +1,65 @@
+import sys
+sys.path.append('backend')
+
+from models.database import Student, SubjectStats, students_collection, subject_stats_collection
+from utils.csv_utils import parse_csv_rows
+
+STUDENTS_CSV = """name,roll_number,year,subjects
+Asha,CS001,2,"CS101,MA101"
+Bala,CS002,2,CS101
+Chitra,IT001,3,"IT201,MA101"
+Dev,IT002,3,IT201
+"""
+
+def reset():
+    students_collection.delete_many({})
+    subject_stats_collection.delete_many({})
+
+def import_csv(csv_content):
+    rows = parse_csv_rows(csv_content, 'students')
+    return Student.bulk_upsert([row for _, row in rows], row_numbers=[row_num for row_num, _ in rows])
+
+def subject_counts():
+    return {doc['subject']: doc['count'] for doc in subject_stats_collection.find({})}
+
+def test_reimport_is_unchanged_and_one_edit_updates_one_row():
+    reset()
+    assert import_csv(STUDENTS_CSV) == ({'created': 4, 'updated': 0, 'unchanged': 0}, [])
+    assert import_csv(STUDENTS_CSV) == ({'created': 0, 'updated': 0, 'unchanged': 4}, [])
+
+    edited = STUDENTS_CSV.replace('Bala,CS002,2,CS101', 'Bala,CS002,2,"CS101,MA101"')
+    assert import_csv(edited) == ({'created': 0, 'updated': 1, 'unchanged': 3}, [])
+    assert students_collection.find_one({'roll_number': 'CS002'}, {'_id': 0, 'subjects': 1}) == {'subjects': ['CS101', 'MA101']}
+    assert subject_counts() == {'CS101': 2, 'MA101': 3, 'IT201': 2}
+    assert len(list(students_collection.find({}))) == 4
+
+def test_rows_without_a_stored_hash_are_compared_by_content():
+    reset()
+    import_csv(STUDENTS_CSV)
+    for doc in students_collection.find({}, {'_id': 1}):
+        students_collection.update_one({'_id': doc['_id']}, {'$unset': {'content_hash': ''}})
+
+    assert import_csv(STUDENTS_CSV) == ({'created': 0, 'updated': 0, 'unchanged': 4}, [])
+
+def test_fields_missing_from_the_new_row_are_unset():
+    reset()
+    Student.bulk_upsert([
+        {'name': 'Esha', 'roll_number': 'EC001', 'year': 1, 'subjects': ['EC101'], 'department': 'ECE', 'semester': 1}
+    ])
+    before = students_collection.find_one({'roll_number': 'EC001'})
+    assert (before['department'], before['semester']) == ('ECE', 1)
+
+    counts, errors = Student.bulk_upsert([{'name': 'Esha', 'roll_number': 'EC001', 'year': 1, 'subjects': []}])
+    assert (counts, errors) == ({'created': 0, 'updated': 1, 'unchanged': 0}, [])
+
+    after = students_collection.find_one({'roll_number': 'EC001'})
+    assert 'department' not in after and 'semester' not in after and 'subject' not in after
+    assert after['created_at'] == before['created_at']
+    assert after['content_hash'] == Student.content_hash(after)
+    assert 'EC101' not in subject_counts()
+
+def test_duplicate_roll_numbers_in_one_file_are_reported():
+    reset()
+    counts, errors = import_csv(STUDENTS_CSV + "Asha Again,CS001,2,CS101\n")
+    assert counts == {'created': 4, 'updated': 0, 'unchanged': 0}
+    assert errors == [(6, "Duplicate roll_number 'CS001' (also on row 2)")]
@@ -0,0 +1,80 @@
+import sys
+sys.path.append('backend')
+
+from datetime import datetime
+from openpyxl import Workbook
+from utils.timetable_import import _resolve_header, _slot, parse_timetable_workbook
+
+HEADER = ['S.No', 'Course Code', 'Course Title', 'Dept', 'Date', 'Session', 'Rescheduled Date', 'Revised Session']
+COLUMNS = _resolve_header(HEADER)
+
+def write_timetable(path, sheets):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        sheet = workbook.create_sheet(title)
+        sheet.append(['Anna University Examinations - Time Table'])
+        sheet.append(HEADER)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+def slots(result):
+    return sorted((slot['subject'], slot['date'], slot['session'], slot['sheet']) for slot in result['slots'])
+
+def test_date_is_searched_right_of_its_column_when_cells_are_shifted():
+    assert COLUMNS['date'] == 4 and COLUMNS['rescheduled'] == 6
+    assert _slot([1, 'CS101', 'Maths', 'CSE', datetime(2025, 11, 18), 'FN'], COLUMNS) == ('2025-11-18', 'FN')
+    assert _slot([1, 'CS101', 'Maths', 'CSE', None, datetime(2025, 11, 18), 'Forenoon'], COLUMNS) == ('2025-11-18', 'FN')
+    assert _slot([1, 'CS101', 'Maths', 'CSE', '18.11.2025', None, datetime(2025, 11, 18), 'A.N.'], COLUMNS) == ('2025-11-18', 'AN')
+    assert _slot([datetime(2025, 11, 1), 'CS101', 'Maths', 'CSE', 'TBA', 'FN'], COLUMNS) == (None, None)
+    assert _slot([1, 'CS101', 'Maths', 'CSE', datetime(2025, 11, 18), None], COLUMNS) == ('2025-11-18', None)
+
+def test_rescheduled_date_overrides_the_original_slot():
+    assert _slot([1, 'CS101', 'Maths', 'CSE', datetime(2025, 11, 18), 'FN', datetime(2025, 11, 24), 'AN'], COLUMNS) == ('2025-11-24', 'AN')
+    assert _slot([1, 'CS101', 'Maths', 'CSE', datetime(2025, 11, 18), 'FN', datetime(2025, 11, 24), None], COLUMNS) == ('2025-11-24', 'FN')
+    assert _slot([1, 'CS101', 'Maths', 'CSE', datetime(2025, 11, 18), 'FN', 'Postponed', 'AN'], COLUMNS) == ('2025-11-18', 'FN')
+
+def test_rows_without_a_date_or_session_are_counted_and_reported(tmp_path):
+    path = write_timetable(tmp_path / 'SEM3-TT.xlsx', {'SEM3': [
+        [1, 'CS101', 'Maths', 'CSE, IT', datetime(2025, 11, 18), 'FN'],
+        [2, 'CS102', 'Physics', 'CSE', 'To be announced', None],
+        [3, 'CS103', 'Chemistry', 'CSE', datetime(2025, 11, 19), 'TBD'],
+        [4, None, 'Break', None, None, None],
+    ]})
+    result = parse_timetable_workbook(path)
+
+    assert slots(result) == [('CS101', '2025-11-18', 'FN', 'SEM3')]
+    assert result['slots'][0]['departments'] == ['CSE', 'IT']
+    assert result['skipped'] == 1
+    assert result['errors'] == [('SEM3', 5, 'No FN/AN session for CS103 on 2025-11-19')]
+
+def test_later_sheet_replaces_every_earlier_slot_for_the_same_course(tmp_path):
+    path = write_timetable(tmp_path / 'SEM7-TT.xlsx', {
+        'SEM7': [
+            [1, 'CS701', 'Cloud', 'CSE', datetime(2025, 11, 18), 'FN'],
+            [2, 'CS701', 'Cloud', 'IT', datetime(2025, 11, 20), 'AN'],
+            [3, 'CS702', 'Security', 'CSE', datetime(2025, 11, 21), 'FN'],
+            [4, 'CS703', 'Compilers', 'CSE', datetime(2025, 11, 22), 'FN'],
+        ],
+        'sem7-DAY WISE': [
+            [1, 'CS701', 'Cloud', 'CSE, IT', datetime(2025, 11, 25), 'AN'],
+            [2, 'CS702', 'Security', 'CSE', datetime(2025, 11, 21), 'FN'],
+        ],
+    })
+    result = parse_timetable_workbook(path)
+
+    assert result['sheets'] == ['SEM7', 'sem7-DAY WISE']
+    assert slots(result) == [
+        ('CS701', '2025-11-25', 'AN', 'sem7-DAY WISE'),
+        ('CS702', '2025-11-21', 'FN', 'sem7-DAY WISE'),
+        ('CS703', '2025-11-22', 'FN', 'SEM7'),
+    ]
+    assert result['superseded'] == [
+        {'subject': 'CS701', 'old_slot': '2025-11-18-FN', 'old_sheet': 'SEM7', 'new_slot': '2025-11-25-AN', 'new_sheet': 'sem7-DAY WISE'},
+        {'subject': 'CS701', 'old_slot': '2025-11-20-AN', 'old_sheet': 'SEM7', 'new_slot': '2025-11-25-AN', 'new_sheet': 'sem7-DAY WISE'},
+    ]
+
+    only_first = parse_timetable_workbook(path, sheets=['SEM7'])
+    assert len(only_first['slots']) == 4 and only_first['superseded'] == []
@@ -38,12 +38,12 @@ for i, a in enumerate(allocations[:3], 1):
     print(f"    Allocation Rate: {summary.get('allocation_percentage', 0)}%")
     print(f"    Quality Rating: {summary.get('quality_rating', 'N/A')}")
 
-    allocs = a.get('allocations', [])
+    allocs = a.get('allocations') or a.get('rooms', [])
     if allocs:
         print(f"    Room Breakdown:")
         for room_alloc in allocs[:3]:
             room = room_alloc['room']
-            student_count = len(room_alloc['students'])
+            student_count = room_alloc.get('student_count', len(room_alloc.get('students', [])))
             subjects_in_room = room_alloc.get('subject_breakdown', {})
             print(f"      - {room['name']}: {student_count} students")
             if subjects_in_room: